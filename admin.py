@@ -0,0 +1,103 @@
+import pandas as pd
+import streamlit as st
+
+from cache_backends import CACHE_SECRET_ENV, CACHE_URL_ENV, shared_cache
+from disk_cache import disk_cache
+from result_cache import result_cache
+from singleflight import single_flight
+from warehouse import quarantined
+
+
+def admin_dashboard():
+    st.title("🛠️ Admin")
+
+    # ---------- RESULT CACHE ----------
+    st.subheader("⚡ Result Cache")
+    cache = result_cache()
+    stats = cache.stats()
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Hits", f"{stats['hits']:,}")
+    col2.metric("Misses", f"{stats['misses']:,}")
+    col3.metric("Hit Rate", f"{stats['hit_rate']:.1f}%")
+    col4.metric("Entries", f"{stats['entries']:,}")
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Evictions (LRU)", f"{stats['evictions']:,}")
+    col2.metric("Expirations (TTL)", f"{stats['expirations']:,}")
+    col3.metric("Memory Used", f"{stats['bytes'] / 2**20:.1f} MB")
+    col4.metric("Memory Limit", f"{cache.max_bytes / 2**20:.0f} MB")
+    st.caption(f"Entries expire {cache.ttl // 60:.0f} minutes after they are computed.")
+
+    sizes = cache.page_sizes()
+    if not sizes.empty:
+        sizes["MB"] = sizes.pop("bytes") / 2**20
+        st.dataframe(sizes, use_container_width=True)
+
+    if st.button("🧹 Clear result cache"):
+        cache.clear()
+        st.success("Result cache cleared.")
+
+    # ---------- SINGLE FLIGHT ----------
+    st.subheader("🛬 Request Coalescing")
+    flights = single_flight()
+    stats = flights.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Computations Run", f"{stats['computed']:,}")
+    col2.metric("Duplicates Avoided", f"{stats['coalesced']:,}")
+    col3.metric("In Flight", f"{stats['in_flight']:,}", f"{stats['waiting']:,} waiting", delta_color="off")
+    col4.metric("Time Spent Waiting", f"{stats['seconds_waited']:.1f} s")
+    st.caption("Sessions that miss the cache on the same key at the same time wait for one computation and share it.")
+    avoided = flights.page_counts()
+    if avoided:
+        st.dataframe(pd.Series(avoided, name="duplicates avoided").rename_axis("page").sort_values(ascending=False),
+                     use_container_width=True)
+
+    # ---------- WAREHOUSE ----------
+    st.subheader("🏭 Warehouse")
+    left_out = quarantined()
+    if left_out:
+        st.warning("These datasets could not be read and are left out of the warehouse until their files change:")
+        st.dataframe(pd.Series(left_out, name="error").rename_axis("dataset"), use_container_width=True)
+    else:
+        st.caption("Every dataset built so far was read without errors.")
+
+    # ---------- SHARED CACHE ----------
+    st.subheader("🌐 Shared Cache")
+    shared = shared_cache()
+    if shared is None:
+        st.caption(f"Off: set {CACHE_URL_ENV}=redis://host:port/db and the same {CACHE_SECRET_ENV} on every node "
+                   "to share results between app nodes.")
+    else:
+        stats = shared.stats()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Hits", f"{stats['hits']:,}")
+        col2.metric("Misses", f"{stats['misses']:,}")
+        col3.metric("Hit Rate", f"{stats['hit_rate']:.1f}%")
+        col4.metric("Status", "Connected" if stats.get("connected", True) else "Unreachable")
+        if stats.get("rejected"):
+            st.warning(f"{stats['rejected']:,} entries on the server had no valid signature and were ignored.")
+        versions = pd.DataFrame(shared.dataset_versions(), columns=["Node", "Source File", "Digest", "Seen"])
+        if not versions.empty:
+            versions["Seen"] = pd.to_datetime(versions["Seen"], unit="s")
+            disagree = versions.groupby("Source File")["Digest"].transform("nunique") > 1
+            if disagree.any():
+                st.warning("Some nodes are serving a different version of these files: "
+                           + ", ".join(sorted(versions.loc[disagree, "Source File"].unique())))
+            st.dataframe(versions.sort_values(["Source File", "Node"]), use_container_width=True, hide_index=True)
+        if st.button("🧹 Clear shared cache"):
+            shared.clear()
+            st.success("Shared cache cleared for every node.")
+
+    # ---------- DISK CACHE ----------
+    st.subheader("💾 Disk Cache")
+    disk = disk_cache()
+    entries = disk.entries()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Entries", f"{len(entries):,}")
+    col2.metric("Size", f"{entries['size'].sum() / 2**20:.1f} MB")
+    col3.metric("Size Limit", f"{disk.max_bytes / 2**20:.0f} MB")
+    st.caption(f"Stored in {disk.path}; inspect or prune it with `python disk_cache.py`.")
+    if not entries.empty:
+        entries["MB"] = entries.pop("size") / 2**20
+        st.dataframe(entries[["page", "name", "sources", "accessed", "MB"]], use_container_width=True, hide_index=True)
@@ -0,0 +1,122 @@
+import numpy as np
+
+CHUNK_BITS = 16
+CHUNK = 1 << CHUNK_BITS
+# Chunks with more ids than this are stored as a bitset, which is then smaller than the array
+ARRAY_LIMIT = 4096
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+
+# --------- Containers ---------
+# A container holds the low 16 bits of the ids in one chunk: a sorted uint16
+# array when sparse, or a packed 8 KiB uint8 bitset when dense.
+def _is_bitset(container):
+    return container.dtype == np.uint8
+
+
+def _bits(container):
+    if _is_bitset(container):
+        return container
+    dense = np.zeros(CHUNK, dtype=bool)
+    dense[container] = True
+    return np.packbits(dense)
+
+
+def _compact(container):
+    """Smallest form of a container, None when it is empty"""
+    if _is_bitset(container):
+        if POPCOUNT[container].sum() > ARRAY_LIMIT:
+            return container
+        container = np.flatnonzero(np.unpackbits(container)).astype(np.uint16)
+    if len(container) > ARRAY_LIMIT:
+        return _bits(container)
+    return container if len(container) else None
+
+
+def _contains(bitset, lows):
+    return np.unpackbits(bitset)[lows].astype(bool)
+
+
+def _and(a, b):
+    if _is_bitset(a) and _is_bitset(b):
+        return _compact(a & b)
+    if _is_bitset(a):
+        a, b = b, a
+    if _is_bitset(b):
+        return _compact(a[_contains(b, a)])
+    return _compact(np.intersect1d(a, b, assume_unique=True))
+
+
+def _or(a, b):
+    if _is_bitset(a) or _is_bitset(b):
+        return _compact(_bits(a) | _bits(b))
+    return _compact(np.union1d(a, b))
+
+
+def _andnot(a, b):
+    if _is_bitset(a):
+        return _compact(a & ~_bits(b))
+    if _is_bitset(b):
+        return _compact(a[~_contains(b, a)])
+    return _compact(np.setdiff1d(a, b, assume_unique=True))
+
+
+# --------- Bitmap ---------
+class Bitmap:
+    """Roaring-style compressed set of row ids, split into 65536-id chunks"""
+
+    def __init__(self, containers=None):
+        self.containers = containers or {}
+
+    @classmethod
+    def from_sorted(cls, ids):
+        """Bitmap of ascending, distinct non-negative ids"""
+        ids = np.asarray(ids, dtype=np.int64)
+        containers = {}
+        if len(ids):
+            highs = ids >> CHUNK_BITS
+            bounds = np.flatnonzero(np.diff(highs)) + 1
+            for chunk in np.split(ids, bounds):
+                containers[int(chunk[0] >> CHUNK_BITS)] = _compact((chunk & (CHUNK - 1)).astype(np.uint16))
+        return cls(containers)
+
+    @classmethod
+    def from_mask(cls, mask):
+        return cls.from_sorted(np.flatnonzero(mask))
+
+    def _combine(self, other, op, keep_left, keep_right):
+        out = {}
+        for high in self.containers.keys() | other.containers.keys():
+            a, b = self.containers.get(high), other.containers.get(high)
+            if a is not None and b is not None:
+                c = op(a, b)
+            else:
+                c = a if a is not None and keep_left else b if b is not None and keep_right else None
+            if c is not None:
+                out[high] = c
+        return Bitmap(out)
+
+    def __and__(self, other):
+        return self._combine(other, _and, False, False)
+
+    def __or__(self, other):
+        return self._combine(other, _or, True, True)
+
+    def __sub__(self, other):
+        return self._combine(other, _andnot, True, False)
+
+    def __len__(self):
+        return int(sum(POPCOUNT[c].sum() if _is_bitset(c) else len(c) for c in self.containers.values()))
+
+    @property
+    def nbytes(self):
+        return sum(c.nbytes for c in self.containers.values())
+
+    def to_array(self):
+        """Ascending row ids"""
+        parts = []
+        for high in sorted(self.containers):
+            c = self.containers[high]
+            lows = np.flatnonzero(np.unpackbits(c)) if _is_bitset(c) else c.astype(np.int64)
+            parts.append((high << CHUNK_BITS) + lows)
+        return np.concatenate(parts) if parts else np.array([], dtype=np.int64)
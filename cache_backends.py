@@ -0,0 +1,182 @@
+import hashlib
+import hmac
+import json
+import os
+import pickle
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+import streamlit as st
+
+CACHE_URL_ENV = "RESULT_CACHE_URL"
+# Shared by every node; results read from the server are unpickled only when signed with it
+CACHE_SECRET_ENV = "RESULT_CACHE_SECRET"
+KEY_PREFIX = "reporting:"
+VERSIONS_KEY = KEY_PREFIX + "dataset_versions"
+TTL_SECONDS = 60 * 60
+MAX_VALUE_BYTES = 64 * 2**20
+# After a failed round trip the backend is skipped for this long instead of stalling every page
+RETRY_SECONDS = 30
+NODE = f"{socket.gethostname()}:{os.getpid()}"
+
+
+# --------- Interface ---------
+class CacheBackend:
+    """Shared result store: get(key) -> (found, value), put(key, value), clear(), stats()"""
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def put(self, key, value):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self):
+        raise NotImplementedError
+
+    def publish_versions(self, digests):
+        """Record the source file digests ({path: digest}) this node computes from"""
+
+    def dataset_versions(self):
+        """(node, path, digest, seen at) rows published by every node"""
+        return []
+
+
+def _hashed(key):
+    return KEY_PREFIX + hashlib.sha256(repr(key).encode()).hexdigest()
+
+
+# --------- Redis Backend ---------
+class RedisBackend(CacheBackend):
+    """Pickled results in a Redis server shared by every app node, expired by the server.
+
+    Every payload starts with an HMAC-SHA256 of the pickle under the shared
+    secret. Anything else on the server may have been written by another
+    client, so it is dropped unread instead of unpickled.
+    """
+
+    def __init__(self, client, secret, ttl=TTL_SECONDS):
+        if not secret:
+            raise ValueError(f"The shared result cache needs a signing secret in {CACHE_SECRET_ENV}")
+        self.client = client
+        self.secret = secret.encode() if isinstance(secret, str) else secret
+        self.ttl = ttl
+        self.retry_at = 0.0
+        self.published = {}
+        self.counters = {"hits": 0, "misses": 0, "errors": 0, "writes": 0, "rejected": 0}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url, secret, **kwargs):
+        """redis://[:password@]host[:port][/db]; needs the redis package"""
+        import redis
+        return cls(redis.Redis.from_url(url, socket_timeout=2, socket_connect_timeout=2), secret, **kwargs)
+
+    def _sign(self, data):
+        return hmac.new(self.secret, data, hashlib.sha256).digest()
+
+    def _count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def _call(self, method, *args, **kwargs):
+        """Run one client call; None when the server is unreachable or backing off after a failure"""
+        import redis
+        if time.monotonic() < self.retry_at:
+            return None
+        try:
+            return getattr(self.client, method)(*args, **kwargs)
+        except redis.RedisError:
+            self._count("errors")
+            self.retry_at = time.monotonic() + RETRY_SECONDS
+            return None
+
+    def get(self, key):
+        payload = self._call("get", _hashed(key))
+        if payload is None:
+            self._count("misses")
+            return False, None
+        signature, data = payload[:32], payload[32:]
+        if not hmac.compare_digest(signature, self._sign(data)):
+            self._count("rejected")
+            self._count("misses")
+            return False, None
+        try:
+            value = pickle.loads(data)
+        except Exception:
+            self._count("misses")
+            return False, None
+        self._count("hits")
+        return True, value
+
+    def put(self, key, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) <= MAX_VALUE_BYTES and self._call("set", _hashed(key), self._sign(data) + data, ex=self.ttl):
+            self._count("writes")
+
+    def clear(self):
+        """Delete this app's keys only; the server may be shared with other applications"""
+        cursor = 0
+        while True:
+            reply = self._call("scan", cursor, match=KEY_PREFIX + "*", count=1000)
+            if reply is None:
+                return
+            cursor, keys = reply
+            if keys:
+                self._call("delete", *keys)
+            if cursor == 0:
+                return
+
+    def stats(self):
+        with self.lock:
+            counters = dict(self.counters)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "connected": bool(self._call("ping")),
+            "hit_rate": counters["hits"] / lookups * 100 if lookups else 0.0,
+        }
+
+    def publish_versions(self, digests):
+        # Written only when this node sees a new digest, not on every cache miss
+        with self.lock:
+            changed = {path: digest for path, digest in digests.items() if self.published.get(path) != digest}
+        if not changed:
+            return
+        fields = {f"{NODE}|{path}": json.dumps({"digest": digest, "seen": time.time()})
+                  for path, digest in changed.items()}
+        if self._call("hset", VERSIONS_KEY, mapping=fields) is not None:
+            self._call("expire", VERSIONS_KEY, 7 * 24 * 3600)
+            with self.lock:
+                self.published.update(changed)
+
+    def dataset_versions(self):
+        rows = []
+        for field, raw in (self._call("hgetall", VERSIONS_KEY) or {}).items():
+            node, path = field.decode().split("|", 1)
+            info = json.loads(raw)
+            rows.append((node, path, info["digest"], info["seen"]))
+        return rows
+
+
+def make_backend(url, secret=None):
+    """Backend for a cache URL: memory:// (in-process) or redis://host:port/db (signed with secret)"""
+    scheme = urlparse(url).scheme
+    if scheme == "memory":
+        # Imported here: result_cache imports this module for shared_cache
+        from result_cache import ResultCache
+        return ResultCache()
+    if scheme in ("redis", "rediss"):
+        return RedisBackend.from_url(url, secret)
+    raise ValueError(f"Unsupported cache URL {url!r}; use memory:// or redis://host:port/db")
+
+
+@st.cache_resource(show_spinner=False)
+def shared_cache():
+    """The cross-node backend named by RESULT_CACHE_URL, None when each node only caches in-process"""
+    url = os.environ.get(CACHE_URL_ENV)
+    return make_backend(url, os.environ.get(CACHE_SECRET_ENV)) if url else None
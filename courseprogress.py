@@ -2,13 +2,23 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
+from datastore import cached_frame, filter_rows
+from disk_cache import disk_cached
+from result_cache import cached_result
+
+PROGRESS_FILE = "courseprogress1.xls"
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
 # Page config
 st.set_page_config(page_title="Student Course Progress Dashboard", layout="wide")
 
 st.markdown("<h1 style='text-align: center;'>🧑‍🏫 Student Course Progress Dashboard</h1>", unsafe_allow_html=True)
-def  courseprogress_dashboard():
+
 # Load and preprocess data
-    df = pd.read_csv("courseprogress1.xls", parse_dates=["created_at", "updated_at"], dayfirst=True)
+@cached_frame(PROGRESS_FILE)
+@disk_cached(PROGRESS_FILE)
+def load_data():
+    df = pd.read_csv(PROGRESS_FILE, parse_dates=["created_at", "updated_at"], dayfirst=True)
     df['created_at'] = pd.to_datetime(df['created_at'], errors='coerce')
     df['updated_at'] = pd.to_datetime(df['updated_at'], errors='coerce')
     df = df.dropna(subset=['created_at'])
@@ -16,9 +26,35 @@ def  courseprogress_dashboard():
     # Add helper columns
     df['created_date'] = df['created_at'].dt.date
     df['hour'] = df['created_at'].dt.hour + 1  # 0-23 ➝ 1–24
-    df['hour'] = df['hour'].apply(lambda x: x if x <= 24 else 1)
     df['weekday'] = df['created_at'].dt.day_name()
-    original_df = df.copy()
+    return df
+
+@cached_result("Student Course Progress", PROGRESS_FILE)
+def compute_progress(user, topic):
+    """Filtered rows and the per-tab aggregates for one user/topic selection"""
+    df = filter_rows(load_data(), {
+        'user_id': user if user == "All" else int(user),
+        'course_topic_id': topic if topic == "All" else int(topic),
+    })
+
+    heatmap_df = df.groupby(['weekday', 'hour']).size().reset_index(name='completions')
+    heatmap_df['weekday'] = pd.Categorical(heatmap_df['weekday'], categories=WEEKDAYS, ordered=True)
+    pivot = heatmap_df.pivot(index='weekday', columns='hour', values='completions').fillna(0)
+
+    revisits = df[df['updated_at'] > df['created_at']]
+    topic_completions = df['course_topic_id'].value_counts().reset_index()
+    topic_completions.columns = ['Topic ID', 'Total Completions']
+    return {
+        'df': df,
+        'users_per_topic': df.groupby('course_topic_id')['user_id'].nunique().reset_index(name='Unique Users'),
+        'pivot': pivot.reindex(columns=range(1, 25), fill_value=0),
+        'revisit_counts': revisits.groupby('course_topic_id')['user_id'].nunique().reset_index(name='Revisited Users'),
+        'trend': df.groupby(['created_date', 'course_topic_id']).size().reset_index(name='Completions'),
+        'topic_completions': topic_completions,
+    }
+
+def  courseprogress_dashboard():
+    original_df = load_data()
 
     # Global Filters
     st.subheader("🔍 Filter Options")
@@ -30,11 +66,8 @@ def  courseprogress_dashboard():
         topic_options = ["All"] + sorted(original_df['course_topic_id'].astype(str).unique())
         selected_topic = st.selectbox("📘 Select Topic", topic_options)
 
-    df = original_df.copy()
-    if selected_user != "All":
-        df = df[df['user_id'] == int(selected_user)]
-    if selected_topic != "All":
-        df = df[df['course_topic_id'] == int(selected_topic)]
+    progress = compute_progress(selected_user, selected_topic)
+    df = progress['df']
 
     # Tabs
     tab1, tab2, tab3 = st.tabs(["👥 User Behavior Insights", "⏰ Time-Based Insights", "📚 Topic Engagement Insights"])
@@ -50,8 +83,7 @@ def  courseprogress_dashboard():
         col3.metric("✅ Total Completions", df.shape[0])
 
         st.subheader("👥 Users per Topic")
-        users_per_topic = df.groupby('course_topic_id')['user_id'].nunique().reset_index(name='Unique Users')
-        fig_users = px.bar(users_per_topic, x='course_topic_id', y='Unique Users',
+        fig_users = px.bar(progress['users_per_topic'], x='course_topic_id', y='Unique Users',
                         labels={'course_topic_id': 'Topic ID'}, title="Unique Users per Topic")
         st.plotly_chart(fig_users)
 
@@ -168,18 +200,8 @@ def  courseprogress_dashboard():
     with tab2:
         st.subheader("📅 Activity Heatmap (Weekday x Hour)")
 
-        # Shift hour to 1–24
-        df['hour'] = df['created_at'].dt.hour + 1
-        df['hour'] = df['hour'].apply(lambda x: x if x <= 24 else 1)
-
-        # Group by weekday and hour
-        heatmap_df = df.groupby(['weekday', 'hour']).size().reset_index(name='completions')
-        weekday_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        heatmap_df['weekday'] = pd.Categorical(heatmap_df['weekday'], categories=weekday_order, ordered=True)
-
-        # Pivot for heatmap
-        pivot = heatmap_df.pivot(index='weekday', columns='hour', values='completions').fillna(0)
-        pivot = pivot.reindex(columns=range(1, 25), fill_value=0)
+        # Weekday x hour completions
+        pivot = progress['pivot']
 
         # Plot heatmap
         fig_heat = px.imshow(
@@ -202,11 +224,8 @@ def  courseprogress_dashboard():
         st.plotly_chart(fig_heat, use_container_width=True)
 
         st.subheader("🔁 Most Revisited Topics (Using updated_at)")
-        revisits = df[df['updated_at'] > df['created_at']]
-        revisit_counts = revisits.groupby('course_topic_id')['user_id'].nunique().reset_index(name='Revisited Users')
-
         fig_revisit = px.bar(
-            revisit_counts.sort_values('Revisited Users', ascending=False),
+            progress['revisit_counts'].sort_values('Revisited Users', ascending=False),
             x='course_topic_id',
             y='Revisited Users',
             title="Most Revisited Topics",
@@ -218,8 +237,7 @@ def  courseprogress_dashboard():
     # ------------------------------------------
     with tab3:
         st.subheader("📈 Topic Completion Trend (All Topics)")
-        trend = df.groupby(['created_date', 'course_topic_id']).size().reset_index(name='Completions')
-        fig_trend = px.line(trend, x='created_date', y='Completions', color='course_topic_id',
+        fig_trend = px.line(progress['trend'], x='created_date', y='Completions', color='course_topic_id',
                             title="Topic Completion Over Time")
         st.plotly_chart(fig_trend)
 
@@ -237,8 +255,7 @@ def  courseprogress_dashboard():
             st.warning("No data available for the selected topic.")
 
         st.subheader("🏆 Most & Least Completed Topics")
-        topic_completions = df['course_topic_id'].value_counts().reset_index()
-        topic_completions.columns = ['Topic ID', 'Total Completions']
+        topic_completions = progress['topic_completions']
         top_topic = topic_completions.iloc[0]
         bottom_topic = topic_completions.iloc[-1]
 
@@ -0,0 +1,116 @@
+import functools
+import hashlib
+import os
+import re
+
+import pandas as pd
+import streamlit as st
+
+# Copy-on-write lets filtered frames and column subsets share memory with the
+# cached frame they came from. It is always on from pandas 3.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+ALL_VALUES = ("All", "All States", "All Districts")
+
+
+# --------- Frozen Frames ---------
+class FrozenFrame(pd.DataFrame):
+    """A session's handle on a cached DataFrame. Column assignment is refused.
+
+    Handles share their data with the cached frame through copy-on-write, so
+    any in-place change (.loc, .iloc, inplace=True, insert, del) copies the
+    touched columns into the handle and never reaches the shared frame.
+    """
+
+    # Id of the cached frame behind the handle, equal for every handle on it
+    _metadata = ["frame_id"]
+
+    @property
+    def _constructor(self):
+        # Anything derived from a frozen frame (filters, assign, merges) is an
+        # ordinary DataFrame again.
+        return pd.DataFrame
+
+    def __setitem__(self, key, value):
+        raise TypeError(
+            f"Cannot set column {key!r}: cached frames are shared and read-only. "
+            "Derive the column in the loader or use .assign() on a subset."
+        )
+
+
+# Cached frames live for the lifetime of the process, so the id of the one
+# behind a handle is a cheap and exact cache key for st.cache_data functions.
+FROZEN_HASH_FUNCS = {FrozenFrame: lambda frame: frame.frame_id}
+
+
+def cached_frame(*paths):
+    """Load a dataset once per version of its source files and share it read-only.
+
+    Use as @cached_frame(*paths), or bare when the loader's arguments already
+    carry the version. The loader must build every derived column the page
+    needs. Each call gets a new handle on the same data; building one copies
+    nothing.
+    """
+    if len(paths) == 1 and callable(paths[0]):
+        return cached_frame()(paths[0])
+
+    def decorate(loader):
+        @st.cache_resource(show_spinner=False)
+        @functools.wraps(loader)
+        def load(version, *args, **kwargs):
+            frame = FrozenFrame(loader(*args, **kwargs))
+            frame.frame_id = id(frame)
+            return frame
+
+        @functools.wraps(loader)
+        def wrapper(*args, **kwargs):
+            shared = load(dataset_version(*paths), *args, **kwargs)
+            handle = FrozenFrame(shared)
+            handle.frame_id = shared.frame_id
+            return handle
+
+        return wrapper
+
+    return decorate
+
+
+def dataset_version(*paths):
+    """Short fingerprint of the source files; changes whenever one is replaced or edited."""
+    digest = hashlib.sha1()
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        except OSError:
+            digest.update(f"{path}:missing;".encode())
+    return digest.hexdigest()[:12]
+
+
+def _column_key(name):
+    return re.sub(r"[\s_]+", "", str(name)).lower()
+
+
+def find_column(df, *candidates):
+    """First column of df named like one of the candidates, ignoring case, spaces and underscores."""
+    columns = {_column_key(column): column for column in df.columns}
+    for candidate in candidates:
+        if _column_key(candidate) in columns:
+            return columns[_column_key(candidate)]
+    return None
+
+
+# --------- Filters ---------
+def filter_rows(df, conditions):
+    """Return the rows of df matching every selected filter value.
+
+    conditions maps column -> selected value; None and the "All ..." options are
+    skipped. With nothing selected the frame itself is returned, not a copy.
+    """
+    mask = None
+    for column, value in conditions.items():
+        if value is None or value in ALL_VALUES:
+            continue
+        column_mask = df[column].to_numpy() == value
+        mask = column_mask if mask is None else mask & column_mask
+    return df if mask is None else df[mask]
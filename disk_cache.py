@@ -0,0 +1,247 @@
+import argparse
+import contextlib
+import functools
+import hashlib
+import glob
+import json
+import os
+import pickle
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from datastore import dataset_version
+
+DISK_CACHE_FILE = "disk_cache.sqlite"
+MAX_BYTES = 1024 * 2**20
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    page TEXT NOT NULL,
+    name TEXT NOT NULL,
+    sources TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL,
+    value BLOB NOT NULL
+)
+"""
+
+
+# --------- Source Hashes ---------
+@functools.lru_cache(maxsize=64)
+def _file_digest(path, version):
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    except OSError:
+        return "missing"
+    return digest.hexdigest()
+
+
+def entry_digest(sources):
+    """What an entry was computed from: the app code and its source files"""
+    return f"{code_fingerprint()}:{source_digest(*sources)}"
+
+
+def source_digest(*paths):
+    """Content hash of the source files, re-read only when a file's size or mtime changes"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(f"{path}:{_file_digest(path, dataset_version(path))};".encode())
+    return digest.hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=1)
+def code_fingerprint():
+    """Hash of the app's own modules and the pandas/numpy versions.
+
+    Part of every entry key, so a deploy that changes a loader, a compute step
+    or anything they call never reads back results made by the old code.
+    """
+    digest = hashlib.sha256(f"pandas {pd.__version__} numpy {np.__version__};".encode())
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*.py"))):
+        with open(path, "rb") as f:
+            digest.update(os.path.basename(path).encode() + b"\0" + f.read())
+    return digest.hexdigest()[:16]
+
+
+# --------- Store ---------
+class DiskCache:
+    """Pickled results in a SQLite file, evicted least-recently-used beyond max_bytes"""
+
+    def __init__(self, path=DISK_CACHE_FILE, max_bytes=MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """One short-lived connection and transaction per call: Streamlit serves sessions from several threads"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _vacuum(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+
+    def get(self, key):
+        """(True, value) on a hit, (False, None) on a miss or an unreadable entry"""
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return False, None
+                try:
+                    value = pickle.loads(row[0])
+                except Exception:
+                    # Written by an incompatible pandas/numpy; recompute it
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    return False, None
+                conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+            return True, value
+        except sqlite3.Error:
+            return False, None
+
+    def put(self, key, value, page, name, sources):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             (key, page, name, json.dumps(sources), entry_digest(sources), now, now,
+                              len(blob), blob))
+                self._evict(conn, self.max_bytes)
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, conn, max_bytes):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        removed = 0
+        if total > max_bytes:
+            for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                removed += 1
+                if total <= max_bytes:
+                    break
+        return removed
+
+    def entries(self):
+        """One row per entry, without the stored values"""
+        with self._connect() as conn:
+            table = pd.read_sql_query(
+                "SELECT key, page, name, sources, digest, created, accessed, size FROM entries ORDER BY accessed DESC",
+                conn)
+        for column in ("created", "accessed"):
+            table[column] = pd.to_datetime(table[column], unit="s")
+        return table
+
+    def prune(self, max_bytes=None, older_than=None, stale=False):
+        """Drop entries of changed source files or app code, entries not read for older_than seconds,
+        then the least recently used ones until max_bytes is met. Returns the number removed."""
+        removed = 0
+        with self._connect() as conn:
+            if stale:
+                for key, sources, digest in conn.execute("SELECT key, sources, digest FROM entries").fetchall():
+                    if entry_digest(json.loads(sources)) != digest:
+                        conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                        removed += 1
+            if older_than is not None:
+                removed += conn.execute("DELETE FROM entries WHERE accessed < ?",
+                                        (time.time() - older_than,)).rowcount
+            removed += self._evict(conn, self.max_bytes if max_bytes is None else max_bytes)
+        self._vacuum()
+        return removed
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+        self._vacuum()
+
+
+@functools.lru_cache(maxsize=1)
+def disk_cache():
+    return DiskCache()
+
+
+def disk_key(page, name, sources, args):
+    """Entry key: app code, content of the source files, the function and its (normalized) arguments"""
+    text = repr((code_fingerprint(), source_digest(*sources), page, name, args))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def disk_cached(*paths):
+    """Keep a loader's result on disk so a restarted server reads it back instead of re-parsing.
+
+    Use under @cached_frame(*paths) with the same paths; arguments must have a stable repr.
+    """
+    def decorate(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = disk_key("loader", name, paths, (args, sorted(kwargs.items())))
+            found, value = disk_cache().get(key)
+            if not found:
+                value = func(*args, **kwargs)
+                disk_cache().put(key, value, "loader", name, list(paths))
+            return value
+
+        return wrapper
+
+    return decorate
+
+
+# --------- CLI ---------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or prune the persistent aggregate cache")
+    parser.add_argument("--file", default=DISK_CACHE_FILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="totals per page")
+    commands.add_parser("list", help="every entry, most recently used first")
+    prune = commands.add_parser("prune", help="drop stale, old or least recently used entries")
+    prune.add_argument("--max-mb", type=float, help="keep at most this many MB")
+    prune.add_argument("--older-than-days", type=float, help="drop entries not read for this many days")
+    prune.add_argument("--stale", action="store_true", help="drop entries whose source files or app code changed")
+    commands.add_parser("clear", help="drop every entry")
+    args = parser.parse_args(argv)
+
+    cache = DiskCache(args.file)
+    if args.command == "stats":
+        table = cache.entries()
+        print(f"{len(table):,} entries, {table['size'].sum() / 2**20:.1f} MB in {args.file}")
+        if len(table):
+            print(table.groupby("page")["size"].agg(entries="count", MB=lambda s: s.sum() / 2**20).to_string())
+    elif args.command == "list":
+        table = cache.entries()
+        table["MB"] = table.pop("size") / 2**20
+        with pd.option_context("display.width", 200, "display.max_colwidth", 60):
+            print(table.drop(columns=["key", "digest"]).to_string(index=False))
+    elif args.command == "prune":
+        removed = cache.prune(max_bytes=None if args.max_mb is None else int(args.max_mb * 2**20),
+                              older_than=None if args.older_than_days is None else args.older_than_days * 86400,
+                              stale=args.stale)
+        print(f"Removed {removed:,} entries")
+    else:
+        cache.clear()
+        print("Cleared")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from datastore import dataset_version
+from search_index import normalize
+from text_clean import clean_text
+from warehouse import load_table, table_version
+
+DISTRICT_GEOJSON = "india_districts.geojson"
+# Resolution -> Douglas-Peucker tolerance in degrees (0 keeps every vertex)
+RESOLUTIONS = {"coarse": 0.05, "medium": 0.01, "full": 0.0}
+STATE_PROPERTIES = ("ST_NM", "st_nm", "STATE", "state")
+DISTRICT_PROPERTIES = ("DISTRICT", "district", "dtname", "DIST_NAME")
+
+# Metric -> fact table whose rows are counted per district
+METRICS = {
+    "Teacher registrations": "fact_teacher_registration",
+    "Schools registered": "fact_school_registration",
+    "Students enrolled": "fact_student_progress",
+    "Ideas submitted": "fact_idea",
+}
+
+
+def simplified_path(resolution, path=DISTRICT_GEOJSON):
+    root, ext = os.path.splitext(path)
+    return f"{root}.{resolution}{ext}"
+
+
+# --------- Simplification ---------
+def douglas_peucker(points, tolerance):
+    """Vertices of a polyline kept by Douglas-Peucker; the end points always stay"""
+    if tolerance <= 0 or len(points) < 3:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        dx, dy = points[end] - points[start]
+        rel = points[start + 1:end] - points[start]
+        norm = np.hypot(dx, dy)
+        dist = np.abs(dx * rel[:, 1] - dy * rel[:, 0]) / norm if norm else np.hypot(rel[:, 0], rel[:, 1])
+        i = int(dist.argmax())
+        if dist[i] > tolerance:
+            mid = start + 1 + i
+            keep[mid] = True
+            stack += [(start, mid), (mid, end)]
+    return points[keep]
+
+
+def _arcs(ring, owners):
+    """Split a closed ring at the vertices where the set of rings sharing it changes"""
+    points = ring[:-1]
+    sets = [owners[tuple(p)] for p in points]
+    n = len(points)
+    junctions = [i for i in range(n) if sets[i] != sets[i - 1] or sets[i] != sets[(i + 1) % n]]
+    if not junctions:
+        return [ring]
+    start = junctions[0]
+    rotated = np.vstack([points[start:], points[:start], points[start:start + 1]])
+    cuts = [j - start if j >= start else j - start + n for j in junctions] + [n]
+    return [rotated[a:b + 1] for a, b in zip(cuts, cuts[1:])]
+
+
+def simplify_rings(rings, tolerance):
+    """Simplify closed rings so that borders shared by neighbours stay identical.
+
+    Rings are cut into arcs at shared-border junctions and every arc is
+    simplified once, in one canonical direction, so both sides of a border get
+    the same vertices and no gaps or overlaps open up between districts.
+    """
+    owners = {}
+    for r, ring in enumerate(rings):
+        for point in map(tuple, ring[:-1]):
+            owners.setdefault(point, set()).add(r)
+    owners = {point: frozenset(rs) for point, rs in owners.items()}
+
+    done, out = {}, []
+    for ring in rings:
+        if len(ring) < 4:
+            out.append(ring)
+            continue
+        parts = []
+        for arc in _arcs(ring, owners):
+            flip = (tuple(arc[0]), tuple(arc[1])) > (tuple(arc[-1]), tuple(arc[-2]))
+            canonical = arc[::-1] if flip else arc
+            key = canonical.tobytes()
+            if key not in done:
+                done[key] = douglas_peucker(canonical, tolerance)
+            simple = done[key][::-1] if flip else done[key]
+            parts.append(simple if not parts else simple[1:])
+        simple = np.vstack(parts)
+        out.append(simple if len(simple) >= 4 else ring)
+    return out
+
+
+# --------- Boundaries ---------
+def _property(properties, candidates):
+    return next((properties[name] for name in candidates if properties.get(name)), None)
+
+
+def read_districts(path=DISTRICT_GEOJSON):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def simplify_geojson(geo, tolerance):
+    """A copy of a district FeatureCollection with every ring simplified topologically"""
+    rings, slots = [], []
+    for f_no, feature in enumerate(geo["features"]):
+        geometry = feature["geometry"]
+        polygons = [geometry["coordinates"]] if geometry["type"] == "Polygon" else geometry["coordinates"]
+        for p_no, polygon in enumerate(polygons):
+            for r_no, ring in enumerate(polygon):
+                rings.append(np.asarray(ring, dtype=float)[:, :2])
+                slots.append((f_no, p_no, r_no))
+
+    simple = simplify_rings(rings, tolerance)
+    features = [{"type": "Feature", "id": f_no, "properties": dict(f["properties"]),
+                 "geometry": {"type": "MultiPolygon", "coordinates": []}} for f in geo["features"]]
+    for (f_no, p_no, r_no), ring in zip(slots, simple):
+        polygons = features[f_no]["geometry"]["coordinates"]
+        if p_no == len(polygons):
+            polygons.append([])
+        polygons[p_no].append(np.round(ring, 5).tolist())
+    return {"type": "FeatureCollection", "features": features}
+
+
+@st.cache_resource(show_spinner=False)
+def load_boundaries(resolution, version):
+    """District outlines at one resolution; a pre-simplified file is used when it matches the source"""
+    shipped = simplified_path(resolution)
+    if os.path.exists(shipped):
+        with open(shipped, "r", encoding="utf-8") as f:
+            geo = json.load(f)
+        if geo.get("source_version") == version:
+            return geo
+    return simplify_geojson(read_districts(), RESOLUTIONS[resolution])
+
+
+def feature_keys(geo, version):
+    """Warehouse district_key of every feature, -1 where the district is not in the data"""
+    districts = load_table("dim_district", version)
+    states = load_table("dim_state", version)["state"].to_numpy()
+    index = pd.Index([f"{normalize(states[s]) if s >= 0 else ''}|{normalize(d)}"
+                      for d, s in zip(districts["district"], districts["state_key"])])
+
+    props = [f["properties"] for f in geo["features"]]
+    state = clean_text(pd.Series([_property(p, STATE_PROPERTIES) for p in props], dtype=object), "title", kind="state")
+    district = clean_text(pd.Series([_property(p, DISTRICT_PROPERTIES) for p in props], dtype=object), "title",
+                          kind="district")
+    return index.get_indexer(state.map(normalize) + "|" + district.map(normalize))
+
+
+# --------- Figure ---------
+@st.cache_resource(show_spinner=False)
+def district_figure(metric, version, geo_version, resolution):
+    """Choropleth of one metric per district, built once per (metric, data version, resolution)"""
+    geo = load_boundaries(resolution, geo_version)
+    district_keys = load_table(METRICS[metric], version)["district_key"].to_numpy()
+    keys = feature_keys(geo, version)
+    counts = np.bincount(district_keys[district_keys >= 0], minlength=len(load_table("dim_district", version)))
+    names = [_property(f["properties"], DISTRICT_PROPERTIES) for f in geo["features"]]
+    data = pd.DataFrame({"id": np.arange(len(names)), "District": names,
+                         metric: np.where(keys >= 0, counts[np.maximum(keys, 0)], 0)})
+
+    fig = px.choropleth(data, geojson=geo, locations="id", color=metric, hover_name="District",
+                        hover_data={"id": False}, color_continuous_scale="YlGnBu")
+    fig.update_geos(fitbounds="locations", visible=False)
+    fig.update_layout(height=800, margin={"r": 0, "t": 30, "l": 0, "b": 0})
+
+    mapped = np.zeros(len(counts), dtype=bool)
+    mapped[keys[keys >= 0]] = True
+    unmapped = np.flatnonzero((counts > 0) & ~mapped)
+    missing = pd.Series(counts[unmapped], index=load_table("dim_district", version)["district"].to_numpy()[unmapped],
+                        name=metric).sort_values(ascending=False)
+    return fig, missing
+
+
+# --------- Dashboard ---------
+def district_map_dashboard():
+    st.title("🗺️ District Map")
+
+    if not os.path.exists(DISTRICT_GEOJSON):
+        st.info(f"District boundaries are not installed. Add them as {DISTRICT_GEOJSON} "
+                f"(a GeoJSON FeatureCollection with state and district name properties) to enable this map.")
+        return
+
+    col1, col2 = st.columns(2)
+    metric = col1.selectbox("Metric", list(METRICS))
+    resolution = col2.radio("Boundary detail", list(RESOLUTIONS), horizontal=True)
+    try:
+        fig, missing = district_figure(metric, table_version(METRICS[metric], "dim_district", "dim_state"), dataset_version(DISTRICT_GEOJSON), resolution)
+    except (KeyError, FileNotFoundError) as e:
+        st.error(f"Cannot build the district map: {e}")
+        return
+    st.plotly_chart(fig, use_container_width=True)
+
+    if not missing.empty:
+        st.subheader("Districts without a boundary")
+        st.caption("These districts have data but no matching outline in the GeoJSON.")
+        st.dataframe(missing, use_container_width=True)
+
+
+if __name__ == "__main__":
+    version = dataset_version(DISTRICT_GEOJSON)
+    source = read_districts()
+    for resolution, tolerance in RESOLUTIONS.items():
+        geo = simplify_geojson(source, tolerance)
+        geo["source_version"] = version
+        with open(simplified_path(resolution), "w", encoding="utf-8") as f:
+            json.dump(geo, f, separators=(",", ":"))
+        vertices = sum(len(ring) for f in geo["features"] for p in f["geometry"]["coordinates"] for ring in p)
+        print(f"{resolution:8s} {vertices:>10,} vertices -> {simplified_path(resolution)}")
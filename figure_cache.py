@@ -0,0 +1,86 @@
+import io
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+MAX_BYTES = 64 * 2**20
+
+
+# --------- Byte Cache ---------
+class FigureCache:
+    """Least-recently-used store of rendered figures, bounded by their total size in bytes"""
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            data = self.entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        with self.lock:
+            if key in self.entries:
+                self.size -= len(self.entries.pop(key))
+            if len(data) > self.max_bytes:
+                return
+            self.entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+@st.cache_resource(show_spinner=False)
+def figure_cache():
+    """The process-wide figure cache shared by every session"""
+    return FigureCache()
+
+
+# --------- Rendering ---------
+def render_heatmap(data, figsize, image_format, **heatmap_kwargs):
+    """Seaborn heatmap of data as image bytes.
+
+    The figure is built on a bare matplotlib Figure, not pyplot, so it is never
+    registered globally and is released as soon as the bytes are written.
+    """
+    # Plotting libraries load on the first cache miss only
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    try:
+        sns.heatmap(data, ax=fig.subplots(), **heatmap_kwargs)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=image_format, bbox_inches="tight")
+        return buffer.getvalue()
+    finally:
+        fig.clear()
+
+
+def cached_heatmap(key, data, figsize=(8, 14), image_format="png", **heatmap_kwargs):
+    """Show a static heatmap, rendering it only the first time key is seen.
+
+    key must identify the data shown, e.g. (chart name, data version, filter).
+    """
+    cache = figure_cache()
+    key = (key, image_format)
+    image = cache.get(key)
+    if image is None:
+        image = render_heatmap(data, figsize, image_format, **heatmap_kwargs)
+        cache.put(key, image)
+    if image_format == "svg":
+        st.image(image.decode("utf-8"))
+    else:
+        st.image(image)
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Stage -> bit of the per-student stage mask, in funnel order
+STAGES = {
+    "Pre Survey": 1,
+    "Course Started": 2,
+    "Course Completed": 4,
+    "Post Survey": 8,
+    "Idea Submitted": 16,
+}
+REGISTERED = "Registered"
+ALL_STAGES = sum(STAGES.values())
+N_MASKS = ALL_STAGES + 1
+
+
+# --------- Encoding ---------
+def stage_bits(completion, pre_survey, post_survey, idea):
+    """uint8 mask of the stages each student has completed"""
+    completion = np.asarray(completion, dtype=float)
+    bits = np.zeros(len(completion), dtype=np.uint8)
+    for stage, done in (("Pre Survey", pre_survey), ("Course Started", completion > 0),
+                        ("Course Completed", completion >= 100), ("Post Survey", post_survey),
+                        ("Idea Submitted", idea)):
+        bits |= np.where(np.asarray(done, dtype=bool), STAGES[stage], 0).astype(np.uint8)
+    return bits
+
+
+def has_all(bits, *stages):
+    """Rows that completed every given stage"""
+    need = sum(STAGES[stage] for stage in stages)
+    return (np.asarray(bits) & need) == need
+
+
+def has_none(bits, *stages):
+    """Rows that completed none of the given stages"""
+    return (np.asarray(bits) & sum(STAGES[stage] for stage in stages)) == 0
+
+
+# --------- Counting ---------
+# reached[mask, k]: a student with this mask passed funnel step k (every stage up to it)
+_STEP_NEEDS = np.cumsum([0] + list(STAGES.values()))
+REACHED = ((np.arange(N_MASKS)[:, None] & _STEP_NEEDS[None, :]) == _STEP_NEEDS[None, :]).astype(np.int64)
+
+
+def combination_counts(bits):
+    """Students per stage combination; index is the stage mask"""
+    return np.bincount(np.asarray(bits, dtype=np.uint8), minlength=N_MASKS)
+
+
+def funnel_counts(combos):
+    """Students reaching each funnel step from combination counts, registration first"""
+    return pd.Series(combos @ REACHED, index=[REGISTERED, *STAGES], name="students")
+
+
+def drop_off(counts):
+    """Students, share of registered and loss against the previous step"""
+    counts = pd.Series(counts)
+    previous = counts.shift(1)
+    return pd.DataFrame({
+        "Students": counts,
+        "% of Registered": counts / max(counts.iloc[0], 1) * 100,
+        "Lost from Previous": (previous - counts).fillna(0).astype(int),
+        "% Kept from Previous": (counts / previous.replace(0, np.nan) * 100).fillna(100),
+    })
+
+
+def combination_table(combos):
+    """Non-empty stage combinations with their student counts, largest first"""
+    masks = np.flatnonzero(combos)
+    labels = [" + ".join(stage for stage, bit in STAGES.items() if mask & bit) or "Nothing yet" for mask in masks]
+    table = pd.DataFrame({"Stages Completed": labels, "Students": combos[masks]})
+    return table.sort_values("Students", ascending=False, ignore_index=True)
+
+
+def group_funnel(bits, groups):
+    """Funnel counts per group (school, team, ...) from one bincount over (group, mask)"""
+    codes, names = pd.factorize(pd.Series(groups))
+    valid = codes >= 0
+    cells = codes[valid].astype(np.int64) * N_MASKS + np.asarray(bits)[valid]
+    combos = np.bincount(cells, minlength=len(names) * N_MASKS).reshape(len(names), N_MASKS)
+    table = pd.DataFrame(combos @ REACHED, index=pd.Index(names), columns=[REGISTERED, *STAGES])
+    table["Conversion %"] = table["Idea Submitted"] / table[REGISTERED].replace(0, np.nan) * 100
+    return table.sort_values(REGISTERED, ascending=False)
+
+
+# --------- Chart ---------
+def funnel_chart(counts, title="Student Program Funnel"):
+    fig = go.Figure(go.Funnel(
+        y=list(counts.index),
+        x=list(counts.values),
+        textinfo="value+percent initial+percent previous",
+    ))
+    fig.update_layout(title=title, height=500)
+    return fig
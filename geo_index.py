@@ -0,0 +1,71 @@
+import numpy as np
+import streamlit as st
+
+EMPTY = np.array([], dtype=np.intp)
+
+
+class GeoIndex:
+    """State -> district -> school hierarchy of a frame, every node mapped to its row positions"""
+
+    def __init__(self, df, columns):
+        self.columns = list(columns)
+        self.n_rows = len(df)
+        self.positions = {}
+        self.children = {}
+        for depth in range(1, len(self.columns) + 1):
+            groups = df.groupby(self.columns[:depth], sort=False).indices
+            for key, rows in groups.items():
+                path = key if isinstance(key, tuple) else (key,)
+                self.positions[path] = rows
+                self.children.setdefault(path[:-1], []).append(path[-1])
+        for names in self.children.values():
+            names.sort(key=str)
+
+    def options(self, path=()):
+        """Sorted members one level below path"""
+        return self.children.get(tuple(path), [])
+
+    def rows(self, path=()):
+        """Row positions under path; every row for the empty path"""
+        if not path:
+            return np.arange(self.n_rows)
+        return self.positions.get(tuple(path), EMPTY)
+
+    def mask(self, path=()):
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.rows(path)] = True
+        return mask
+
+    def take(self, df, path=()):
+        """The rows of df under path; df itself when nothing is selected"""
+        return df.take(self.rows(path)) if path else df
+
+
+@st.cache_resource(show_spinner=False)
+def load_geo_index(name, version, _df, columns):
+    """Hierarchy index of one dashboard's frame, built once per data version"""
+    return GeoIndex(_df, columns)
+
+
+# --------- Dashboard Section ---------
+def geo_filter(index, key, labels=("State", "District", "School")):
+    """Cascading selectboxes, one per hierarchy level; returns the selected path.
+
+    A level only lists the members under the choice above it and is disabled
+    until that choice is made.
+    """
+    path = ()
+    open_level = True
+    for col, label in zip(st.columns(len(index.columns)), labels):
+        everything = f"All {label}s"
+        if not open_level:
+            col.selectbox(f"Select {label}", [everything], disabled=True, key=f"{key}_{label}")
+            continue
+        # Keyed by the parent path so a new parent choice resets this level
+        choice = col.selectbox(f"Select {label}", [everything] + index.options(path),
+                               key=f"{key}_{label}_{'|'.join(map(str, path))}")
+        if choice == everything:
+            open_level = False
+        else:
+            path += (choice,)
+    return path
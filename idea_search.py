@@ -0,0 +1,145 @@
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from search_index import MIN_NGRAM_SIMILARITY, TOKEN_RE, TrigramIndex
+
+IDEAS_FILE = "Submitted_Ideas.csv"
+INDEX_FILE = "Submitted_Ideas.search.npz"
+
+TEXT_HINTS = ("problem", "solution", "idea", "describe", "explain", "places", "title",
+              "theme", "state", "district")
+STOPWORDS = frozenset("""a an and are as at be by can do for from has have in is it its of on or our so
+that the their them there they this to was we were what which who will with you your""".split())
+
+K1, B = 1.2, 0.75           # BM25 parameters
+MAX_EXPANSIONS = 50         # vocabulary terms tried per prefix / fuzzy query token
+
+
+def text_columns(df):
+    """Free-text and place columns worth searching"""
+    return [
+        column for column in df.columns
+        if (pd.api.types.is_string_dtype(df[column]) or pd.api.types.is_object_dtype(df[column]))
+        and any(hint in column.lower() for hint in TEXT_HINTS)
+        and not any(skip in column.lower() for skip in ("status", "language"))
+    ]
+
+
+# --------- BM25 Index ---------
+class IdeaIndex:
+    """Inverted index over the idea texts with BM25 ranking.
+
+    Postings are stored CSR-style: the documents containing vocabulary term t are
+    doc_ids[indptr[t]:indptr[t + 1]] with matching term_freqs.
+    """
+
+    def __init__(self, vocabulary, indptr, doc_ids, term_freqs, doc_lengths, version):
+        self.vocabulary = vocabulary
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+        self.version = version
+        self.avg_length = max(doc_lengths.mean(), 1.0) if len(doc_lengths) else 1.0
+
+        doc_freq = np.diff(indptr)
+        n_docs = len(doc_lengths)
+        self.idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        self._ngrams = None
+
+    @classmethod
+    def build(cls, df, version):
+        columns = text_columns(df)
+        text = df[columns].fillna("").astype(str).agg(" ".join, axis=1) if columns else pd.Series("", index=df.index)
+        token_lists = text.str.lower().str.findall(TOKEN_RE)
+        doc = np.repeat(np.arange(len(df)), token_lists.str.len().to_numpy())
+        tokens = token_lists.explode().dropna()
+        keep = ~tokens.isin(STOPWORDS).to_numpy()
+        doc, tokens = doc[keep], tokens.to_numpy()[keep]
+
+        term_codes, vocabulary = pd.factorize(tokens, sort=True)
+        pairs = pd.DataFrame({"term": term_codes, "doc": doc}).groupby(["term", "doc"]).size()
+        terms = pairs.index.get_level_values("term").to_numpy()
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(terms, minlength=len(vocabulary)))])
+        return cls(
+            vocabulary=np.asarray(vocabulary, dtype=str),
+            indptr=indptr.astype(np.int64),
+            doc_ids=pairs.index.get_level_values("doc").to_numpy(dtype=np.int32),
+            term_freqs=pairs.to_numpy(dtype=np.int32),
+            doc_lengths=np.bincount(doc, minlength=len(df)).astype(np.int32),
+            version=version,
+        )
+
+    # --------- Persistence ---------
+    def save(self, path):
+        """Write the index; readers see the old file or the new one, never a partial write"""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, vocabulary=self.vocabulary, indptr=self.indptr, doc_ids=self.doc_ids,
+                         term_freqs=self.term_freqs, doc_lengths=self.doc_lengths, version=np.array(self.version))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["vocabulary"], data["indptr"], data["doc_ids"], data["term_freqs"],
+                       data["doc_lengths"], str(data["version"]))
+
+    # --------- Query ---------
+    def _ngram_index(self):
+        """Trigram index over the vocabulary, built on the first fuzzy query"""
+        if self._ngrams is None:
+            self._ngrams = TrigramIndex(self.vocabulary)
+        return self._ngrams
+
+    def expand(self, token):
+        """Vocabulary ids for a query token: every term with it as prefix, else similar spellings by trigram overlap"""
+        lo, hi = np.searchsorted(self.vocabulary, [token, token + "{"])  # "{" sorts after every [0-9a-z]
+        if hi > lo:
+            ids = np.arange(lo, hi)
+            if len(ids) > MAX_EXPANSIONS:  # keep the most common completions
+                ids = ids[np.argsort(self.idf[ids], kind="stable")[:MAX_EXPANSIONS]]
+            return ids
+
+        return self._ngram_index().similar(token, MIN_NGRAM_SIMILARITY)[:MAX_EXPANSIONS]
+
+    def search(self, query, allowed=None, limit=100):
+        """Row positions and BM25 scores of the best matching ideas; allowed is an optional row mask"""
+        scores = np.zeros(len(self.doc_lengths))
+        length_norm = K1 * (1 - B + B * self.doc_lengths / self.avg_length)
+        for token in dict.fromkeys(t for t in TOKEN_RE.findall(query.lower()) if t not in STOPWORDS):
+            token_scores = np.zeros_like(scores)
+            for term in self.expand(token):
+                start, end = self.indptr[term], self.indptr[term + 1]
+                docs = self.doc_ids[start:end]
+                tf = self.term_freqs[start:end]
+                weight = self.idf[term] * tf * (K1 + 1) / (tf + length_norm[docs])
+                token_scores[docs] = np.maximum(token_scores[docs], weight)
+            scores += token_scores
+        if allowed is not None:
+            scores[~allowed] = 0
+        hits = np.flatnonzero(scores > 0)
+        top = hits[np.argsort(-scores[hits], kind="stable")[:limit]]
+        return top, scores[top]
+
+
+def load_or_build(df, version, path=INDEX_FILE):
+    """Index persisted next to the ideas file; rebuilt when the file has changed or cannot be read"""
+    if os.path.exists(path):
+        try:
+            index = IdeaIndex.load(path)
+            if index.version == version and len(index.doc_lengths) == len(df):
+                return index
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            pass
+    index = IdeaIndex.build(df, version)
+    index.save(path)
+    return index
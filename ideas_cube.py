@@ -0,0 +1,50 @@
+import pandas as pd
+
+LANGUAGE_COL = 'Select in which language you prefer Submitting Your Idea?'
+SCHOOL_TYPE_COL = 'School Type/Category'
+LOCATION_COL = 'In which places in your community did you find this problem?'
+ACTION_COL = 'Pick the actions your team did in your problem solving journey (You can choose multiple options)'
+
+CUBE_DIMENSIONS = ['State', 'Theme', LANGUAGE_COL, SCHOOL_TYPE_COL, 'Teacher Gender', 'Idea Submission Status']
+
+
+# --------- State Cube ---------
+class IdeaCube:
+    """Idea counts grouped by every dimension combination, built in one pass over the ideas file.
+
+    Crosstabs, top-N lists and per-state views are sums over slices of this table;
+    each state's rows are found by dictionary lookup.
+    """
+
+    def __init__(self, df):
+        self.dimensions = [col for col in CUBE_DIMENSIONS if col in df.columns]
+        self.counts = (df.groupby(self.dimensions, dropna=False, sort=True).size()
+                       .rename("ideas").reset_index())
+        self.state_rows = self.counts.groupby("State", sort=False).indices
+        self.states = sorted(self.state_rows)
+        self.locations = df[LOCATION_COL].value_counts() if LOCATION_COL in df.columns else None
+
+    def has(self, *dims):
+        return all(dim in self.dimensions for dim in dims)
+
+    def slice(self, state=None):
+        """Cube rows of one state, or all rows"""
+        if state is None:
+            return self.counts
+        rows = self.state_rows.get(state)
+        return self.counts.iloc[rows] if rows is not None else self.counts.iloc[:0]
+
+    def total(self, *dims, state=None):
+        """Idea counts summed over the other dimensions; missing values are dropped like crosstab does"""
+        return self.slice(state).groupby(list(dims))["ideas"].sum()
+
+    def table(self, row, col, state=None):
+        return self.total(row, col, state=state).unstack(fill_value=0)
+
+    def share_by_state(self, dim):
+        """Percent of each state's ideas per value of dim (crosstab normalize='index')"""
+        table = self.table("State", dim)
+        return table.div(table.sum(axis=1), axis=0) * 100
+
+    def top(self, dim, n=5, state=None):
+        return self.total(dim, state=state).sort_values(ascending=False, kind="stable").head(n).rename("count")
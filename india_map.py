@@ -0,0 +1,93 @@
+import functools
+import json
+from html import escape
+
+import numpy as np
+import streamlit as st
+
+from datastore import dataset_version
+from figure_cache import figure_cache
+from search_index import normalize
+
+GEOJSON_FILE = "india_states.geojson"
+# Light to dark, one colour per equal-width band of the largest count
+PALETTE = ["#ffffcc", "#c7e9b4", "#7fcdbb", "#41b6c4", "#2c7fb8", "#253494"]
+NO_DATA = "#e0e0e0"
+WIDTH = 800
+LEGEND_HEIGHT = 50
+
+
+# --------- Outlines ---------
+@functools.lru_cache(maxsize=4)
+def _load_geojson(path, version):
+    with open(path, "r", encoding="utf-8") as f:
+        geo = json.load(f)
+    for feature in geo["features"]:
+        feature["properties"]["ST_NM"] = feature["properties"]["ST_NM"].strip().title()
+    return geo
+
+
+def india_geojson(path=GEOJSON_FILE):
+    """State outlines with title-cased ST_NM names, read once per file version; do not modify"""
+    return _load_geojson(path, dataset_version(path))
+
+
+def _rings(geometry):
+    polygons = [geometry["coordinates"]] if geometry["type"] == "Polygon" else geometry["coordinates"]
+    return [np.asarray(ring, dtype=float)[:, :2] for polygon in polygons for ring in polygon]
+
+
+# --------- SVG Choropleth ---------
+def render_state_map(counts, title, path=GEOJSON_FILE):
+    """Self-contained SVG choropleth of counts (state -> number); hovering a state shows its count"""
+    shapes = [(f["properties"]["ST_NM"], _rings(f["geometry"])) for f in india_geojson(path)["features"]]
+    points = np.vstack([ring for _, rings in shapes for ring in rings])
+    (lon0, lat0), (lon1, lat1) = points.min(axis=0), points.max(axis=0)
+    # Equirectangular projection squeezed by the cosine of the middle latitude
+    kx = np.cos(np.radians((lat0 + lat1) / 2))
+    scale = WIDTH / max((lon1 - lon0) * kx, 1e-9)
+    height = (lat1 - lat0) * scale
+
+    values = {normalize(state): value for state, value in counts.items()}
+    top = max(values.values(), default=0)
+    parts = [f'<text x="{WIDTH / 2}" y="-12" text-anchor="middle" font-size="18" fill="#888">{escape(title)}</text>']
+    for name, rings in shapes:
+        value = values.get(normalize(name))
+        if value is None:
+            fill = NO_DATA
+        else:
+            fill = PALETTE[min(int(value / top * len(PALETTE)), len(PALETTE) - 1)] if top else PALETTE[0]
+        d = " ".join(
+            "M" + " L".join(f"{x:.1f},{y:.1f}" for x, y in zip((ring[:, 0] - lon0) * kx * scale,
+                                                              (lat1 - ring[:, 1]) * scale)) + " Z"
+            for ring in rings
+        )
+        parts.append(f'<path d="{d}" fill="{fill}" stroke="#555" stroke-width="0.6" fill-rule="evenodd">'
+                     f'<title>{escape(name)}: {value or 0:,}</title></path>')
+
+    band = WIDTH / (len(PALETTE) + 1)
+    for i, color in enumerate(PALETTE):
+        x = band * (i + 0.5)
+        parts.append(f'<rect x="{x:.1f}" y="{height + 15:.1f}" width="{band:.1f}" height="12" fill="{color}"/>'
+                     f'<text x="{x:.1f}" y="{height + 42:.1f}" font-size="12" fill="#888">{top * i / len(PALETTE):,.0f}</text>')
+    parts.append(f'<rect x="{band * (len(PALETTE) + 0.6):.1f}" y="{height + 15:.1f}" width="{band * 0.3:.1f}" '
+                 f'height="12" fill="{NO_DATA}"/><text x="{band * (len(PALETTE) + 0.6):.1f}" y="{height + 42:.1f}" '
+                 f'font-size="12" fill="#888">no data</text>')
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 -30 {WIDTH} {height + 30 + LEGEND_HEIGHT:.0f}" '
+            f'width="100%">{"".join(parts)}</svg>')
+
+
+def cached_state_map(key, counts, title, path=GEOJSON_FILE):
+    """Show the state map, rendering it only the first time key (e.g. chart name, data version) is seen"""
+    cache = figure_cache()
+    key = ("state_map", key, dataset_version(path))
+    svg = cache.get(key)
+    if svg is None:
+        svg = render_state_map(counts, title, path).encode("utf-8")
+        cache.put(key, svg)
+    st.html(svg.decode("utf-8"))
+
+    outlined = {normalize(f["properties"]["ST_NM"]) for f in india_geojson(path)["features"]}
+    unmapped = [state for state in counts.keys() if normalize(state) not in outlined]
+    if unmapped:
+        st.caption(f"No outline in {path} for: {', '.join(map(str, unmapped))}")
@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from result_cache import cached_result
+
+# Source file and column names of each quiz response log
+QUIZZES = {
+    "quiz1": {"file": "quiz1dataprocessed.csv", "user": "user_id", "question": "question_number",
+              "correct": "is_correct", "option": "selected_option", "attempt": "quiz_attempts"},
+    "quiz2": {"file": "prcss_quiz2.csv", "user": "User_id", "question": "Question_no",
+              "correct": "Is_Correct", "option": "Selected_Option", "attempt": "Attempts", "name": "Name"},
+    "quiz3": {"file": "df_cleaned_3.csv", "user": "User_id", "question": "question_no",
+              "correct": "is_correct", "option": "selected_option", "attempt": "Attempts"},
+    "quiz4": {"file": "df_cleaned_quiz4.csv", "user": "User_id", "question": "question_no",
+              "correct": "is_correct", "option": "selected_option", "attempt": "Attempts", "name": "Name"},
+    "quiz5": {"file": "quiz5.csv", "user": "User_id", "question": "question_no",
+              "correct": "is_correct", "option": "selected_option", "attempt": "Attempts", "name": "Name"},
+}
+
+GROUP_FRACTION = 0.27           # share of students in the upper and lower groups
+FUNCTIONAL_DISTRACTOR_RATE = 0.05
+
+
+# --------- Response Matrix ---------
+def first_attempt_responses(df, cols):
+    """Rows from each user's first attempt at the quiz"""
+    first = df.groupby(cols["user"])[cols["attempt"]].transform("min")
+    return df[df[cols["attempt"]].to_numpy() == first.to_numpy()]
+
+
+def response_matrix(responses, cols):
+    """Users x questions matrix of 1/0 scores, NaN where a question was not answered"""
+    user_codes, users = pd.factorize(responses[cols["user"]])
+    question_codes, questions = pd.factorize(responses[cols["question"]], sort=True)
+    # Code -1 (missing user or question) would index the last row or column
+    known = (user_codes >= 0) & (question_codes >= 0)
+    matrix = np.full((len(users), len(questions)), np.nan, dtype=np.float64)
+    matrix[user_codes[known], question_codes[known]] = responses[cols["correct"]].astype(float).to_numpy()[known]
+    return matrix, users, questions
+
+
+# --------- Item Statistics ---------
+def _safe_divide(num, den):
+    return np.divide(num, den, out=np.full(np.shape(num), np.nan), where=den > 0)
+
+
+def item_statistics(matrix):
+    """Difficulty, point-biserial and upper/lower discrimination for every column of the matrix"""
+    answered = ~np.isnan(matrix)
+    scores = np.where(answered, matrix, 0.0)
+    n = answered.sum(axis=0)
+    difficulty = _safe_divide(scores.sum(axis=0), n)
+
+    # Point-biserial against the rest score (total without the item itself)
+    total = scores.sum(axis=1)
+    rest = total[:, None] - scores
+    mean_rest = _safe_divide((rest * answered).sum(axis=0), n)
+    dx = (scores - difficulty) * answered
+    dr = (rest - mean_rest) * answered
+    point_biserial = _safe_divide((dx * dr).sum(axis=0), np.sqrt((dx ** 2).sum(axis=0) * (dr ** 2).sum(axis=0)))
+
+    # Upper / lower 27% groups by total score
+    order = np.argsort(total, kind="stable")
+    group = max(1, int(round(len(order) * GROUP_FRACTION)))
+    lower, upper = order[:group], order[-group:]
+    p_upper = _safe_divide(scores[upper].sum(axis=0), answered[upper].sum(axis=0))
+    p_lower = _safe_divide(scores[lower].sum(axis=0), answered[lower].sum(axis=0))
+
+    return {
+        "responses": n,
+        "difficulty": difficulty,
+        "point_biserial": point_biserial,
+        "upper_p": p_upper,
+        "lower_p": p_lower,
+        "discrimination": p_upper - p_lower,
+    }
+
+
+def distractor_rates(responses, cols, questions):
+    """Selection count and rate of every option per question, with the keyed (correct) option marked.
+
+    A question nobody answered correctly has no keyed option among the selections.
+    """
+    question_codes = questions.get_indexer(responses[cols["question"]])
+    option_codes, options = pd.factorize(responses[cols["option"]])
+    valid = (option_codes >= 0) & (question_codes >= 0)
+    k, m = len(questions), len(options)
+
+    flat = question_codes[valid] * m + option_codes[valid]
+    correct = responses[cols["correct"]].astype(float).to_numpy()[valid]
+    counts = np.bincount(flat, minlength=k * m).reshape(k, m)
+    correct_counts = np.bincount(flat, weights=correct, minlength=k * m).reshape(k, m)
+    key = np.where(correct_counts.max(axis=1) > 0, correct_counts.argmax(axis=1), -1)
+    rates = _safe_divide(counts, counts.sum(axis=1, keepdims=True))
+
+    q_idx, o_idx = np.nonzero(counts)
+    return pd.DataFrame({
+        "question": questions[q_idx],
+        "option": options[o_idx],
+        "count": counts[q_idx, o_idx],
+        "selection_rate": rates[q_idx, o_idx],
+        "is_key": o_idx == key[q_idx],
+    })
+
+
+def analyze(df, cols):
+    """Item statistics and distractor table for one quiz response log"""
+    responses = first_attempt_responses(df, cols)
+    matrix, users, questions = response_matrix(responses, cols)
+    stats = item_statistics(matrix)
+    distractors = distractor_rates(responses, cols, questions)
+
+    items = pd.DataFrame({"question": questions, **stats})
+    wrong = distractors[~distractors["is_key"]]
+    functional = (wrong["selection_rate"] >= FUNCTIONAL_DISTRACTOR_RATE).groupby(wrong["question"]).agg(["sum", "count"])
+    items = items.merge(functional.rename(columns={"sum": "functional_distractors", "count": "distractors"}),
+                        left_on="question", right_index=True, how="left")
+    items["distractor_efficiency"] = _safe_divide(items["functional_distractors"].to_numpy(dtype=float),
+                                                  items["distractors"].to_numpy(dtype=float))
+    items["review"] = np.select(
+        [items["point_biserial"] < 0.2, items["difficulty"] > 0.9, items["difficulty"] < 0.3],
+        ["Low discrimination", "Too easy", "Too hard"],
+        default=""
+    )
+    return items, distractors, len(users)
+
+
+# --------- Dashboard Tab ---------
+def item_analysis_tab(df, quiz_key):
+    cols = QUIZZES[quiz_key]
+
+    @cached_result("Item Analysis", cols["file"])
+    def cached_analysis(quiz_key):
+        """Item analysis shared per quiz and data version"""
+        return analyze(df, cols)
+
+    items, distractors, n_users = cached_analysis(quiz_key)
+
+    st.subheader("🧪 Item Analysis (first attempts)")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Students", n_users)
+    col2.metric("Mean Difficulty Index", f"{items['difficulty'].mean():.2f}")
+    col3.metric("Items to Review", int((items["review"] != "").sum()))
+
+    fig = px.scatter(items, x="difficulty", y="point_biserial", text="question",
+                     color="review", hover_data=["discrimination", "distractor_efficiency"],
+                     labels={"difficulty": "Difficulty Index (p)", "point_biserial": "Point-Biserial Discrimination"},
+                     title="Difficulty vs Discrimination")
+    fig.update_traces(textposition="top center")
+    fig.add_hline(y=0.2, line_dash="dash", line_color="grey")
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.dataframe(items.round(3), use_container_width=True, hide_index=True)
+    st.caption("Difficulty is the share answering correctly; discrimination compares the top and bottom 27% of "
+               "students. Distractors chosen by fewer than 5% of students are non-functional.")
+
+    st.markdown("### Distractor Selection Rates")
+    selected_question = st.selectbox("Select a question", items["question"].tolist(), key=f"{quiz_key}_item_question")
+    question_options = distractors[distractors["question"] == selected_question].assign(
+        answer=lambda d: np.where(d["is_key"], "Correct", "Distractor"))
+    fig = px.bar(question_options, x="option", y="selection_rate", color="answer", text="count",
+                 color_discrete_map={"Correct": "#4CAF50", "Distractor": "#F44336"},
+                 labels={"selection_rate": "Selection Rate", "option": "Option"})
+    st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,118 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from datastore import dataset_version, find_column
+from item_analysis import QUIZZES
+from result_cache import cached_result
+from search_index import LookupIndex
+
+KIND_LABELS = {
+    "school": "🏫 School",
+    "udise": "🔢 UDISE Code",
+    "teacher": "👩‍🏫 Teacher",
+    "student": "🎓 Student",
+    "team": "👥 Team",
+    "user": "🆔 User ID",
+}
+
+# dataset -> (file, read options, {entity kind: candidate column names})
+SOURCES = {
+    "Student Progress": ("StudentProgressDetailedReport_3_7_2025 10_10_32.csv", {}, {
+        "student": ["Student Name"], "school": ["School Name"], "team": ["Team Name"],
+        "teacher": ["Teacher Name"], "udise": ["UDISE Code"], "user": ["User ID", "user_id"]}),
+    "Teacher Progress": ("cleaned_teacher_progress.xlsx", {}, {
+        "teacher": ["Teacher Name"], "school": ["School Name"], "udise": ["UDISE Code"]}),
+    "Teacher Registration": ("Teacher_Registration_Cleaned (1).csv", {}, {
+        "teacher": ["Teacher_Name"], "school": ["School_Name"], "udise": ["Udise_Code"]}),
+    "School Registration": ("cleaned_school_data.csv", {}, {
+        "school": ["School Name"], "udise": ["UDISE Code"]}),
+    "Submitted Ideas": ("Submitted_Ideas.csv", {"encoding": "ISO-8859-1"}, {
+        "school": ["School Name"], "team": ["Team Name"], "teacher": ["Teacher Name"], "udise": ["UDISE CODE"]}),
+    "Course Progress": ("courseprogress1.xls", {}, {"user": ["user_id"]}),
+}
+for _no, _cols in enumerate(QUIZZES.values(), start=1):
+    SOURCES[f"Quiz {_no}"] = (_cols["file"], {}, {"user": [_cols["user"]], "student": [_cols.get("name", "Name")]})
+SOURCE_FILES = tuple(path for path, _, _ in SOURCES.values())
+CHUNK_ROWS = 100_000
+MAX_PROFILE_ROWS = 500
+
+
+def read_source(path, options):
+    if path.endswith(".xlsx"):
+        return pd.read_excel(path, dtype=str)
+    return pd.read_csv(path, dtype=str, low_memory=False, **options)
+
+
+def read_rows(dataset, rows):
+    """Rows of one dataset at the given positions, as read_source numbers them, reading the file in chunks"""
+    path, options, _ = SOURCES[dataset]
+    if path.endswith(".xlsx"):
+        return read_source(path, options).iloc[rows]
+    parts, start = [], 0
+    for chunk in pd.read_csv(path, dtype=str, chunksize=CHUNK_ROWS, **options):
+        lo, hi = np.searchsorted(rows, [start, start + len(chunk)])
+        parts.append(chunk.iloc[rows[lo:hi] - start])
+        start += len(chunk)
+    return pd.concat(parts)
+
+
+@st.cache_resource(show_spinner=False)
+def build_lookup(version):
+    """Index the names, codes and ids of every dataset; only row positions are kept, not the datasets"""
+    index = LookupIndex()
+    for dataset, (path, options, fields) in SOURCES.items():
+        if not os.path.exists(path):
+            continue
+        df = read_source(path, options)
+        for kind, candidates in fields.items():
+            column = find_column(df, *candidates)
+            if column is not None:
+                index.add(dataset, column, kind, df[column])
+    return index.finish()
+
+
+def lookup_dashboard():
+    st.title("🔎 Student / Teacher / School 360° Lookup")
+
+    with st.spinner("Building search index..."):
+        index = build_lookup(dataset_version(*SOURCE_FILES))
+
+    query = st.text_input("Search by school, teacher, student or team name, UDISE code or user id")
+    if not query.strip():
+        datasets = {field.dataset for field in index.fields}
+        st.info(f"Indexed {len(index.entities):,} names and codes across {len(datasets)} datasets.")
+        return
+
+    start = time.perf_counter()
+    matches = index.search(query)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if not matches:
+        st.warning("No matches found. Try a shorter or differently spelled query.")
+        return
+    st.caption(f"{len(matches)} matches in {elapsed_ms:.1f} ms")
+
+    key = st.selectbox(
+        "Select a match", matches,
+        format_func=lambda k: f"{KIND_LABELS[k[0]]}: {k[1].title()} ({index.row_counts[k]:,} records)"
+    )
+    profile = index.profile(key)
+
+    @cached_result("360° Lookup", *SOURCE_FILES)
+    def profile_rows(key):
+        """The first records of one entity in every dataset that mentions it"""
+        return {dataset: read_rows(dataset, rows[:MAX_PROFILE_ROWS]) for dataset, rows in index.profile(key).items()}
+
+    records = profile_rows(key)
+
+    st.subheader(f"{KIND_LABELS[key[0]]}: {key[1].title()}")
+    cols = st.columns(len(profile))
+    for col, (dataset, rows) in zip(cols, profile.items()):
+        col.metric(dataset, len(rows))
+
+    for dataset, rows in profile.items():
+        with st.expander(f"{dataset} — {len(rows):,} records", expanded=len(profile) == 1):
+            st.dataframe(records[dataset], use_container_width=True, hide_index=True)
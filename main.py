@@ -1,4 +1,7 @@
+import os
+
 import streamlit as st
+import datastore  # noqa: F401  (enables pandas copy-on-write for every page)
 from login import login_page, logout
 
 st.set_page_config(page_title="Umagine Dashboards", layout="wide")
@@ -16,7 +19,7 @@ else:
         st.title("📊 Dashboard")
         #st.success(f"Logged in as: {st.session_state.username}", icon="✅")
 
-        section = st.radio("Go to", [
+        pages = [
             "Teacher Registration",
             "School Registration",
             "Teacher Course Timestamp",
@@ -30,8 +33,20 @@ else:
             "Quiz 5 Dashboard",
             "Submitted Ideas",
             "Student Progress Dashboard",
-            "Post Survey Dashboard"
-        ])
+            "Post Survey Dashboard",
+            "Student Learning Trajectory",
+            "360° Lookup",
+            "Registration → Idea Conversion",
+            "Pre vs Post Impact",
+            "District Map",
+            "Segment Builder",
+            "Admin"
+        ]
+        # The district boundaries are not shipped with the app; the map is only offered once they are added
+        from district_map import DISTRICT_GEOJSON
+        if not os.path.exists(DISTRICT_GEOJSON):
+            pages.remove("District Map")
+        section = st.radio("Go to", pages)
         
         if st.button("🚪 Logout"):
             logout()
@@ -91,3 +106,31 @@ else:
         elif section == "Pre Survey Dashboard":
             from presurvey import presurvey_dashboard
             presurvey_dashboard()
+
+        elif section == "Student Learning Trajectory":
+            from quiz_facts import learning_trajectory_dashboard
+            learning_trajectory_dashboard()
+
+        elif section == "360° Lookup":
+            from lookup import lookup_dashboard
+            lookup_dashboard()
+
+        elif section == "Registration → Idea Conversion":
+            from school_dim import conversion_dashboard
+            conversion_dashboard()
+
+        elif section == "Pre vs Post Impact":
+            from survey_pairs import impact_dashboard
+            impact_dashboard()
+
+        elif section == "District Map":
+            from district_map import district_map_dashboard
+            district_map_dashboard()
+
+        elif section == "Segment Builder":
+            from segments import segment_builder_dashboard
+            segment_builder_dashboard()
+
+        elif section == "Admin":
+            from admin import admin_dashboard
+            admin_dashboard()
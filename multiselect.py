@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import scipy.sparse as sp
+import streamlit as st
+
+SEPARATOR = r"\s*,\s*"
+
+
+# --------- Indicator Matrix ---------
+class OptionMatrix:
+    """Respondent x option 0/1 sparse matrix of a "tick all that apply" question"""
+
+    def __init__(self, matrix, options, respondents):
+        self.matrix = matrix
+        self.options = options
+        self.respondents = respondents
+
+    @property
+    def n_respondents(self):
+        """Respondents who ticked at least one option"""
+        return int((np.diff(self.matrix.indptr) > 0).sum())
+
+    def frequencies(self):
+        """Respondents per option, most picked first; percentages can add up to more than 100"""
+        counts = np.asarray(self.matrix.sum(axis=0)).ravel()
+        return pd.DataFrame({
+            "option": self.options,
+            "respondents": counts,
+            "percent": counts / max(self.n_respondents, 1) * 100,
+        }).sort_values("respondents", ascending=False, ignore_index=True)
+
+    def cooccurrence(self):
+        """Option x option counts of respondents who ticked both; the diagonal is the option frequency"""
+        counts = (self.matrix.T @ self.matrix).toarray()
+        return pd.DataFrame(counts, index=self.options, columns=self.options)
+
+    def conditional_rates(self):
+        """Percent of respondents ticking the row option who also ticked the column option"""
+        counts = self.cooccurrence().to_numpy(dtype=float)
+        picked = np.diag(counts)[:, None]
+        rates = np.divide(counts, picked, out=np.full(counts.shape, np.nan), where=picked > 0) * 100
+        return pd.DataFrame(rates, index=self.options, columns=self.options)
+
+    def subset(self, mask):
+        """The same question restricted to the respondents where mask is True"""
+        mask = np.asarray(mask, dtype=bool)
+        return OptionMatrix(self.matrix[mask], self.options, self.respondents[mask])
+
+
+def option_matrix(answers, respondents=None, sep=SEPARATOR):
+    """Split multi-select answers into a sparse respondent x option matrix.
+
+    Only the distinct answer strings are split; rows sharing a respondent id
+    (e.g. one row per ticked option) are merged into one matrix row. With
+    sep=None every answer is one option, for single-choice questions whose
+    options may contain the separator ("Yes, sometimes").
+    """
+    answers = pd.Series(answers).reset_index(drop=True)
+    if respondents is None:
+        respondents = np.arange(len(answers))
+    respondent_codes, respondent_ids = pd.factorize(pd.Series(respondents).reset_index(drop=True))
+    answer_codes, unique_answers = pd.factorize(answers)
+
+    split = pd.Series(unique_answers, dtype=object).astype(str).str.strip()
+    if sep is not None:
+        split = split.str.split(sep, regex=True).explode()
+    split = split[split.str.len() > 0]
+    option_codes, options = pd.factorize(split, sort=True)
+    answer_options = sp.csr_matrix(
+        (np.ones(len(option_codes), dtype=np.int32), (split.index.to_numpy(), option_codes)),
+        shape=(len(unique_answers), len(options))
+    )
+
+    valid = (answer_codes >= 0) & (respondent_codes >= 0)
+    respondent_answers = sp.csr_matrix(
+        (np.ones(int(valid.sum()), dtype=np.int32), (respondent_codes[valid], answer_codes[valid])),
+        shape=(len(respondent_ids), len(unique_answers))
+    )
+    matrix = (respondent_answers @ answer_options).tocsr()
+    matrix.data[:] = 1
+    return OptionMatrix(matrix, pd.Index(options), pd.Index(respondent_ids))
+
+
+# --------- Dashboard Section ---------
+def multi_select_section(matrix, key):
+    """Per-option frequency bar and option co-occurrence heatmap"""
+    freq = matrix.frequencies()
+    bars = freq.assign(label=freq["percent"].map("{:.1f}%".format))[::-1]
+    fig = px.bar(bars, x="respondents", y="option", orientation="h", text="label",
+                 labels={"respondents": "Respondents", "option": "Option"})
+    st.plotly_chart(fig, use_container_width=True, key=f"{key}_frequency")
+    st.caption(f"Each of the {matrix.n_respondents:,} respondents counts once per option ticked, "
+               "so percentages can add up to more than 100%.")
+
+    with st.expander("🔗 Which options are ticked together?"):
+        rates = matrix.conditional_rates().loc[freq["option"], freq["option"]]
+        fig = px.imshow(rates, text_auto=".0f", color_continuous_scale="Blues", aspect="auto",
+                        labels=dict(x="…also ticked", y="Respondents who ticked", color="%"))
+        st.plotly_chart(fig, use_container_width=True, key=f"{key}_cooccurrence")
+        st.caption("Row option → percent of those respondents who also ticked the column option.")
@@ -0,0 +1,123 @@
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+
+from datastore import dataset_version, find_column
+from text_clean import clean_text
+
+PINCODE_FILE = "pincode_directory.csv"
+PIN_CANDIDATES = ("Pincode", "Pin code", "Pin Code", "pincode")
+STATE_CANDIDATES = ("State",)
+DISTRICT_CANDIDATES = ("District", "City")
+
+# Columns of the directory, matched with find_column (the India Post export names first)
+DIRECTORY_COLUMNS = {
+    "pincode": ("pincode", "Pincode", "Pin code"),
+    "district": ("Districtname", "district", "District"),
+    "state": ("statename", "StateName", "state", "State"),
+}
+
+# Per-row outcomes reported by enrich
+FILLED, CORRECTED, MISMATCH = "filled", "state corrected", "district mismatch"
+
+
+def pin_codes(series):
+    """6-digit pincodes as int64, -1 where missing or malformed; parsed once per distinct value"""
+    codes, uniques = pd.factorize(series)
+    text = pd.Series(uniques, dtype=object).astype(str).str.strip().str.replace(r"\.0$", "", regex=True)
+    parsed = pd.to_numeric(text.where(text.str.fullmatch(r"[1-9]\d{5}")), errors="coerce").fillna(-1)
+    return np.append(parsed.to_numpy(np.int64), -1)[codes]
+
+
+# --------- Directory ---------
+class PincodeDirectory:
+    """Sorted pincode array with the district and state of every code, looked up by binary search"""
+
+    def __init__(self, pincodes, districts, states):
+        order = np.argsort(pincodes, kind="stable")
+        self.pincodes = np.asarray(pincodes, dtype=np.int64)[order]
+        self.districts = np.asarray(districts, dtype=object)[order]
+        self.states = np.asarray(states, dtype=object)[order]
+
+    @classmethod
+    def read(cls, path=PINCODE_FILE):
+        """One row per pincode; a code listed under several districts takes the one with most post offices"""
+        table = pd.read_csv(path, dtype=str)
+        cols = {role: find_column(table, *candidates) for role, candidates in DIRECTORY_COLUMNS.items()}
+        if None in cols.values():
+            raise KeyError(f"{path} needs pincode, district and state columns")
+        table = pd.DataFrame({
+            "pincode": pin_codes(table[cols["pincode"]]),
+            "district": clean_text(table[cols["district"]], "title", kind="district"),
+            "state": clean_text(table[cols["state"]], "title", kind="state"),
+        })
+        table = table[table["pincode"] >= 0].dropna()
+        best = (table.groupby(["pincode", "district", "state"]).size()
+                .sort_values(ascending=False, kind="stable").reset_index().drop_duplicates("pincode"))
+        return cls(best["pincode"].to_numpy(), best["district"].to_numpy(), best["state"].to_numpy())
+
+    def lookup(self, pins):
+        """(district, state) arrays for pins, None where a pin is not in the directory"""
+        pins = np.asarray(pins, dtype=np.int64)
+        districts = np.full(len(pins), None, dtype=object)
+        states = np.full(len(pins), None, dtype=object)
+        if len(self.pincodes):
+            pos = np.minimum(np.searchsorted(self.pincodes, pins), len(self.pincodes) - 1)
+            found = self.pincodes[pos] == pins
+            districts[found] = self.districts[pos[found]]
+            states[found] = self.states[pos[found]]
+        return districts, states
+
+
+@functools.lru_cache(maxsize=2)
+def _read_directory(path, version):
+    return PincodeDirectory.read(path)
+
+
+def load_directory(path=PINCODE_FILE):
+    """The offline pincode directory, read once per file version; None when it is not installed"""
+    if not os.path.exists(path):
+        return None
+    return _read_directory(path, dataset_version(path))
+
+
+# --------- Enrichment ---------
+def enrich(df, directory=None):
+    """Fill missing state and district values from each row's pincode and fix states that contradict it.
+
+    Districts that disagree with the directory are only flagged, since district
+    names drift more than state names. Returns the frame and the per-row
+    outcome ("" where nothing was done).
+    """
+    fixes = np.full(len(df), "", dtype=object)
+    pin_col = find_column(df, *PIN_CANDIDATES)
+    if directory is None or pin_col is None:
+        return df, pd.Series(fixes, index=df.index)
+
+    # Lookups run on the distinct pincodes only
+    codes, uniques = pd.factorize(df[pin_col])
+    districts, states = directory.lookup(pin_codes(pd.Series(uniques, dtype=object)))
+    districts, states = np.append(districts, None)[codes], np.append(states, None)[codes]
+
+    updates = {}
+    for candidates, expected, kind in ((STATE_CANDIDATES, states, "state"), (DISTRICT_CANDIDATES, districts, "district")):
+        col = find_column(df, *candidates)
+        if col is None:
+            continue
+        known = pd.notna(expected)
+        current = clean_text(df[col], "title", kind=kind).replace("", None)
+        missing = current.isna().to_numpy()
+        expected_lower = pd.Series(expected, dtype=object).str.lower().to_numpy()
+        differs = known & ~missing & (current.str.lower().to_numpy() != expected_lower)
+        filled = known & missing
+        fixes[filled] = FILLED
+        if kind == "state":
+            values = np.where(filled | differs, expected, df[col].to_numpy(dtype=object))
+            fixes[differs & (fixes == "")] = CORRECTED
+        else:
+            values = np.where(filled, expected, df[col].to_numpy(dtype=object))
+            fixes[differs & (fixes == "")] = MISMATCH
+        updates[col] = values
+    return df.assign(**updates), pd.Series(fixes, index=df.index)
@@ -2,17 +2,51 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
+from datastore import cached_frame, dataset_version, find_column
+from disk_cache import disk_cached
+from multiselect import multi_select_section, option_matrix
+from search_index import normalize
+from survey_cube import MULTI_SELECT, is_filtered, segment_filters, survey_cube
+
 st.set_page_config(page_title="Pre-Survey Dashboard", layout="wide")
 st.title("📊 Pre-Survey Dashboard")
 
-@st.cache_data(show_spinner=False)
+PRE_SURVEY_FILE = "cleaned_pre_survey.xlsx"
+MULTI_SELECT_QUESTIONS = MULTI_SELECT["pre"]
+
+@cached_frame(PRE_SURVEY_FILE)
+@disk_cached(PRE_SURVEY_FILE)
+def load_data():
+    df = pd.read_excel(PRE_SURVEY_FILE)
+    return df
+
+@st.cache_resource(show_spinner=False)
+def load_option_matrices(version):
+    """Split the "Tick all that apply" answers into option matrices once per file version"""
+    df = load_data()
+    user_col = find_column(df, "user_id", "User ID")
+    matrices = {}
+    for q_no in MULTI_SELECT_QUESTIONS:
+        qdf = df[df['question_no'] == q_no]
+        matrices[q_no] = option_matrix(qdf['selected_option'], qdf[user_col] if user_col else None)
+    return matrices
+
 def presurvey_dashboard():
     st.title("📊 Pre-Survey Dashboard")
-    def load_data():
-        df = pd.read_excel("cleaned_pre_survey.xlsx")
-        return df
+    option_matrices = load_option_matrices(dataset_version(PRE_SURVEY_FILE))
 
-    df = load_data()
+    # Segment filters slice the precomputed count cube instead of rescanning responses
+    cube, segmented = survey_cube("pre")
+    segment = segment_filters(cube, "pre") if segmented else {}
+
+    def counts(q_no):
+        return cube.counts("pre", q_no, segment)
+
+    def matrix(q_no):
+        if not is_filtered(segment):
+            return option_matrices[q_no]
+        respondents = option_matrices[q_no].respondents.map(normalize)
+        return option_matrices[q_no].subset(respondents.isin(cube.members(segment)))
 
     tabs = st.tabs([
         "Participation & Exposure",
@@ -29,22 +63,19 @@ def presurvey_dashboard():
         st.subheader("1. Participation & Exposure")
 
         st.markdown("*Q1: Did you participate in this program last year?*")
-        q1 = df[df['question_no'] == 1]
-        fig1 = px.bar(q1['selected_option'].value_counts().reset_index(name='count').rename(columns={'index': 'selected_option'}),
+        fig1 = px.bar(counts(1).reset_index(name='count').rename(columns={'index': 'selected_option'}),
                     x='selected_option', y='count', color='selected_option')
         st.plotly_chart(fig1, use_container_width=True)
         st.caption("📅 Shows how many students are returning participants versus new ones.")
 
         st.markdown("*Q2: In a school year, how often do you get an opportunity to: Learn using online material like courses, websites or apps*")
-        q2 = df[df['question_no'] == 2]
-        fig2 = px.bar(q2['selected_option'].value_counts().reset_index(name='count').rename(columns={'index': 'selected_option'}),
+        fig2 = px.bar(counts(2).reset_index(name='count').rename(columns={'index': 'selected_option'}),
                     x='selected_option', y='count', color='selected_option')
         st.plotly_chart(fig2, use_container_width=True)
         st.caption("🌐 Highlights the frequency of digital learning experiences among students.")
 
         st.markdown("*Q10: In a school year, how often do you get an opportunity to: Work in pairs or small groups to learn or complete tasks together*")
-        q10 = df[df['question_no'] == 10]
-        fig10 = px.bar(q10['selected_option'].value_counts().reset_index(name='count').rename(columns={'index': 'selected_option'}),
+        fig10 = px.bar(counts(10).reset_index(name='count').rename(columns={'index': 'selected_option'}),
                     x='selected_option', y='count', color='selected_option')
         st.plotly_chart(fig10, use_container_width=True)
         st.caption("👥 Captures collaborative learning exposure through peer-based group activities.")
@@ -54,29 +85,21 @@ def presurvey_dashboard():
         st.subheader("2. Personal Attributes")
 
         st.markdown("*Q3: Think about your daily life, Which of the following best describes you? [Tick all that apply]*")
-        q3 = df[df['question_no'] == 3]
-        fig3 = px.bar(q3['selected_option'].value_counts().reset_index(name='count').rename(columns={'index': 'selected_option'}),
-                    x='count', y='selected_option', orientation='h')
-        st.plotly_chart(fig3, use_container_width=True)
+        multi_select_section(matrix(3), key="pre_q3")
         st.caption("🧠 Reveals dominant personality traits and habits students see in themselves.")
 
         st.markdown("*Q4: Think about your daily life, Which of the following best describes you? [Tick all that apply]*")
-        q4 = df[df['question_no'] == 4]
-        fig4 = px.bar(q4['selected_option'].value_counts().reset_index(name='count').rename(columns={'index': 'selected_option'}),
-                    x='count', y='selected_option', orientation='h')
-        st.plotly_chart(fig4, use_container_width=True)
+        multi_select_section(matrix(4), key="pre_q4")
         st.caption("💡 Adds more depth to how students perceive their everyday behavior and mindset.")
 
         st.markdown("*Q15: How do you feel you express your creativity in the above activity?*")
-        q15 = df[df['question_no'] == 15]
-        fig15 = px.pie(q15, names='selected_option')
+        fig15 = px.pie(counts(15).reset_index(), names='selected_option', values='count')
         st.plotly_chart(fig15, use_container_width=True)
         st.caption("🎨 Visualizes how students express creativity through activities like drawing or music.")
 
         st.markdown("*Q20: What kind of student are you in class?*")
-        q20 = df[df['question_no'] == 20]
         fig20 = px.treemap(
-            q20['selected_option'].value_counts().reset_index(name='count').rename(columns={'index': 'selected_option'}),
+            counts(20).reset_index(name='count').rename(columns={'index': 'selected_option'}),
             path=['selected_option'],
             values='count',
             hover_data=[]
@@ -90,15 +113,13 @@ def presurvey_dashboard():
         st.subheader("3. Community & Problem-Solving")
 
         st.markdown("*Q5: If these problems were an issue in your community, which would you pick to solve?*")
-        q5 = df[df['question_no'] == 5]
-        fig5 = px.bar(q5['selected_option'].value_counts().reset_index(name='count').rename(columns={'index': 'selected_option'}),
+        fig5 = px.bar(counts(5).reset_index(name='count').rename(columns={'index': 'selected_option'}),
                     x='count', y='selected_option', orientation='h')
         st.plotly_chart(fig5, use_container_width=True)
         st.caption("🏘️ Highlights the community issues students are most motivated to solve.")
 
         st.markdown("### ❓ Q6: Why did you pick this problem?")
-        q6 = df[df['question_no'] == 6]
-        q6_summary = q6['selected_option'].value_counts().reset_index()
+        q6_summary = counts(6).reset_index()
         q6_summary.columns = ['Reason', 'Count']
         st.dataframe(q6_summary)
 
@@ -117,8 +138,7 @@ def presurvey_dashboard():
         st.caption("📖 Displays student reasoning behind choosing a specific community issue.")
 
         st.markdown("*Q7: Dental problems in your community — best solution steps?*")
-        q7 = df[df['question_no'] == 7]
-        fig7 = px.bar(q7['selected_option'].value_counts().reset_index(name='count').rename(columns={'index': 'selected_option'}),
+        fig7 = px.bar(counts(7).reset_index(name='count').rename(columns={'index': 'selected_option'}),
                     x='selected_option', y='count')
         st.plotly_chart(fig7, use_container_width=True)
         st.caption("🦷 Analyzes how students propose to tackle real-world health problems like dental care.")
@@ -147,10 +167,12 @@ def presurvey_dashboard():
 
         for q_no, q_text in questions.items():
             st.markdown(f"*{q_text}*")
-            qdf = df[df['question_no'] == q_no]
-            fig = px.bar(qdf['selected_option'].value_counts().reset_index(name='count').rename(columns={'index': 'selected_option'}),
-                        x='count', y='selected_option', orientation='h')
-            st.plotly_chart(fig, use_container_width=True)
+            if q_no in option_matrices:
+                multi_select_section(matrix(q_no), key=f"pre_q{q_no}")
+            else:
+                fig = px.bar(counts(q_no).reset_index(name='count').rename(columns={'index': 'selected_option'}),
+                            x='count', y='selected_option', orientation='h')
+                st.plotly_chart(fig, use_container_width=True)
             st.caption(captions[q_no])
 
     # 5. Creativity & Expression
@@ -165,9 +187,8 @@ def presurvey_dashboard():
 
         for q_no, q_text in creativity_questions.items():
             st.markdown(f"*{q_text}*")
-            qdf = df[df['question_no'] == q_no]
             fig = px.treemap(
-                qdf['selected_option'].value_counts().reset_index(name='count').rename(columns={'index': 'selected_option'}),
+                counts(q_no).reset_index(name='count').rename(columns={'index': 'selected_option'}),
                 path=['selected_option'],
                 values='count',
                 hover_data=[]
@@ -181,8 +202,7 @@ def presurvey_dashboard():
         st.subheader("6. Learning Style & Curiosity")
 
         st.markdown("*Q18: Helping a friend’s traditional art business — What would you do?*")
-        q18 = df[df['question_no'] == 18]
-        counts18 = q18['selected_option'].value_counts().reset_index(name='count')
+        counts18 = counts(18).reset_index(name='count')
         counts18.rename(columns={'index': 'selected_option'}, inplace=True)
 
         fig18 = px.bar_polar(
@@ -208,8 +228,7 @@ def presurvey_dashboard():
         st.dataframe(counts18.rename(columns={'selected_option': 'Preferred Action', 'count': 'Total Count'}))
 
         st.markdown("*Q21: When you have questions, how do you try to find answers?*")
-        q21 = df[df['question_no'] == 21]
-        counts21 = q21['selected_option'].value_counts().reset_index(name='count')
+        counts21 = counts(21).reset_index(name='count')
         counts21.rename(columns={'index': 'selected_option'}, inplace=True)
 
         fig21 = px.bar(counts21, x='count', y='selected_option', orientation='h')
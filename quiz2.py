@@ -2,11 +2,17 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
+from datastore import cached_frame
+from item_analysis import item_analysis_tab
+from result_cache import cached_result
+
+QUIZ_FILE = "prcss_quiz2.csv"
+
 st.set_page_config(page_title="Quiz 2 Dashboard", layout="wide")
 
-@st.cache_data(show_spinner=False)
+@cached_frame(QUIZ_FILE)
 def load_data():
-    return pd.read_csv("prcss_quiz2.csv")  # 🔁 Replace with your CSV file
+    return pd.read_csv(QUIZ_FILE)  # 🔁 Replace with your CSV file
 def quiz2dashboard():
     st.title(" 📊 Quiz-2 Dashboard")
     df = load_data()
@@ -14,11 +20,12 @@ def quiz2dashboard():
     user_scores = df.drop_duplicates(subset=["User_id", "Quiz_id"])
 
     # Create Tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "1️⃣ Overall Performance",
         "2️⃣ Question-Level Insights",
         "3️⃣ User Behavior",
-        "4️⃣ Additional Insights"
+        "4️⃣ Additional Insights",
+        "5️⃣ Item Analysis"
     ])
 
     with tab1:
@@ -157,18 +164,24 @@ def quiz2dashboard():
         st.subheader("🧾Response Summary of Student")
         student_list = df[~df["Name"].str.contains("class", case=False, na=False)]["Name"].dropna().unique()
         selected_student = st.selectbox("Select a student", sorted(student_list))
-        student_df = df[df["Name"] == selected_student]
-        summary_df = student_df[[
-            "Quiz_id", "Attempts", "Question_no", "Question",
-            "Selected_Option", "Correct_Answer",
-            "Is_Correct", "Total_Score", "Level"
-        ]].sort_values(by=["Attempts", "Question_no"])
-
-        summary_df["Is_Correct"] = summary_df["Is_Correct"].replace({
-            1: "✅ Correct", 0: "❌ Incorrect", True: "✅ Correct", False: "❌ Incorrect"
-        })
 
-        summary_df.reset_index(drop=True, inplace=True)
+        @cached_result("Quiz 2", QUIZ_FILE)
+        def student_summary(name):
+            """Every answer of one student, by attempt and question"""
+            student_df = df[df["Name"] == name]
+            summary_df = student_df[[
+                "Quiz_id", "Attempts", "Question_no", "Question",
+                "Selected_Option", "Correct_Answer",
+                "Is_Correct", "Total_Score", "Level"
+            ]].sort_values(by=["Attempts", "Question_no"])
+
+            summary_df["Is_Correct"] = summary_df["Is_Correct"].replace({
+                1: "✅ Correct", 0: "❌ Incorrect", True: "✅ Correct", False: "❌ Incorrect"
+            })
+
+            return summary_df.reset_index(drop=True)
+
+        summary_df = student_summary(selected_student)
 
         st.dataframe(summary_df, use_container_width=True,hide_index=True)
         if st.checkbox("🔍 Show Attempt-wise Summary Count"):
@@ -228,4 +241,5 @@ def quiz2dashboard():
         st.plotly_chart(fig, use_container_width=True)
         st.success("User with 68 attempts achieved 9 scores whereas users with 1 attempts achieved 10, suggesting that higher attempts do not always correlate with better performance.")
 
-        
+    with tab5:
+        item_analysis_tab(df, "quiz2")
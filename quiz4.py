@@ -2,24 +2,45 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
+from datastore import FROZEN_HASH_FUNCS, cached_frame
+import quiz_kernels as qk
+from item_analysis import item_analysis_tab
+
+QUIZ_FILE = "df_cleaned_quiz4.csv"
 
 
 # Load data
-@st.cache_data(show_spinner=False)
+@cached_frame(QUIZ_FILE)
 def load_data():
-    return pd.read_csv("df_cleaned_quiz4.csv")
+    return pd.read_csv(QUIZ_FILE)
+
+
+@st.cache_data(show_spinner=False, hash_funcs=FROZEN_HASH_FUNCS)
+def compute_attempt_views(df):
+    """Per-question and per-user frames shared by the question, error and attempt tabs"""
+    user_accuracy, group_counts = qk.accuracy_groups(df)
+    comparison = qk.attempt_comparison(df)
+    return {
+        'question_stats': qk.question_stats(df),
+        'most_common_incorrect': qk.most_common_incorrect(df),
+        'group_counts': group_counts,
+        'attempt_counts': qk.attempt_types(df),
+        'category_counts': qk.result_breakdown(comparison),
+    }
 
 def quiz4_dashboard():
     df = load_data()
+    views = compute_attempt_views(df)
 
     st.title("📊 Quiz 4 Dashboard")
 
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
         "📌 Accuracy",
         "📋 Question-Wise Analysis",
         "🧩 Error Pattern Analysis",
         "🔁 Attempts",
-        "📈 Performance Improvement"
+        "📈 Performance Improvement",
+        "🧪 Item Analysis"
     ])
 
     with tab1:
@@ -121,31 +142,25 @@ def quiz4_dashboard():
         st.plotly_chart(fig, use_container_width=True)
 
     with tab2:
+        question_stats = views['question_stats']
+
         st.subheader("✅ Most Correctly Answered Question")
-        most_correct = df.groupby(['question_no', 'question'])['is_correct'].sum().reset_index()
-        most_correct_sorted = most_correct.sort_values(by='is_correct', ascending=False)
+        most_correct_sorted = question_stats.sort_values(by='total_correct', ascending=False)
         st.dataframe(most_correct_sorted.head(1)[['question_no', 'question']], use_container_width=True, hide_index=True)
 
         st.subheader("❌ Most Incorrectly Answered Question (Distractor)")
-        question_errors = df.groupby(['question_no', 'question'])['is_correct'].agg(total_attempts='count', total_correct='sum').reset_index()
-        question_errors['incorrect'] = question_errors['total_attempts'] - question_errors['total_correct']
-        most_incorrect = question_errors.sort_values(by='incorrect', ascending=False)
+        most_incorrect = question_stats.sort_values(by='incorrect', ascending=False)
         st.dataframe(most_incorrect.head(1)[['question_no', 'question']], use_container_width=True, hide_index=True)
 
         st.subheader("📊 Accuracy Percentage Per Question")
-        accuracy_per_question = df.groupby(['question_no', 'question'])['is_correct'].agg(total_attempts='count', total_correct='sum').reset_index()
-        accuracy_per_question['accuracy_percent'] = (accuracy_per_question['total_correct'] / accuracy_per_question['total_attempts'] * 100).round(2)
-        accuracy_per_question = accuracy_per_question.sort_values(by='question_no')
+        accuracy_per_question = question_stats.sort_values(by='question_no')
         st.dataframe(accuracy_per_question[['question_no', 'question', 'accuracy_percent']], use_container_width=True, hide_index=True)
 
     with tab3:
         st.header("🧩 Error Pattern Analysis")
 
         st.subheader("📌 1. Error Rate (%) Per Question")
-        error_rate_df = df.groupby(['question_no', 'question'])['is_correct'].agg(total_attempts='count', total_correct='sum').reset_index()
-        error_rate_df['incorrect'] = error_rate_df['total_attempts'] - error_rate_df['total_correct']
-        error_rate_df['error_rate_percent'] = (error_rate_df['incorrect'] / error_rate_df['total_attempts']) * 100
-        error_rate_df['error_rate_percent'] = error_rate_df['error_rate_percent'].round(2)
+        error_rate_df = views['question_stats']
         st.dataframe(error_rate_df[['question_no', 'question', 'error_rate_percent']], use_container_width=True, hide_index=True)
 
         st.subheader("🚨 2. Maximum Error Rate Across Questions")
@@ -153,14 +168,10 @@ def quiz4_dashboard():
         st.metric(label="Maximum Error Rate", value=f"{max_error_rate:.2f}%")
 
         st.subheader("🧪 3. Most Common Incorrect Options Per Question")
-        incorrect_df = df[df['is_correct'] == 0]
-        incorrect_option_counts = incorrect_df.groupby(['question_no', 'selected_option']).size().reset_index(name='temp_count')
-        most_common_incorrect = incorrect_option_counts.sort_values(['question_no', 'temp_count'], ascending=[True, False]).groupby('question_no').first().reset_index()
-        final_result = most_common_incorrect[['question_no', 'selected_option']].copy()
-        final_result.rename(columns={'selected_option': 'most_common_incorrect_option'}, inplace=True)
-        st.dataframe(final_result, use_container_width=True, hide_index=True)
+        st.dataframe(views['most_common_incorrect'], use_container_width=True, hide_index=True)
 
         st.subheader("🔁 4. Repeated Wrong Selections by Users")
+        incorrect_df = df[df['is_correct'] == 0]
         repeated_wrong_groups = incorrect_df.groupby(['User_id', 'quiz_question_id', 'selected_option']).size().reset_index(name='wrongcount')
         repeated_wrong_selections = repeated_wrong_groups[repeated_wrong_groups['wrongcount'] > 1]
         st.metric(label="Total Repeated Wrong Selections", value=repeated_wrong_selections.shape[0])
@@ -182,30 +193,8 @@ def quiz4_dashboard():
 
         st.subheader("🍩 3. Accuracy Groups by User")
 
-    # Group and calculate accuracy
-        user_accuracy = df.groupby('User_id').agg(
-            total_questions=('question_no', 'count'),
-            correct_answers=('is_correct', 'sum')
-        ).reset_index()
-
-        user_accuracy['accuracy'] = user_accuracy['correct_answers'] / user_accuracy['total_questions']
-
-        # Categorize accuracy
-        def categorize_accuracy(acc):
-            if acc > 0.8:
-                return "High (above 80%)"
-            elif acc >= 0.5:
-                return "Medium (50%–80%)"
-            else:
-                return "Low (below 50%)"
-
-        user_accuracy['accuracy_group'] = user_accuracy['accuracy'].apply(categorize_accuracy)
-
-        # Count users in each group
-        group_counts = user_accuracy['accuracy_group'].value_counts().reindex(
-            ['High (above 80%)', 'Medium (50%–80%)', 'Low (below 50%)'], fill_value=0
-        ).reset_index()
-        group_counts.columns = ['accuracy_group', 'user_count']
+    # Users per accuracy group
+        group_counts = views['group_counts']
 
         # Plotly donut chart
         fig = px.pie(
@@ -233,8 +222,10 @@ def quiz4_dashboard():
         st.plotly_chart(fig, use_container_width=True)
 
         st.markdown("### 📋 Accuracy Group Summary:")
-        for _, row in group_counts.iterrows():
-            st.write(f"{row['accuracy_group']}: {row['user_count']} students")
+        st.write("\n\n".join(
+            f"{group}: {count} students"
+            for group, count in zip(group_counts['accuracy_group'], group_counts['user_count'])
+        ))
 
 
         st.subheader("📶 4. Accuracy by Attempt Number")
@@ -273,11 +264,9 @@ def quiz4_dashboard():
         st.header("📈 Performance Improvement Analysis")
 
         st.subheader("👥 1. Users with Single vs Multiple Attempts")
-        attempt_counts = df.groupby(['User_id', 'Name'])['Attempts'].nunique().reset_index()
-        attempt_counts.rename(columns={'Attempts': 'num_attempts'}, inplace=True)
-        attempt_counts['attempt_type'] = attempt_counts['num_attempts'].apply(lambda x: 'single attempt' if x == 1 else 'multiple attempt')
+        attempt_counts = views['attempt_counts']
         single_attempt_df = attempt_counts[attempt_counts['attempt_type'] == 'single attempt'][['User_id', 'Name']]
-        multiple_attempt_df = attempt_counts[attempt_counts['attempt_type'] == 'multiple attempt'][['User_id', 'Name']]
+        multiple_attempt_df = attempt_counts[attempt_counts['attempt_type'] == 'multiple attempts'][['User_id', 'Name']]
 
         col1, col2 = st.columns(2)
         with col1:
@@ -290,13 +279,7 @@ def quiz4_dashboard():
         st.subheader("📊 2. Bar Chart – Users by Attempt Type")
 
         # Summarize attempt types
-        attempt_summary = df.groupby(['User_id', 'Name'])['Attempts'].nunique().reset_index()
-        attempt_summary.rename(columns={'Attempts': 'unique_attempts'}, inplace=True)
-        attempt_summary['attempt_type'] = attempt_summary['unique_attempts'].apply(
-            lambda x: 'single attempt' if x == 1 else 'multiple attempts'
-        )
-
-        attempt_counts_chart = attempt_summary['attempt_type'].value_counts().reset_index()
+        attempt_counts_chart = attempt_counts['attempt_type'].value_counts().reset_index()
         attempt_counts_chart.columns = ['attempt_type', 'user_count']
 
         # Plotly bar chart with hover
@@ -324,25 +307,7 @@ def quiz4_dashboard():
         st.plotly_chart(fig, use_container_width=True)
 
         st.subheader("📈 3. Comparison of Score: Attempt 1 vs Attempt 2")
-        score1 = df[df['Attempts'] == 1].groupby('User_id')['score'].max().reset_index().rename(columns={'score': 'score1'})
-        score2 = df[df['Attempts'] == 2].groupby('User_id')['score'].max().reset_index().rename(columns={'score': 'score2'})
-        comparison = pd.merge(score1, score2, on='User_id', how='outer')
-
-        def categorize(row):
-            if pd.isna(row['score1']) or pd.isna(row['score2']):
-                return 'incomplete'
-            elif row['score2'] > row['score1']:
-                return 'improved'
-            elif row['score2'] < row['score1']:
-                return 'worsened'
-            else:
-                return 'no change'
-
-        comparison['result_category'] = comparison.apply(categorize, axis=1)
-        category_counts = comparison['result_category'].value_counts().reset_index()
-        category_counts.columns = ['result_category', 'count']
-        total_users = category_counts['count'].sum()
-        category_counts['percentage'] = (category_counts['count'] / total_users * 100).round(1)
+        category_counts = views['category_counts']
         st.markdown("### 📊 Result Category Breakdown")
         st.dataframe(category_counts)
 
@@ -371,4 +336,7 @@ def quiz4_dashboard():
             margin=dict(t=50, b=50, l=50, r=50)
         )
 
-        st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+        st.plotly_chart(fig, use_container_width=True)
+
+    with tab6:
+        item_analysis_tab(df, "quiz4")
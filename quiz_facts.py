@@ -0,0 +1,180 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from datastore import cached_frame, dataset_version
+from item_analysis import QUIZZES
+
+FACTS_FILE = "quiz_facts.parquet"
+USERS_FILE = "quiz_users.parquet"
+META_FILE = "quiz_facts.json"
+
+FACT_DTYPES = {"user_code": np.int32, "quiz": np.int8, "first_score": np.int16,
+               "best_score": np.int16, "attempts": np.int16, "accuracy": np.float32}
+
+
+def source_version():
+    return dataset_version(*(cols["file"] for cols in QUIZZES.values()))
+
+
+# --------- Ingest ---------
+def quiz_facts(df, quiz_no, cols):
+    """Per-user facts for one quiz log: attempts, first and best attempt score, accuracy"""
+    correct = df[cols["correct"]].astype(float)
+    users = df[cols["user"]]
+    attempt_scores = correct.groupby([users, df[cols["attempt"]]]).sum()
+    per_user = attempt_scores.groupby(level=0)
+    facts = pd.DataFrame({
+        "first_score": per_user.first(),
+        "best_score": per_user.max(),
+        "attempts": per_user.size(),
+        "accuracy": correct.groupby(users).mean(),
+    })
+    # Users none of whose rows carry an attempt number have no attempt to score
+    facts = facts.dropna(subset=["first_score"])
+    facts["quiz"] = quiz_no
+    return facts.rename_axis("user_id").reset_index()
+
+
+def build_fact_table():
+    """Unify the quiz logs into one student x quiz table keyed by an integer user code"""
+    frames, names = [], []
+    for quiz_no, cols in enumerate(QUIZZES.values(), start=1):
+        if not os.path.exists(cols["file"]):
+            continue
+        df = pd.read_csv(cols["file"])
+        frames.append(quiz_facts(df, quiz_no, cols))
+        if "name" in cols:
+            names.append(df[[cols["user"], cols["name"]]].set_axis(["user_id", "name"], axis=1))
+
+    facts = pd.concat(frames, ignore_index=True)
+    codes, user_ids = pd.factorize(facts["user_id"], sort=True)
+    facts = (facts.drop(columns="user_id")
+             .assign(user_code=codes)
+             .astype(FACT_DTYPES)[list(FACT_DTYPES)]
+             .sort_values(["user_code", "quiz"], ignore_index=True))
+
+    users = pd.DataFrame({"user_code": np.arange(len(user_ids), dtype=np.int32), "user_id": user_ids})
+    if names:
+        first_names = pd.concat(names).dropna().drop_duplicates("user_id")
+        users = users.merge(first_names, on="user_id", how="left")
+    else:
+        users["name"] = None
+    return facts, users
+
+
+def _replace(path, write):
+    """Call write(tmp_path), then move the file over path; readers see the old file or the new one"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def write_fact_table(version):
+    """Store the tables, then the metadata that marks them current"""
+    facts, users = build_fact_table()
+    _replace(FACTS_FILE, lambda path: facts.to_parquet(path, index=False))
+    _replace(USERS_FILE, lambda path: users.to_parquet(path, index=False))
+
+    def write_meta(path):
+        with open(path, "w") as f:
+            json.dump({"source_version": version, "students": len(users), "rows": len(facts)}, f, indent=4)
+
+    _replace(META_FILE, write_meta)
+    return facts, users
+
+
+def ensure_fact_table(version):
+    """Rebuild the stored table when the quiz logs have changed since it was written"""
+    try:
+        with open(META_FILE, "r") as f:
+            if json.load(f).get("source_version") == version and os.path.exists(FACTS_FILE):
+                return
+    except (OSError, json.JSONDecodeError):
+        pass
+    write_fact_table(version)
+
+
+@cached_frame
+def load_facts(version):
+    ensure_fact_table(version)
+    return pd.read_parquet(FACTS_FILE)
+
+
+@cached_frame
+def load_users(version):
+    ensure_fact_table(version)
+    return pd.read_parquet(USERS_FILE)
+
+
+# --------- Lookup ---------
+def student_rows(facts, user_code):
+    """All quiz facts of one student; the table is sorted by user_code so this is a binary search"""
+    lo, hi = np.searchsorted(facts["user_code"].to_numpy(), [user_code, user_code + 1])
+    return facts.iloc[lo:hi]
+
+
+# --------- Dashboard ---------
+def learning_trajectory_dashboard():
+    st.title("📈 Student Learning Trajectory")
+
+    version = source_version()
+    facts = load_facts(version)
+    users = load_users(version)
+    quiz_labels = {i: f"Quiz {i}" for i in range(1, len(QUIZZES) + 1)}
+
+    quizzes_taken = np.bincount(facts["user_code"].to_numpy(), minlength=len(users))
+    col1, col2, col3 = st.columns(3)
+    col1.metric("👥 Students", len(users))
+    col2.metric("🧭 Took Every Quiz", int((quizzes_taken == len(QUIZZES)).sum()))
+    col3.metric("📊 Avg Quizzes per Student", f"{quizzes_taken.mean():.2f}" if len(users) else "0")
+
+    # ---------- COHORT TREND ----------
+    st.subheader("Cohort Trend Across Quizzes")
+    trend = facts.groupby("quiz").agg(
+        students=("user_code", "size"),
+        first_score=("first_score", "mean"),
+        best_score=("best_score", "mean"),
+        accuracy=("accuracy", "mean"),
+    ).reset_index()
+    trend["quiz"] = trend["quiz"].map(quiz_labels)
+    fig = px.line(trend, x="quiz", y=["first_score", "best_score"], markers=True,
+                  labels={"value": "Average Score", "quiz": "Quiz", "variable": "Score"},
+                  title="Average First-Attempt vs Best Score")
+    st.plotly_chart(fig, use_container_width=True)
+    fig = px.bar(trend, x="quiz", y="students", text="students", title="Students per Quiz")
+    st.plotly_chart(fig, use_container_width=True)
+
+    # ---------- SINGLE STUDENT ----------
+    st.subheader("🔍 Follow a Student")
+    query = st.text_input("Search by user id or name")
+    labels = users["user_id"].astype(str) + " – " + users["name"].fillna("").astype(str)
+    matches = users[labels.str.contains(query, case=False, regex=False)] if query else users
+    if matches.empty:
+        st.warning("No student matches the search.")
+        return
+    user_code = st.selectbox("Select a student", matches["user_code"].head(200).tolist(),
+                             format_func=lambda code: labels.iloc[code])
+
+    student = student_rows(facts, user_code).assign(quiz=lambda d: d["quiz"].map(quiz_labels))
+    fig = px.line(student, x="quiz", y=["first_score", "best_score"], markers=True,
+                  labels={"value": "Score", "quiz": "Quiz", "variable": "Score"},
+                  title=f"Trajectory of {labels.iloc[user_code]}")
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(student.drop(columns="user_code"), use_container_width=True, hide_index=True)
+
+
+if __name__ == "__main__":
+    version = source_version()
+    facts, users = write_fact_table(version)
+    print(f"Wrote {len(facts)} rows for {len(users)} students to {FACTS_FILE} (source version {version})")
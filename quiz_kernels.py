@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+ACCURACY_GROUPS = ['High (above 80%)', 'Medium (50%–80%)', 'Low (below 50%)']
+
+
+# --------- Per-Question Frame ---------
+def question_stats(df, question_cols=('question_no', 'question'), correct_col='is_correct'):
+    """Attempts, correct/incorrect counts, accuracy and error rate per question in one groupby"""
+    stats = df.groupby(list(question_cols))[correct_col].agg(total_attempts='count', total_correct='sum').reset_index()
+    stats['total_correct'] = stats['total_correct'].astype(int)
+    stats['incorrect'] = stats['total_attempts'] - stats['total_correct']
+    stats['accuracy_percent'] = (stats['total_correct'] / stats['total_attempts'] * 100).round(2)
+    stats['error_rate_percent'] = (stats['incorrect'] / stats['total_attempts'] * 100).round(2)
+    return stats
+
+
+def most_common_incorrect(df, question_col='question_no', option_col='selected_option', correct_col='is_correct'):
+    """Most frequently selected wrong option for every question"""
+    incorrect = df[~df[correct_col].astype(bool)]
+    counts = incorrect.groupby([question_col, option_col]).size()
+    if counts.empty:
+        return pd.DataFrame(columns=[question_col, 'most_common_incorrect_option'])
+    top = counts.loc[counts.groupby(level=0).idxmax()].reset_index()
+    return top[[question_col, option_col]].rename(columns={option_col: 'most_common_incorrect_option'})
+
+
+# --------- User Classification ---------
+def accuracy_groups(df, user_col='User_id', question_col='question_no', correct_col='is_correct'):
+    """Per-user accuracy and the number of users in each accuracy group"""
+    user_accuracy = df.groupby(user_col).agg(
+        total_questions=(question_col, 'count'),
+        correct_answers=(correct_col, 'sum')
+    ).reset_index()
+    accuracy = (user_accuracy['correct_answers'] / user_accuracy['total_questions']).to_numpy()
+    user_accuracy['accuracy'] = accuracy
+
+    codes = np.select([accuracy > 0.8, accuracy >= 0.5], [0, 1], default=2)
+    user_accuracy['accuracy_group'] = pd.Categorical.from_codes(codes, ACCURACY_GROUPS)
+    group_counts = pd.DataFrame({
+        'accuracy_group': ACCURACY_GROUPS,
+        'user_count': np.bincount(codes, minlength=len(ACCURACY_GROUPS))
+    })
+    return user_accuracy, group_counts
+
+
+def attempt_types(df, user_cols=('User_id', 'Name'), attempt_col='Attempts'):
+    """Number of distinct attempts per user, labelled single or multiple"""
+    attempt_counts = df.groupby(list(user_cols))[attempt_col].nunique().reset_index(name='num_attempts')
+    attempt_counts['attempt_type'] = np.where(attempt_counts['num_attempts'].to_numpy() == 1,
+                                              'single attempt', 'multiple attempts')
+    return attempt_counts
+
+
+# --------- Attempt Comparison ---------
+def attempt_comparison(df, user_col='User_id', attempt_col='Attempts', score_col='score'):
+    """Best score on attempt 1 vs attempt 2 per user, built as a single pivot"""
+    first_two = df[df[attempt_col].isin([1, 2])]
+    comparison = (first_two.pivot_table(index=user_col, columns=attempt_col, values=score_col, aggfunc='max')
+                  .reindex(columns=[1, 2]))
+    comparison.columns = ['score1', 'score2']
+    comparison = comparison.reset_index()
+
+    score1 = comparison['score1'].to_numpy(dtype=float)
+    score2 = comparison['score2'].to_numpy(dtype=float)
+    comparison['result_category'] = np.select(
+        [np.isnan(score1) | np.isnan(score2), score2 > score1, score2 < score1],
+        ['incomplete', 'improved', 'worsened'],
+        default='no change'
+    )
+    return comparison
+
+
+def result_breakdown(comparison):
+    """Count and percentage of users per comparison result category"""
+    category_counts = comparison['result_category'].value_counts().reset_index()
+    category_counts.columns = ['result_category', 'count']
+    total_users = category_counts['count'].sum()
+    category_counts['percentage'] = (category_counts['count'] / total_users * 100).round(1) if total_users else 0.0
+    return category_counts
@@ -0,0 +1,183 @@
+import functools
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from cache_backends import CacheBackend, shared_cache
+from datastore import ALL_VALUES, FrozenFrame, dataset_version
+from disk_cache import disk_cache, disk_key, source_digest
+from singleflight import single_flight
+
+MAX_BYTES = 256 * 2**20
+TTL_SECONDS = 15 * 60
+
+
+# --------- Keys ---------
+def normalize_filter(value):
+    """Canonical, hashable form of a filter value so equal selections share one cache entry"""
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        return "All" if value in ALL_VALUES else value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, FrozenFrame):
+        # Cached frames live for the whole process, so their id is an exact key
+        return ("frame", value.frame_id)
+    if isinstance(value, tuple):
+        return tuple(normalize_filter(v) for v in value)
+    if isinstance(value, (list, set, frozenset)):
+        # Multiselect choices match regardless of the order they were picked in
+        return tuple(sorted((normalize_filter(v) for v in value), key=repr))
+    if isinstance(value, dict):
+        return tuple(sorted((k, normalize_filter(v)) for k, v in value.items()))
+    return value
+
+
+def _persistable(key):
+    """False when a normalized key holds a frozen frame id, which means nothing after a restart"""
+    if isinstance(key, tuple):
+        return not (len(key) == 2 and key[0] == "frame") and all(_persistable(k) for k in key)
+    return True
+
+
+def sizeof(value):
+    """Approximate memory held by a cached result"""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+# --------- Cache ---------
+class ResultCache(CacheBackend):
+    """In-process memo of computed results, bounded by total size (LRU) and entry age (TTL)"""
+
+    def __init__(self, max_bytes=MAX_BYTES, ttl=TTL_SECONDS):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (value, size, expires at)
+        self.size = 0
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        self.lock = threading.Lock()
+
+    def _drop(self, key):
+        _, size, _ = self.entries.pop(key)
+        self.size -= size
+
+    def get(self, key):
+        """(True, value) on a hit, (False, None) on a miss"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[2] < time.monotonic():
+                self._drop(key)
+                self.counters["expirations"] += 1
+                entry = None
+            if entry is None:
+                self.counters["misses"] += 1
+                return False, None
+            self.entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return True, entry[0]
+
+    def put(self, key, value):
+        size = sizeof(value)
+        with self.lock:
+            if key in self.entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return
+            self.entries[key] = (value, size, time.monotonic() + self.ttl)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+                self.counters["evictions"] += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                **self.counters,
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "hit_rate": self.counters["hits"] / lookups * 100 if lookups else 0.0,
+            }
+
+    def page_sizes(self):
+        """Entries and bytes held per page"""
+        with self.lock:
+            rows = [(key[1], size) for key, (_, size, _) in self.entries.items()]
+        table = pd.DataFrame(rows, columns=["page", "bytes"])
+        return table.groupby("page")["bytes"].agg(entries="count", bytes="sum").sort_values("bytes", ascending=False)
+
+
+@st.cache_resource(show_spinner=False)
+def result_cache():
+    """The process-wide result cache shared by every session"""
+    return ResultCache()
+
+
+def cached_result(page, *paths):
+    """Memoize a dashboard compute step in the shared result cache.
+
+    Entries are keyed on (version of the source files at paths, page, function,
+    normalized arguments), so another user asking for the same filters gets the
+    stored result. Misses fall back to the shared backend of other app nodes, then
+    to the disk cache, so results also survive a server restart. Sessions that
+    miss on the same key together share one computation. Results are shared
+    between sessions and must not be modified.
+    """
+    def decorate(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            filters = (normalize_filter(args), normalize_filter(kwargs))
+            key = (dataset_version(*paths), page, func.__qualname__, *filters)
+            cache = result_cache()
+            found, value = cache.get(key)
+            if found:
+                return value
+
+            def load():
+                # Other nodes and the disk store use content-hash keys, the same on every node
+                persist = _persistable(filters)
+                shared = shared_cache() if persist else None
+                found, value = False, None
+                if persist:
+                    stored = disk_key(page, name, paths, filters)
+                if shared is not None:
+                    shared.publish_versions({path: source_digest(path) for path in paths})
+                    found, value = shared.get(stored)
+                if not found:
+                    if persist:
+                        found, value = disk_cache().get(stored)
+                    if not found:
+                        value = func(*args, **kwargs)
+                        if persist:
+                            disk_cache().put(stored, value, page, name, list(paths))
+                    if shared is not None:
+                        shared.put(stored, value)
+                cache.put(key, value)
+                return value
+
+            return single_flight().do(key, load, page)
+
+        return wrapper
+
+    return decorate
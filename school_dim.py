@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from datastore import filter_rows, find_column
+from search_index import normalize
+from warehouse import GEO_FACTS, load_table, table_version
+
+REGISTRATION = "fact_school_registration"
+IDEAS = "Submitted Ideas"
+# Fact tables joined to the registered schools, by the dataset they come from
+JOINED = {dataset: fact for fact, (dataset, keys) in GEO_FACTS.items() if "school" in keys and fact != REGISTRATION}
+TABLES = (REGISTRATION, *JOINED.values(), "dim_school", "dim_district", "dim_state")
+
+
+# --------- Keys ---------
+def school_names(series):
+    """Normalized school names, computed once per distinct value"""
+    codes, uniques = pd.factorize(series)
+    normalized = np.array([normalize(v) for v in uniques] + [""], dtype=object)
+    return normalized[codes]  # code -1 picks the trailing ""
+
+
+# --------- School Dimension ---------
+class SchoolDimension:
+    """One row per registered school: the warehouse school members with a UDISE code that the registration file lists.
+
+    Other datasets join through their school_key. A member a dataset only named
+    falls back to the registered school of that name in its district.
+    """
+
+    def __init__(self, registrations, members, districts, states):
+        keys = registrations["school_key"].to_numpy()
+        udise = members["udise"].to_numpy()
+        self.unkeyed = int((keys < 0).sum() + (udise[keys[keys >= 0]] < 0).sum())
+
+        first = registrations[keys >= 0].drop_duplicates("school_key")
+        first = first[udise[first["school_key"].to_numpy()] >= 0]
+        member_keys = first["school_key"].to_numpy()
+        teachers_col = find_column(registrations, "No of teachers registered")
+        district_keys = members["district_key"].to_numpy()[member_keys]
+        state_keys = members["state_key"].to_numpy()[member_keys]
+        schools = pd.DataFrame({
+            "udise": udise[member_keys],
+            "school": members["school"].to_numpy()[member_keys],
+            "state": np.append(states["state"].to_numpy(dtype=object), None)[state_keys],
+            "district": np.append(districts["district"].to_numpy(dtype=object), None)[district_keys],
+            "teachers": (pd.to_numeric(first[teachers_col], errors="coerce").fillna(0).to_numpy()
+                         if teachers_col else 0),
+        })
+        order = np.argsort(schools["udise"].to_numpy(), kind="stable")
+        self.schools = schools.iloc[order].reset_index(drop=True)
+        member_keys = member_keys[order]
+
+        # Position in self.schools of every member: its own, else that of the one registered school of its name
+        self.positions = np.full(len(members), -1, dtype=np.int64)
+        self.positions[member_keys] = np.arange(len(self.schools))
+        names = members["district_key"].astype(str).to_numpy() + "|" + school_names(members["school"])
+        registered = pd.Series(names[member_keys])
+        unique_names = ~registered.duplicated(keep=False)
+        name_index = pd.Index(registered[unique_names])
+        unmatched = np.flatnonzero(self.positions < 0)
+        found = name_index.get_indexer(names[unmatched])
+        self.by_name = np.zeros(len(members), dtype=bool)
+        self.by_name[unmatched[found >= 0]] = True
+        self.positions[unmatched[found >= 0]] = np.flatnonzero(unique_names.to_numpy())[found[found >= 0]]
+
+    def keys(self, school_keys):
+        """Registered school of every fact row (-1 when it matches none) and the number matched by name"""
+        school_keys = np.asarray(school_keys)
+        keys = np.where(school_keys >= 0, self.positions[np.maximum(school_keys, 0)], -1)
+        by_name = int(self.by_name[school_keys[keys >= 0]].sum())
+        return keys, by_name
+
+
+@st.cache_resource(show_spinner=False)
+def build_join_index(version):
+    """School dimension plus the registered school of every row of each dataset with a school"""
+    registrations = load_table(REGISTRATION, version)
+    facts = {}
+    for dataset, fact in JOINED.items():
+        try:
+            facts[dataset] = load_table(fact, version)["school_key"].to_numpy()
+        except KeyError:
+            continue
+    dimension = SchoolDimension(registrations, load_table("dim_school", version),
+                                load_table("dim_district", version), load_table("dim_state", version))
+    return dimension, {dataset: dimension.keys(keys) for dataset, keys in facts.items()}
+
+
+# --------- Dashboard ---------
+def conversion_dashboard():
+    st.title("🔁 Registration → Idea Conversion")
+
+    try:
+        with st.spinner("Joining datasets to registered schools..."):
+            dimension, joins = build_join_index(table_version(*TABLES))
+    except Exception as e:
+        st.error(f"Could not build the school join index: {e}")
+        return
+    if IDEAS not in joins:
+        st.error("Submitted ideas file not found.")
+        return
+
+    idea_keys, _ = joins[IDEAS]
+    ideas = np.bincount(idea_keys[idea_keys >= 0], minlength=len(dimension.schools))
+    schools = dimension.schools.assign(ideas=ideas, converted=ideas > 0)
+
+    selected_state = st.selectbox("Select State", ["All States"] + sorted(schools["state"].dropna().unique()))
+    schools = filter_rows(schools, {"state": selected_state})
+
+    registered = len(schools)
+    converted = int(schools["converted"].sum())
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("🏫 Registered Schools", registered)
+    col2.metric("💡 Schools with Ideas", converted)
+    col3.metric("📈 Conversion Rate", f"{converted / registered * 100:.1f}%" if registered else "0%")
+    col4.metric("❓ Ideas from Unregistered Schools", int((idea_keys < 0).sum()))
+
+    # ---------- DISTRICTS ----------
+    st.subheader("📍 Conversion by District")
+    districts = schools.groupby(["state", "district"]).agg(
+        registered=("udise", "size"), converted=("converted", "sum"), ideas=("ideas", "sum")
+    ).reset_index()
+    districts["conversion_rate"] = districts["converted"] / districts["registered"] * 100
+    districts = districts.sort_values(["conversion_rate", "registered"], ascending=False, ignore_index=True)
+    fig = px.bar(districts.head(30), x="district", y="conversion_rate", color="state", text="converted",
+                 labels={"conversion_rate": "Schools with Ideas (%)", "district": "District"},
+                 hover_data=["registered", "ideas"])
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(districts.round(1), use_container_width=True, hide_index=True)
+
+    # ---------- SCHOOLS ----------
+    st.subheader("🏫 Schools")
+    st.dataframe(schools.sort_values("ideas", ascending=False), use_container_width=True, hide_index=True)
+
+    with st.expander("🔗 Join coverage"):
+        coverage = pd.DataFrame([
+            {"dataset": dataset, "rows": len(keys), "matched": int((keys >= 0).sum()), "matched by name": by_name}
+            for dataset, (keys, by_name) in joins.items()
+        ])
+        coverage["match_rate"] = (coverage["matched"] / coverage["rows"].clip(lower=1) * 100).round(1)
+        st.dataframe(coverage, use_container_width=True, hide_index=True)
+        st.caption(f"{len(dimension.schools):,} registered schools have a UDISE code; "
+                   f"{dimension.unkeyed:,} registration rows without one are left out.")
@@ -0,0 +1,140 @@
+import bisect
+import re
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+TOKEN_RE = re.compile(r"[0-9a-z]+")
+FUZZY_MATCHES = 5           # closest spellings tried for a query token without prefix matches
+MIN_NGRAM_SIMILARITY = 0.6  # Dice similarity of character trigrams for fuzzy matches
+
+
+def normalize(value):
+    """Lower-case, single-spaced form used as the identity of a name or code"""
+    text = " ".join(str(value).lower().split())
+    if text.endswith(".0") and text[:-2].isdigit():
+        text = text[:-2]
+    return text
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(str(text).lower())
+
+
+def trigrams(term):
+    padded = f" {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# --------- Trigram Index ---------
+class TrigramIndex:
+    """Character trigram -> ids of the vocabulary terms containing it, for finding similar spellings"""
+
+    def __init__(self, vocabulary):
+        postings = {}
+        self.gram_counts = np.zeros(len(vocabulary), dtype=np.int32)
+        for term_id, term in enumerate(vocabulary):
+            grams = trigrams(term)
+            self.gram_counts[term_id] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(term_id)
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def similar(self, token, min_similarity=MIN_NGRAM_SIMILARITY):
+        """Ids of the terms whose trigrams overlap the token's by at least min_similarity (Dice), closest first"""
+        grams = trigrams(token)
+        hits = [self.postings[g] for g in grams if g in self.postings]
+        if not hits:
+            return np.array([], dtype=np.int32)
+        candidates, shared = np.unique(np.concatenate(hits), return_counts=True)
+        similarity = 2 * shared / (len(grams) + self.gram_counts[candidates])
+        good = similarity >= min_similarity
+        return candidates[good][np.argsort(-similarity[good], kind="stable")]
+
+
+# --------- Per-Column Index ---------
+class FieldIndex:
+    """Row positions of one dataset column, grouped by normalized value"""
+
+    def __init__(self, dataset, column, kind, series):
+        self.dataset, self.column, self.kind = dataset, column, kind
+
+        # Normalize the unique values only, then map the row codes through
+        codes, uniques = pd.factorize(series)
+        unique_codes, self.values = pd.factorize(pd.Index([normalize(v) for v in uniques], dtype=object))
+        row_codes = np.full(len(codes), -1, dtype=np.int64)
+        row_codes[codes >= 0] = unique_codes[codes[codes >= 0]]
+
+        self.order = np.argsort(row_codes, kind="stable")
+        self.counts = np.bincount(row_codes[row_codes >= 0], minlength=len(self.values))
+        missing = int((row_codes < 0).sum())
+        self.starts = np.concatenate([[missing], missing + np.cumsum(self.counts)])
+
+    def rows(self, code):
+        return self.order[self.starts[code]:self.starts[code + 1]]
+
+
+# --------- Inverted Index ---------
+class LookupIndex:
+    """Token -> entity postings over names, codes and ids of several datasets.
+
+    An entity is a (kind, normalized value) pair such as ("school", "govt hs kochi");
+    the same entity found in different datasets resolves to one profile.
+    """
+
+    def __init__(self):
+        self.fields = []
+        self.entities = defaultdict(list)    # (kind, value) -> [(field_no, value_code)]
+        self.row_counts = defaultdict(int)   # (kind, value) -> matching rows over all datasets
+        self.postings = defaultdict(set)     # token -> {(kind, value)}
+        self.vocabulary = []
+        self.trigrams = None
+
+    def add(self, dataset, column, kind, series):
+        field = FieldIndex(dataset, column, kind, series)
+        field_no = len(self.fields)
+        self.fields.append(field)
+        for code, value in enumerate(field.values):
+            key = (kind, value)
+            self.entities[key].append((field_no, code))
+            self.row_counts[key] += int(field.counts[code])
+            for token in tokenize(value):
+                self.postings[token].add(key)
+
+    def finish(self):
+        self.vocabulary = sorted(self.postings)
+        self.trigrams = TrigramIndex(self.vocabulary)
+        return self
+
+    def expand(self, token):
+        """Vocabulary tokens matching a query token: by prefix, else the closest spellings"""
+        lo = bisect.bisect_left(self.vocabulary, token)
+        hi = bisect.bisect_left(self.vocabulary, token + "{")  # "{" sorts after every [0-9a-z]
+        if hi > lo:
+            return self.vocabulary[lo:hi]
+        return [self.vocabulary[i] for i in self.trigrams.similar(token)[:FUZZY_MATCHES]]
+
+    def search(self, query, limit=25):
+        """Entities whose value matches every query token; exact, then closest (shortest), then largest first"""
+        candidates = None
+        for token in tokenize(query):
+            keys = set()
+            for match in self.expand(token):
+                keys |= self.postings[match]
+            candidates = keys if candidates is None else candidates & keys
+            if not candidates:
+                return []
+        if not candidates:
+            return []
+        exact = normalize(query)
+        ranked = sorted(candidates, key=lambda key: (key[1] != exact, len(key[1]), -self.row_counts[key], key[1]))
+        return ranked[:limit]
+
+    def profile(self, key):
+        """Row positions of one entity in every dataset that mentions it"""
+        parts = defaultdict(list)
+        for field_no, code in self.entities[key]:
+            field = self.fields[field_no]
+            parts[field.dataset].append(field.rows(code))
+        return {dataset: np.unique(np.concatenate(rows)) for dataset, rows in parts.items()}
@@ -0,0 +1,191 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from bitmap import Bitmap
+from datastore import dataset_version
+from funnel import STAGES
+from studentprogress import PROGRESS_FILE, load_and_process_data
+
+SEGMENTS_FILE = "saved_segments.json"
+# Sessions saving at the same time would otherwise drop each other's segments
+SAVE_LOCK = threading.Lock()
+# Student progress columns offered as conditions; every distinct value gets a bitmap
+FIELDS = ("Gender", "Class", "Disability Type", "Course Status", "Pre Survey Status", "Post Survey Status",
+          "Idea Status", "State", "District")
+STAGE_FIELD = "Completed Stage"
+MEMBER_COLUMNS = ("Student Name", "Gender", "Class", "School Name", "Team Name", "Teacher Name")
+MAX_MEMBERS_SHOWN = 1000
+
+
+# --------- Index ---------
+class SegmentIndex:
+    """A compressed bitmap of student row ids for every field value and program stage"""
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self.universe = Bitmap.from_sorted(np.arange(self.n_rows))
+        self.bitmaps = {}
+        for field in FIELDS:
+            if field not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[field].astype(str))
+            order = np.argsort(codes, kind="stable")
+            bounds = np.flatnonzero(np.diff(codes[order])) + 1
+            for rows in np.split(order, bounds):
+                if len(rows) and codes[rows[0]] >= 0:
+                    self.bitmaps[field, uniques[codes[rows[0]]]] = Bitmap.from_sorted(rows)
+        if "Stages" in df.columns:
+            stages = df["Stages"].to_numpy()
+            for stage, bit in STAGES.items():
+                self.bitmaps[STAGE_FIELD, stage] = Bitmap.from_mask((stages & bit) > 0)
+
+    def fields(self):
+        return list(dict.fromkeys(field for field, _ in self.bitmaps))
+
+    def values(self, field):
+        values = [value for f, value in self.bitmaps if f == field]
+        return values if field == STAGE_FIELD else sorted(values, key=str)
+
+    def evaluate(self, spec):
+        """Bitmap of the rows matching a segment spec.
+
+        spec = {"combine": "AND" | "OR", "conditions": [{"field", "values", "negate"}]};
+        the values of one condition are OR-ed, NOT complements a condition.
+        """
+        result = None
+        for condition in spec["conditions"]:
+            matched = Bitmap()
+            for value in condition["values"]:
+                matched = matched | self.bitmaps.get((condition["field"], value), Bitmap())
+            if condition.get("negate"):
+                matched = self.universe - matched
+            if result is None:
+                result = matched
+            else:
+                result = result & matched if spec["combine"] == "AND" else result | matched
+        return self.universe if result is None else result
+
+
+@st.cache_resource(show_spinner=False)
+def load_segment_index(version, _df):
+    return SegmentIndex(_df)
+
+
+def student_segment_index():
+    """Student progress rows and their bitmap index, built once per file version"""
+    df = load_and_process_data()
+    return df, load_segment_index(dataset_version(PROGRESS_FILE), df)
+
+
+# --------- Saved Segments ---------
+def load_segments():
+    try:
+        with open(SEGMENTS_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_segment(name, spec):
+    """Add or replace a segment; readers see the old file or the new one, never a partial write"""
+    with SAVE_LOCK:
+        segments = load_segments()
+        segments[name] = spec
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(SEGMENTS_FILE)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(segments, f, indent=4)
+            os.replace(tmp_path, SEGMENTS_FILE)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+
+def describe(spec):
+    parts = []
+    for condition in spec["conditions"]:
+        text = f"{condition['field']} in ({', '.join(map(str, condition['values']))})"
+        parts.append(f"NOT {text}" if condition.get("negate") else text)
+    return f" {spec['combine']} ".join(parts) or "All students"
+
+
+def segment_picker(df, key):
+    """Selectbox of saved student segments; returns df restricted to the chosen one and its spec (None for all)"""
+    segments = load_segments()
+    if not segments:
+        return df, None
+    choice = st.selectbox("🎯 Saved Segment", ["All Students"] + list(segments), key=key)
+    if choice == "All Students":
+        return df, None
+    _, index = student_segment_index()
+    st.caption(describe(segments[choice]))
+    return df.take(index.evaluate(segments[choice]).to_array()), segments[choice]
+
+
+# --------- Dashboard ---------
+def segment_builder_dashboard():
+    st.title("🎯 Student Segment Builder")
+
+    try:
+        df, index = student_segment_index()
+    except Exception as e:
+        st.error(f"Error loading student progress data: {e}")
+        return
+    if df.empty:
+        st.error("No student progress data available.")
+        return
+
+    saved = load_segments()
+    start = st.selectbox("Start from", ["New segment"] + list(saved))
+    base = saved.get(start, {"combine": "AND", "conditions": []})
+
+    combine = st.radio("Match", ["AND", "OR"], horizontal=True, index=["AND", "OR"].index(base["combine"]),
+                       format_func=lambda c: "All conditions (AND)" if c == "AND" else "Any condition (OR)",
+                       key=f"combine_{start}")
+    n_conditions = st.number_input("Conditions", min_value=0, max_value=10,
+                                   value=max(len(base["conditions"]), 1), key=f"n_{start}")
+
+    fields = index.fields()
+    conditions = []
+    for i in range(int(n_conditions)):
+        preset = base["conditions"][i] if i < len(base["conditions"]) else {}
+        col1, col2, col3 = st.columns([2, 4, 1])
+        field = col1.selectbox("Field", fields, key=f"field_{start}_{i}",
+                               index=fields.index(preset["field"]) if preset.get("field") in fields else 0)
+        options = index.values(field)
+        values = col2.multiselect("Is any of", options, key=f"values_{start}_{i}_{field}",
+                                  default=[v for v in preset.get("values", []) if v in options])
+        negate = col3.checkbox("NOT", key=f"not_{start}_{i}", value=bool(preset.get("negate")))
+        if values:
+            conditions.append({"field": field, "values": values, "negate": negate})
+
+    spec = {"combine": combine, "conditions": conditions}
+    began = time.perf_counter()
+    members = index.evaluate(spec)
+    rows = members.to_array()
+    elapsed = (time.perf_counter() - began) * 1000
+
+    st.markdown(f"**Segment:** {describe(spec)}")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("👥 Students", f"{len(rows):,}")
+    col2.metric("📊 Share of All", f"{len(rows) / max(index.n_rows, 1) * 100:.1f}%")
+    col3.metric("⚡ Evaluated in", f"{elapsed:.1f} ms")
+
+    shown = [c for c in MEMBER_COLUMNS if c in df.columns]
+    st.dataframe(df.take(rows[:MAX_MEMBERS_SHOWN])[shown], use_container_width=True, hide_index=True)
+    if len(rows) > MAX_MEMBERS_SHOWN:
+        st.caption(f"Showing the first {MAX_MEMBERS_SHOWN:,} of {len(rows):,} students.")
+
+    # ---------- SAVE ----------
+    col1, col2 = st.columns([3, 1])
+    name = col1.text_input("Segment name", value="" if start == "New segment" else start)
+    if col2.button("💾 Save segment", disabled=not (name and conditions)):
+        save_segment(name, spec)
+        st.success(f"Saved segment '{name}'. It can now be picked on the Student Progress Dashboard.")
@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import Counter
+
+import streamlit as st
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        # False when the leader was interrupted (rerun, stop, Ctrl-C) before finishing
+        self.finished = False
+        self.followers = 0
+
+
+class SingleFlight:
+    """Runs one computation per key at a time; concurrent callers for the same key wait and share its result"""
+
+    def __init__(self):
+        self.flights = {}
+        self.lock = threading.Lock()
+        self.counters = {"computed": 0, "coalesced": 0, "failed": 0, "interrupted": 0}
+        self.waited = 0.0
+        self.coalesced_pages = Counter()
+
+    def do(self, key, func, page=None):
+        """func() once for all concurrent callers of key.
+
+        An exception raised by func reaches every waiting caller. When the leader
+        is interrupted instead (Streamlit rerun/stop, KeyboardInterrupt), the
+        waiting callers retry and one of them leads a new flight.
+        """
+        while True:
+            with self.lock:
+                flight = self.flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self.flights[key] = _Flight()
+                    self.counters["computed"] += 1
+                else:
+                    flight.followers += 1
+                    self.counters["coalesced"] += 1
+                    self.coalesced_pages[page] += 1
+
+            if leader:
+                return self._lead(key, flight, func)
+
+            began = time.perf_counter()
+            flight.done.wait()
+            with self.lock:
+                self.waited += time.perf_counter() - began
+                if not flight.finished:
+                    # Nothing was shared after all
+                    self.counters["coalesced"] -= 1
+                    self.coalesced_pages[page] -= 1
+                    self.counters["interrupted"] += 1
+            if flight.finished:
+                if flight.error is not None:
+                    raise flight.error
+                return flight.value
+
+    def _lead(self, key, flight, func):
+        try:
+            flight.value = func()
+            flight.finished = True
+        except Exception as error:
+            flight.error = error
+            flight.finished = True
+            with self.lock:
+                self.counters["failed"] += 1
+            raise
+        finally:
+            # Later callers start a new flight (and will usually hit the cache it filled)
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+        return flight.value
+
+    def stats(self):
+        with self.lock:
+            return {
+                **self.counters,
+                "in_flight": len(self.flights),
+                "waiting": sum(flight.followers for flight in self.flights.values()),
+                "seconds_waited": self.waited,
+            }
+
+    def page_counts(self):
+        """Duplicate computations avoided per page"""
+        with self.lock:
+            return {page: count for page, count in self.coalesced_pages.items() if count > 0}
+
+
+@st.cache_resource(show_spinner=False)
+def single_flight():
+    """The process-wide single-flight group shared by every session"""
+    return SingleFlight()
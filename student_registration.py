@@ -1,36 +1,56 @@
 import streamlit as st
-import streamlit.components.v1 as components
 import pandas as pd
 import plotly.express as px
-import matplotlib.pyplot as plt
-import seaborn as sns
-import json
 
+from datastore import cached_frame, dataset_version
+from disk_cache import disk_cached
+from figure_cache import cached_heatmap
+from india_map import cached_state_map, india_geojson
+from pincode import CORRECTED, FILLED, MISMATCH, PINCODE_FILE, enrich, load_directory
+from geo_index import geo_filter, load_geo_index
+from result_cache import cached_result
+from text_clean import clean_text
 
+REGISTRATION_FILE = "cleaned_school_data.csv"
 
 st.set_page_config(page_title="School Registration Dashboard", layout="wide")
-def school_registration_dashboard():
-    
 
-    # ------------------ LOAD DATA ------------------
-    df = pd.read_csv("cleaned_school_data.csv")
-    df['State'] = df['State'].str.strip().str.title()
-    df['City'] = df['City'].str.strip().str.title()
-    df['School Name'] = df['School Name'].str.strip().str.title()
+# ------------------ LOAD DATA ------------------
+@cached_frame(REGISTRATION_FILE, PINCODE_FILE)
+@disk_cached(REGISTRATION_FILE, PINCODE_FILE)
+def load_data():
+    df = pd.read_csv(REGISTRATION_FILE)
+    df['State'] = clean_text(df['State'], "title", kind="state")
+    df['City'] = clean_text(df['City'], "title", kind="district")
+    df['School Name'] = clean_text(df['School Name'], "title")
     df['No of teachers registered'] = pd.to_numeric(df['No of teachers registered'], errors='coerce').fillna(0)
+    df, fixes = enrich(df, load_directory())
+    df['Location Fix'] = fixes
+    return df
+
+def school_registration_dashboard():
+    df = load_data()
+    version = dataset_version(REGISTRATION_FILE, PINCODE_FILE)
 
     # ------------------ HEADER ------------------
     st.markdown("<h1 style='text-align: center; color: white;'>📊 Student Registration Dashboard</h1>", unsafe_allow_html=True)
 
     # ------------------ FILTERS ------------------
-    st.markdown("### 🔍 Filter by State")
-    selected_state = st.selectbox("Select State", ["All"] + sorted(df["State"].unique()))
-    filtered_df = df if selected_state == "All" else df[df["State"] == selected_state]
+    st.markdown("### 🔍 Filter by State, District & School")
+    geo = load_geo_index("school_registration", version, df,
+                         ("State", "City", "School Name"))
+    path = geo_filter(geo, "school_registration")
+
+    @cached_result("School Registration", REGISTRATION_FILE, PINCODE_FILE)
+    def compute_kpis(path):
+        """School and teacher totals for one location selection"""
+        filtered_df = geo.take(df, path)
+        return filtered_df['School Name'].nunique(), int(filtered_df['No of teachers registered'].sum())
+
     st.markdown("---")
 
     # ------------------ KPIs ------------------
-    total_schools = filtered_df['School Name'].nunique()
-    total_teachers = int(filtered_df['No of teachers registered'].sum())
+    total_schools, total_teachers = compute_kpis(path)
     avg_teachers = round(total_teachers / total_schools, 2) if total_schools else 0
 
     col1, col2, col3 = st.columns(3)
@@ -62,10 +82,7 @@ def school_registration_dashboard():
 
     # ------------------ GEO MAP ------------------
     st.subheader("🗺️ India Geo Heatmap – Teacher Participation by State")
-    with open("india_states.geojson", "r", encoding="utf-8") as f:
-        india_geo = json.load(f)
-    for feature in india_geo['features']:
-        feature['properties']['ST_NM'] = feature['properties']['ST_NM'].strip().title()
+    india_geo = india_geojson()
 
     map_df = df.groupby("State")["No of teachers registered"].sum().reset_index()
     map_df.columns = ["State", "TeacherCount"]
@@ -90,15 +107,14 @@ def school_registration_dashboard():
 
     # ------------------ TEXT HEATMAP ------------------
     st.subheader("📍 Statewise Teacher Heatmap (Text Style)")
-    fig2, ax = plt.subplots(figsize=(8, 14))
-    sns.heatmap(
+    cached_heatmap(
+        ("school_state_heatmap", version),
         map_df.set_index('State').sort_values('TeacherCount', ascending=False),
         cmap='YlGnBu',
         annot=True,
         fmt=".0f",
         linewidths=0.5
     )
-    st.pyplot(fig2)
 
     # ------------------ ZERO TEACHERS ------------------
     st.subheader("🚫 Schools with Zero Teachers")
@@ -165,28 +181,19 @@ def school_registration_dashboard():
     if 'Address' in df.columns:
         st.info(f"🏠 **Missing Address:** {missing_address}")
 
+    # Pincode repair only runs when the directory has been added to the deployment
+    if load_directory() is not None:
+        fixes = df['Location Fix'].value_counts()
+        colP, colQ, colR = st.columns(3)
+        colP.success(f"🩹 **Filled from Pincode:** {fixes.get(FILLED, 0)}")
+        colQ.success(f"🔧 **State Corrected:** {fixes.get(CORRECTED, 0)}")
+        colR.warning(f"❓ **City Disagrees with Pincode:** {fixes.get(MISMATCH, 0)}")
+
     # 📍 Final India Map Summary
     st.markdown("## 🗺️ India State Participation Summary")
     st.markdown("## 🌍 India Map Insight Summary")
-    html_code = """
-    <style>
-    .fla-map-wrapper {
-        width: 100%;
-        height: 110%;
-        min-height: 1200px;
-        overflow: hidden;
-    }
-    .fla-map-wrapper iframe {
-        width: 100%;
-        height: 1100px;
-        border: none;
-    }
-    </style>
-    <div class="fla-map-wrapper">
-        <iframe src="https://app.fla-shop.com/7f5w8/6cda666b-77a2-4e14-9197-649f805d2d42" ></iframe>
-    </div>
-    """
-    components.html(html_code, height=1000, scrolling=False)
+    cached_state_map(("school_state_map", version), map_df.set_index('State')['TeacherCount'],
+                     "Teachers Registered per State")
 
     # ------------------ INSIGHT TEXT ------------------
     st.markdown("""
@@ -3,6 +3,59 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
+from datastore import cached_frame
+from disk_cache import disk_cached
+from funnel import (combination_counts, combination_table, drop_off, funnel_chart, funnel_counts, group_funnel,
+                    has_all, has_none, stage_bits)
+from result_cache import cached_result
+from text_clean import clean_text, per_unique
+
+
+PROGRESS_FILE = "StudentProgressDetailedReport_3_7_2025 10_10_32.csv"
+
+# Load and process data with enhanced caching
+@cached_frame(PROGRESS_FILE)
+@disk_cached(PROGRESS_FILE)
+def load_and_process_data():
+    """Load and preprocess data with optimized operations"""
+    # Errors propagate so a failed read is never cached; the dashboards report them
+    #with st.spinner("loading"):
+    df = pd.read_csv(PROGRESS_FILE)
+    
+    # Optimize data processing
+    df.columns = df.columns.str.strip()
+    
+    # Vectorized string operations
+    df["Course Completion%"] = per_unique(
+        df["Course Completion%"],
+        lambda x: pd.to_numeric(x.astype(str).str.replace("%", "").str.strip(), errors="coerce"),
+        missing="nan"
+    ).fillna(0)
+    
+    # Clean the distinct values only, then map back to the rows
+    categorical_cols = {
+        "Pre Survey Status": "lower",
+        "Post Survey Status": "lower",
+        "Idea Status": "upper",
+        "Gender": "capitalize",
+        "Disability Type": "lower",
+        "Class": None,
+        "Course Status": "lower"
+    }
+    
+    for col, case in categorical_cols.items():
+        df[col] = clean_text(df[col], case, missing="nan")
+
+    # One uint8 mask of completed program stages per student
+    df["Stages"] = stage_bits(
+        df["Course Completion%"],
+        df["Pre Survey Status"] == "completed",
+        df["Post Survey Status"] == "completed",
+        df["Idea Status"] == "SUBMITTED"
+    )
+    
+    return df
+
 
 def student_progress_dashboard():
     
@@ -32,44 +85,10 @@ def student_progress_dashboard():
     </style>
     """, unsafe_allow_html=True)
 
-    # Load and process data with enhanced caching
-    @st.cache_data(show_spinner=False)  
-    def load_and_process_data():
-        """Load and preprocess data with optimized operations"""
-        try:
-            #with st.spinner("loading"):
-            df = pd.read_csv("StudentProgressDetailedReport_3_7_2025 10_10_32.csv")
-            
-            # Optimize data processing
-            df.columns = df.columns.str.strip()
-            
-            # Vectorized string operations
-            df["Course Completion%"] = pd.to_numeric(
-                df["Course Completion%"].astype(str).str.replace("%", "").str.strip(), 
-                errors="coerce"
-            ).fillna(0)
-            
-            # Optimize categorical processing
-            categorical_cols = {
-                "Pre Survey Status": lambda x: x.str.strip().str.lower(),
-                "Post Survey Status": lambda x: x.str.strip().str.lower(),
-                "Idea Status": lambda x: x.str.strip().str.upper(),
-                "Gender": lambda x: x.str.strip().str.capitalize(),
-                "Disability Type": lambda x: x.str.strip().str.lower(),
-                "Class": lambda x: x.str.strip()
-            }
-            
-            for col, func in categorical_cols.items():
-                df[col] = func(df[col].astype(str))
-            
-            return df
-        except Exception as e:
-            st.error(f"Error loading data: {e}")
-            return pd.DataFrame()
-
-    # Cached computation functions
-    @st.cache_data
-    def compute_overall_metrics(df):
+    # Cached computation functions, shared between sessions. They read df below;
+    # its rows are fixed by the data file and the saved segment spec they are keyed on.
+    @cached_result("Student Progress", PROGRESS_FILE)
+    def compute_overall_metrics(segment):
         """Compute overall metrics with caching"""
         completed = (df["Course Completion%"] == 100).sum()
         in_progress = ((df["Course Completion%"] > 0) & (df["Course Completion%"] < 100)).sum()
@@ -84,8 +103,8 @@ def student_progress_dashboard():
             'total_students': len(df)
         }
 
-    @st.cache_data
-    def compute_demographic_data(df):
+    @cached_result("Student Progress", PROGRESS_FILE)
+    def compute_demographic_data(segment):
         """Compute demographic analysis with caching"""
         gender_completion = df.groupby("Gender")["Course Completion%"].mean().dropna()
         class_completion = df.groupby("Class")["Course Completion%"].mean().sort_values(ascending=False)
@@ -103,18 +122,13 @@ def student_progress_dashboard():
             }
         }
 
-    @st.cache_data
-    def compute_performance_data(df):
+    @cached_result("Student Progress", PROGRESS_FILE)
+    def compute_performance_data(segment):
         """Compute performance metrics with caching"""
         school_performance = df.groupby("School Name")["Course Completion%"].mean().sort_values(ascending=False)
         
         # Active teams criteria
-        active_criteria = (
-            (df["Course Completion%"] == 100) &
-            (df["Pre Survey Status"] == "completed") &
-            (df["Post Survey Status"] == "completed") &
-            (df["Idea Status"] == "SUBMITTED")
-        )
+        active_criteria = has_all(df["Stages"], "Course Completed", "Pre Survey", "Post Survey", "Idea Submitted")
         
         active_teams = df[active_criteria].groupby("Team Name").size().sort_values(ascending=False)
         
@@ -131,8 +145,8 @@ def student_progress_dashboard():
             'low_performing': low_performing
         }
 
-    @st.cache_data
-    def compute_survey_data(df):
+    @cached_result("Student Progress", PROGRESS_FILE)
+    def compute_survey_data(segment):
         """Compute survey and idea metrics with caching"""
         pre_survey_rate = (df["Pre Survey Status"] == "completed").mean() * 100
         post_survey_rate = (df["Post Survey Status"] == "completed").mean() * 100
@@ -149,19 +163,32 @@ def student_progress_dashboard():
             'idea_completion_avg': idea_completion_avg
         }
 
+    @cached_result("Student Progress", PROGRESS_FILE)
+    def compute_group_funnel(segment, group_col):
+        """Funnel table per school or team with caching"""
+        return group_funnel(df["Stages"].to_numpy(), df[group_col])
+
     # Load data
-    df = load_and_process_data()
+    try:
+        df = load_and_process_data()
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        st.stop()
 
     if df.empty:
         st.error("No data available. Please check your data file.")
         st.stop()
 
+    # Segments saved in the Segment Builder narrow every chart below
+    from segments import segment_picker
+    df, segment = segment_picker(df, "student_progress_segment")
+
     # Header with key metrics
     st.title("📊 Student Progress Dashboard")
 
     # Quick stats in header
     col1, col2, col3, col4 = st.columns(4)
-    metrics = compute_overall_metrics(df)
+    metrics = compute_overall_metrics(segment)
 
     with col1:
         st.metric("Total Students", metrics['total_students'])
@@ -174,11 +201,12 @@ def student_progress_dashboard():
         st.metric("Student Progress Success Rate", f"{completion_rate:.1f}%")
 
     # Tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
         "📈 Overall Progress",
         "👥 Demographics",
         "🏫 Performance",
         "📝 Surveys & Ideas",
+        "🔻 Program Funnel",
         "⚠️ Gaps Analysis"
     ])
 
@@ -226,7 +254,7 @@ def student_progress_dashboard():
     with tab2:
         st.subheader("Demographic Analysis")
         
-        demo_data = compute_demographic_data(df)
+        demo_data = compute_demographic_data(segment)
         
         col1, col2 = st.columns(2)
         
@@ -277,10 +305,6 @@ def student_progress_dashboard():
             st.metric("Completed (with Disabilities)", demo_data['disability_counts']['completed_with_disability'])
 
         with col3:
-            # Filter disabled students
-            # Clean Course Status values first
-            df["Course Status"] = df["Course Status"].astype(str).str.strip().str.lower()
-
                 # Filter disabled students
             disabled_students = df[df["Disability Type"] != "no"]
 
@@ -330,7 +354,7 @@ def student_progress_dashboard():
     with tab3:
         st.subheader("School and Team Performance")
         
-        perf_data = compute_performance_data(df)
+        perf_data = compute_performance_data(segment)
         
         col1, col2 = st.columns(2)
         
@@ -370,7 +394,7 @@ def student_progress_dashboard():
     with tab4:
         st.subheader("Survey Participation & Idea Submission")
         
-        survey_data = compute_survey_data(df)
+        survey_data = compute_survey_data(segment)
         
         col1, col2 = st.columns(2)
         
@@ -398,8 +422,31 @@ def student_progress_dashboard():
             )
             st.plotly_chart(fig, use_container_width=True)
         
-    # Tab 5: Gaps Analysis
+    # Tab 5: Program Funnel
     with tab5:
+        st.subheader("Registration → Course → Surveys → Idea")
+
+        combos = combination_counts(df["Stages"].to_numpy())
+        counts = funnel_counts(combos)
+        st.plotly_chart(funnel_chart(counts), use_container_width=True)
+        st.dataframe(
+            drop_off(counts).style.format({'% of Registered': '{:.1f}%', '% Kept from Previous': '{:.1f}%'}),
+            use_container_width=True
+        )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**Stage Combinations**")
+            st.dataframe(combination_table(combos), use_container_width=True, hide_index=True)
+        with col2:
+            group_col = st.radio("Funnel by", ["School Name", "Team Name"], horizontal=True)
+            st.dataframe(
+                compute_group_funnel(segment, group_col).style.format({'Conversion %': '{:.1f}%'}),
+                use_container_width=True
+            )
+
+    # Tab 6: Gaps Analysis
+    with tab6:
         st.subheader("Engagement Gaps & action Needed")
         
         st.error("🚨 Critical Issues")
@@ -411,16 +458,7 @@ def student_progress_dashboard():
             critical_schools = zero_progress_schools[["School Name", "Team Name", "Teacher Name"]].drop_duplicates()
             st.dataframe(critical_schools, use_container_width=True,hide_index=True)
         
-        df["Pre Survey Status"] = df["Pre Survey Status"].str.lower()
-        df["Post Survey Status"] = df["Post Survey Status"].str.lower()
-        df["Idea Status"] = df["Idea Status"].str.upper()
-
-        no_engagement = df[
-            (df["Course Completion%"] == 0) &
-            (df["Pre Survey Status"] != "completed") &
-            (df["Post Survey Status"] != "completed") &
-            (df["Idea Status"] != "SUBMITTED")
-        ]
+        no_engagement = df[has_none(df["Stages"], "Course Started", "Pre Survey", "Post Survey", "Idea Submitted")]
 
         unique_no_engagement = no_engagement.drop_duplicates(subset=["Student Name"]) 
 
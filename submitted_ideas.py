@@ -2,30 +2,108 @@ import pandas as pd
 import streamlit as st
 import plotly.express as px
 
+from datastore import cached_frame, dataset_version
+from disk_cache import disk_cached
+from ideas_cube import ACTION_COL, LANGUAGE_COL, LOCATION_COL, SCHOOL_TYPE_COL, IdeaCube
+from idea_search import IDEAS_FILE, load_or_build, text_columns
+from text_clean import clean_text, per_unique
+from multiselect import multi_select_section, option_matrix
+from pincode import PINCODE_FILE, enrich, load_directory
+from result_cache import cached_result
+import verification_model as vm
+
 # === Page Config ===
 st.set_page_config(page_title="Submitted Ideas Dashboard", layout="wide")
 
+# === Load Data ===
+@cached_frame(IDEAS_FILE, PINCODE_FILE)
+@disk_cached(IDEAS_FILE, PINCODE_FILE)
+def load_data():
+    df = pd.read_csv(IDEAS_FILE, encoding='ISO-8859-1', low_memory=False,
+                    dtype={'UDISE CODE': str, 'Pin code': str})
+    df, _ = enrich(df, load_directory())
+    df = df.dropna(subset=['State', 'Theme'])
+    df['State'] = clean_text(df['State'], kind="state")
+
+    # Clean and standardize 'Teacher Gender' column
+    if 'Teacher Gender' in df.columns:
+        df['Teacher Gender'] = per_unique(df['Teacher Gender'], lambda x: x.str.strip().str.lower().replace({
+            'male': 'Male',
+            'female': 'Female',
+            'not preferred': 'Not Preferred'
+        }))
+    return df
+
+@st.cache_resource(show_spinner=False)
+def load_search_index(version, _df):
+    """Keyword index over the idea texts, loaded from disk or built once per file version"""
+    return load_or_build(_df, version)
+
+@st.cache_resource(show_spinner=False)
+def load_action_matrix(version, _df):
+    """Team x action matrix, split once per file version"""
+    return option_matrix(_df[ACTION_COL])
+
+@st.cache_resource(show_spinner=False)
+def load_cube(version, _df):
+    """Grouped idea counts behind every crosstab and top-N list, built once per file version"""
+    return IdeaCube(_df)
+
+@st.cache_resource(show_spinner=False)
+def load_verification_scores(version, model_version, _df):
+    """Verification likelihood of every idea, scored once per data and model version"""
+    model = vm.load_model()
+    return model, (vm.score(model, _df) if model is not None else None)
+
 def submitted_ideas_dashboard():
     st.title("🚀 Submitted Ideas Dashboard")
     st.markdown("Visual breakdown of ideas submitted across Indian states by themes.")
 
-    # === Load Data ===
-    df = pd.read_csv("Submitted_Ideas.csv", encoding='ISO-8859-1', low_memory=False,
-                    dtype={'UDISE CODE': str, 'Pin code': str})
-    df = df.dropna(subset=['State', 'Theme'])
+    df = load_data()
+    version = dataset_version(IDEAS_FILE, PINCODE_FILE)
+    cube = load_cube(version, df)
 
     # === In-body Filters ===
     st.markdown("### 🔎 Filter Options")
-    all_states = ["All States"] + sorted(df['State'].dropna().unique().tolist())
+    all_states = ["All States"] + cube.states
     selected_state = st.selectbox("Choose a State", all_states)
 
-
+    # === Keyword Search ===
+    st.markdown("## 🔍 Search Ideas")
+    with st.spinner("Loading search index..."):
+        index = load_search_index(version, df)
+    query = st.text_input("Keywords", placeholder="e.g. water purification Kerala")
+    col_s, col_t = st.columns(2)
+    search_states = col_s.multiselect("Filter by State", all_states[1:])
+    search_themes = col_t.multiselect("Filter by Theme", cube.total('Theme').index.tolist())
+
+    @cached_result("Submitted Ideas", IDEAS_FILE, PINCODE_FILE)
+    def search_ideas(query, states, themes):
+        """Best matching ideas, with their scores, for one query and state/theme selection"""
+        allowed = None
+        if states:
+            allowed = df['State'].isin(states).to_numpy()
+        if themes:
+            theme_mask = df['Theme'].isin(themes).to_numpy()
+            allowed = theme_mask if allowed is None else allowed & theme_mask
+        rows, scores = index.search(query, allowed)
+        result_cols = ['State', 'Theme'] + [c for c in text_columns(df) if c not in ('State', 'Theme')]
+        return df.iloc[rows][result_cols].assign(Score=scores.round(2))
+
+    if query.strip():
+        # The index lower-cases queries, so this only folds spellings that find the same ideas
+        results = search_ideas(" ".join(query.lower().split()), search_states, search_themes)
+        if results.empty:
+            st.warning("⚠️ No ideas match the search.")
+        else:
+            st.caption(f"Top {len(results)} matching ideas, best first.")
+            st.dataframe(results, use_container_width=True, hide_index=True)
 
     # === Heatmap: Theme Distribution by State (%) ===
     st.subheader("🎯 Theme Distribution by State (%)")
     st.caption("This heatmap shows the percentage distribution of themes submitted per state.")
 
-    state_theme = pd.crosstab(df['State'], df['Theme'], normalize='index') * 100
+    state_theme = cube.share_by_state('Theme')
     fig1 = px.imshow(state_theme, text_auto=".1f", color_continuous_scale='RdBu', 
                     labels=dict(color='Percentage'), aspect="auto")
     fig1.update_layout(title="Theme Distribution by State (%)", height=800)
@@ -33,10 +111,8 @@ def submitted_ideas_dashboard():
 
     # === Language Preference by State (%) ===
     st.markdown("## 🌐 Language Preference by State (%)")
-    language_col = 'Select in which language you prefer Submitting Your Idea?'
-
-    if language_col in df.columns:
-        lang_state = pd.crosstab(df['State'], df[language_col], normalize='index') * 100
+    if cube.has(LANGUAGE_COL):
+        lang_state = cube.share_by_state(LANGUAGE_COL)
         fig2 = px.imshow(lang_state, text_auto=".1f", color_continuous_scale='YlGnBu',
                         labels=dict(color='Percentage'), aspect="auto")
         fig2.update_layout(title="Language Preference by State (%)", height=800)
@@ -50,19 +126,19 @@ def submitted_ideas_dashboard():
 
     with col1:
         st.markdown("### 🔝 Top 5 States by Participation")
-        top_states = df['State'].value_counts().head(5)
+        top_states = cube.top('State')
         st.dataframe(top_states)
 
     with col2:
         st.markdown("### 🌟 Most Popular Themes")
-        top_themes = df['Theme'].value_counts().head(5)
+        top_themes = cube.top('Theme')
         st.dataframe(top_themes)
 
 
     # === Selected State Details ===
     if selected_state == "All States":
         st.markdown("## 📌 Top Themes in All States")
-        theme_counts = df['Theme'].value_counts().head(5)
+        theme_counts = cube.top('Theme')
 
         col3, col4 = st.columns([1, 2])
         with col3:
@@ -78,8 +154,7 @@ def submitted_ideas_dashboard():
 
     else:
         st.markdown(f"## 📌 Top Themes in {selected_state}")
-        state_data = df[df['State'] == selected_state]
-        state_theme_counts = state_data['Theme'].value_counts().head(5)
+        state_theme_counts = cube.top('Theme', state=selected_state)
 
         if state_theme_counts.empty:
             st.warning(f"⚠️ No theme data found for {selected_state}.")
@@ -100,13 +175,13 @@ def submitted_ideas_dashboard():
 
     # === School Type Distribution by State (%) ===
     st.markdown("## 🏫 School Type Distribution by State (%) of submitted teams")
-    try:
-        school_type_dist = pd.crosstab(df['State'], df['School Type/Category'], normalize='index') * 100
+    if cube.has(SCHOOL_TYPE_COL):
+        school_type_dist = cube.share_by_state(SCHOOL_TYPE_COL)
         fig4 = px.imshow(school_type_dist, text_auto=".1f", color_continuous_scale='BuGn',
                         labels=dict(color='Percentage'), aspect="auto")
         fig4.update_layout(title="School Type Distribution by State (%)", height=800)
         st.plotly_chart(fig4, use_container_width=True)
-    except KeyError:
+    else:
         st.warning("⚠️ 'School Type/Category' column not found in the dataset.")
 
 
@@ -114,10 +189,8 @@ def submitted_ideas_dashboard():
 
     # === Most Common Problem Locations ===
     st.markdown("## 📍 Most Common Problem Locations")
-    col_name = 'In which places in your community did you find this problem?'
-
-    if col_name in df.columns:
-        problem_locations = df[col_name].value_counts().head(10)
+    if cube.locations is not None:
+        problem_locations = cube.locations.head(10)
 
         st.markdown("### 🧾 Top Locations")
         st.dataframe(problem_locations)
@@ -132,19 +205,11 @@ def submitted_ideas_dashboard():
 
 
 
-    # Clean and standardize 'Teacher Gender' column
-    df['Teacher Gender'] = df['Teacher Gender'].str.strip().str.lower()
-    df['Teacher Gender'] = df['Teacher Gender'].replace({
-        'male': 'Male',
-        'female': 'Female',
-        'not preferred': 'Not Preferred'
-    })
-
     # === Completion Analysis by Teacher Gender ===
     st.markdown("## 🎓 Completion Analysis by Teacher Gender")
 
-    if 'Teacher Gender' in df.columns and 'Idea Submission Status' in df.columns:
-        comp_gender = pd.crosstab(df['Teacher Gender'], df['Idea Submission Status'])
+    if cube.has('Teacher Gender', 'Idea Submission Status'):
+        comp_gender = cube.table('Teacher Gender', 'Idea Submission Status')
         fig6 = px.bar(comp_gender, barmode='stack',
                     labels={'value': 'Number of Submissions', 'index': 'Teacher Gender'},
                     title="Completion Status by Teacher Gender")
@@ -152,36 +217,38 @@ def submitted_ideas_dashboard():
     else:
         st.warning("⚠️ Columns 'Teacher Gender' or 'Idea Submission Status' not found in the dataset.")
 
-    action_col = 'Pick the actions your team did in your problem solving journey (You can choose multiple options)'
-
     st.markdown("## 📌 Most Common Actions Taken")
-    if action_col in df.columns:
-        common_actions = df[action_col].value_counts().head(10)
+    if ACTION_COL in df.columns:
+        action_matrix = load_action_matrix(version, df)
 
-        st.markdown("### 🧾 Top 10 Actions")
-        st.dataframe(common_actions)
+        st.markdown("### 🧾 Actions Ticked by Teams")
+        st.dataframe(action_matrix.frequencies().round(1), hide_index=True)
 
-        st.markdown("### 📊 Bar Chart of Top Actions")
-        fig8 = px.bar(common_actions[::-1], orientation='h',
-                    labels={'value': 'Number of Submissions', 'index': 'Action'},
-                    title="Top 10 Most Common Actions")
-        st.plotly_chart(fig8, use_container_width=True)
+        st.markdown("### 📊 Bar Chart of Actions")
+        multi_select_section(action_matrix, key="idea_actions")
     else:
         st.warning("⚠️ 'Action Taken' column not found.")
 
 
     # === Feature Importance ===
     st.markdown("## 🧠 Feature Importance for Verification Prediction")
-    feature_importance = pd.DataFrame({
-        'feature': ['has_prototype', 'has_video', 'has_feedback', 'workbook_complete'],
-        'importance': [0.35, 0.25, 0.20, 0.10]
-    })
+    model, likelihood = load_verification_scores(version, dataset_version(vm.MODEL_FILE), df)
 
-    try:
-        fig10 = px.bar(feature_importance, x='importance', y='feature', orientation='h',
+    if model is None:
+        st.info("ℹ️ No verification model trained yet. Run `python verification_model.py train` to fit one.")
+    else:
+        importance = vm.importances(model)
+        fig10 = px.bar(importance[::-1], x='importance', y='feature', color='effect', orientation='h',
                     title="Feature Importance for Verification Prediction")
         st.plotly_chart(fig10, use_container_width=True)
-        st.success("✅ ")
-    except Exception as e:
-        st.warning("⚠️ Failed to render Feature Importance chart.")
-        st.exception(e)
\ No newline at end of file
+        st.caption(f"Logistic model trained on {model['labelled_ideas']:,} labelled ideas; "
+                   f"holdout AUC {model['metrics']['holdout_auc']:.2f}. Importance is the share of the "
+                   "standardised coefficient weight.")
+
+        st.markdown("### 🎯 Predicted Verification Likelihood")
+        scored = df[['State', 'Theme']].assign(**{'Verification Likelihood': likelihood.round(3)})
+        fig11 = px.histogram(scored, x='Verification Likelihood', nbins=20,
+                    title="Distribution of Predicted Verification Likelihood")
+        st.plotly_chart(fig11, use_container_width=True)
+        st.dataframe(scored.sort_values('Verification Likelihood', ascending=False).head(100),
+                    use_container_width=True, hide_index=True)
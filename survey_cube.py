@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from datastore import dataset_version, find_column
+from multiselect import SEPARATOR
+from text_clean import clean_text
+from warehouse import SURVEYS, load_table, table_version
+
+SEGMENTS = ("State", "Gender", "Class")
+# "Tick all that apply" questions, counted once per ticked option
+MULTI_SELECT = {"pre": (3, 4, 8, 9, 17)}
+UNKNOWN = "Unknown"
+TABLES = ("fact_survey_response", "fact_student_progress", "dim_student", "dim_state")
+ALL = "All"
+
+
+# --------- Student Segments ---------
+def student_segments(version):
+    """State, gender and class of every member of the student dimension"""
+    progress = load_table("fact_student_progress", version)
+    students = load_table("dim_student", version)
+    states = np.append(load_table("dim_state", version)["state"].to_numpy(dtype=object), UNKNOWN)
+
+    first = progress[progress["student_key"] >= 0].drop_duplicates("student_key")
+    keys = first["student_key"].to_numpy()
+    segments = pd.DataFrame({"user_id": students["user_id"].to_numpy()})
+    segments["State"] = UNKNOWN
+    segments.loc[keys, "State"] = states[first["state_key"].to_numpy()]
+    for segment, case in (("Gender", "capitalize"), ("Class", None)):
+        segments[segment] = UNKNOWN
+        column = find_column(progress, segment)
+        if column:
+            segments.loc[keys, segment] = clean_text(first[column], case, missing=UNKNOWN).replace("", UNKNOWN).to_numpy()
+    return segments
+
+
+# --------- Cube ---------
+class SurveyCube:
+    """(survey, question_no, selected_option, State, Gender, Class) -> responses, built with one groupby"""
+
+    def __init__(self, responses, segments):
+        # Responses without a known student fall into the trailing all-unknown row
+        segments = pd.concat([segments, pd.DataFrame([{"user_id": None, **{s: UNKNOWN for s in SEGMENTS}}])],
+                             ignore_index=True)
+        student_keys = responses["student_key"].to_numpy()
+        rows = np.where(student_keys >= 0, student_keys, len(segments) - 1)
+        frame = pd.DataFrame({
+            "survey": responses["survey"].astype(str).to_numpy(),
+            "question_no": responses["question_no"].to_numpy(),
+            "selected_option": responses["option"].to_numpy(),
+            **{segment: segments[segment].to_numpy()[rows] for segment in SEGMENTS},
+        })
+        dims = ["survey", "question_no", "selected_option", *SEGMENTS]
+        cube = frame.groupby(dims, observed=True).size().rename("responses").reset_index()
+
+        # Split the few distinct multi-select answers at cube level, not per response
+        multi = np.zeros(len(cube), dtype=bool)
+        for survey, questions in MULTI_SELECT.items():
+            multi |= ((cube["survey"] == survey) & cube["question_no"].isin(questions)).to_numpy()
+        if multi.any():
+            split = cube[multi].assign(selected_option=cube.loc[multi, "selected_option"].astype(str)
+                                       .str.strip().str.split(SEPARATOR, regex=True)).explode("selected_option")
+            split = split[split["selected_option"].str.len() > 0]
+            split = split.groupby(dims, observed=True)["responses"].sum().reset_index()
+            cube = pd.concat([cube[~multi], split], ignore_index=True)
+
+        self.cube = cube
+        self.segments = segments.iloc[:-1]
+        self.slices = cube.groupby(["survey", "question_no"]).indices
+
+    def values(self, survey, segment):
+        """Segment values that occur among the responses of one survey"""
+        rows = self.cube[self.cube["survey"] == survey]
+        return sorted(rows[segment].unique(), key=str)
+
+    def counts(self, survey, q_no, segment=None):
+        """Responses per option of one question within a segment, most picked first"""
+        rows = self.cube.iloc[self.slices.get((survey, q_no), [])]
+        for name, value in (segment or {}).items():
+            if value != ALL:
+                rows = rows[rows[name] == value]
+        counts = rows.groupby("selected_option")["responses"].sum().sort_values(ascending=False)
+        return counts.rename("count")
+
+    def members(self, segment):
+        """User ids of the students inside a segment"""
+        mask = np.ones(len(self.segments), dtype=bool)
+        for name, value in segment.items():
+            if value != ALL:
+                mask &= (self.segments[name] == value).to_numpy()
+        return pd.Index(self.segments["user_id"].to_numpy()[mask])
+
+
+@st.cache_resource(show_spinner=False)
+def load_survey_cube(version):
+    return SurveyCube(load_table("fact_survey_response", version), student_segments(version))
+
+
+@st.cache_resource(show_spinner=False)
+def load_unsegmented_cube(survey, version):
+    """Cube of one survey file alone, every response in the Unknown segment"""
+    df = pd.read_excel(SURVEYS[survey], dtype=str)
+    responses = pd.DataFrame({
+        "survey": survey,
+        "student_key": np.full(len(df), -1),
+        "question_no": pd.to_numeric(df["question_no"], errors="coerce").astype("Int16"),
+        "option": df["selected_option"],
+    })
+    return SurveyCube(responses, pd.DataFrame(columns=["user_id", *SEGMENTS], dtype=object))
+
+
+def survey_cube(survey):
+    """(cube, segmented): the warehouse cube, or the survey alone when the warehouse tables cannot be built"""
+    try:
+        return load_survey_cube(table_version(*TABLES)), True
+    except Exception as e:
+        st.warning(f"Student segments are unavailable ({e}). Showing all responses without the segment filters.")
+        return load_unsegmented_cube(survey, dataset_version(SURVEYS[survey])), False
+
+
+# --------- Dashboard Section ---------
+def segment_filters(cube, survey):
+    """State / Gender / Class selectboxes; returns the chosen segment"""
+    cols = st.columns(len(SEGMENTS))
+    return {segment: col.selectbox(segment, [ALL] + cube.values(survey, segment), key=f"{survey}_segment_{segment}")
+            for col, segment in zip(cols, SEGMENTS)}
+
+
+def is_filtered(segment):
+    return any(value != ALL for value in segment.values())
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from datastore import cached_frame, dataset_version, find_column
+from multiselect import SEPARATOR, option_matrix
+from survey_cube import MULTI_SELECT
+from warehouse import SURVEYS
+
+# label -> (pre-survey question, post-survey question) asking about the same thing
+QUESTION_PAIRS = {
+    "Community problem students focus on": (5, 5),
+    "How students describe themselves": (3, 10),
+}
+
+# Answer scales whose order gives a direction to a change, lowest first
+ORDINAL_SCALES = [
+    ["never", "rarely", "sometimes", "often", "always"],
+    ["not at all", "a little", "somewhat", "very", "extremely"],
+    ["not confident", "slightly confident", "somewhat confident", "confident", "very confident"],
+    ["very dissatisfied", "dissatisfied", "neutral", "satisfied", "very satisfied"],
+    ["very unlikely", "unlikely", "neutral", "likely", "very likely"],
+]
+
+
+@cached_frame
+def load_survey(path, version):
+    return pd.read_excel(path)
+
+
+@st.cache_resource(show_spinner=False)
+def survey_matrices(version):
+    """Respondent x option matrix of every question in both surveys, built once per data version"""
+    matrices = {}
+    for survey, path in SURVEYS.items():
+        df = load_survey(path, dataset_version(path))
+        user_col = find_column(df, "user_id", "User ID")
+        if user_col is None:
+            raise KeyError(f"{path} has no student id column to pair responses on")
+        for q_no, rows in df.groupby("question_no"):
+            # Single-choice answers stay whole, commas and all
+            sep = SEPARATOR if q_no in MULTI_SELECT.get(survey, ()) else None
+            matrices[survey, q_no] = option_matrix(rows["selected_option"], rows[user_col], sep=sep)
+    return matrices
+
+
+# --------- Paired Comparison ---------
+def _ranks(options):
+    """Position of every option on one known ordinal scale, or None if they do not all fit one"""
+    for scale in ORDINAL_SCALES:
+        lookup = {label: rank for rank, label in enumerate(scale)}
+        ranks = [lookup.get(" ".join(str(option).lower().split())) for option in options]
+        if None not in ranks:
+            return np.array(ranks)
+    return None
+
+
+def transition(pre, post):
+    """Pre option -> post option counts over the students who answered both questions.
+
+    With one-hot rows this is the crosstab of paired answers; multi-select answers
+    count every (pre option, post option) combination a student ticked.
+    """
+    students = pre.respondents.intersection(post.respondents)
+    X_pre = pre.matrix[pre.respondents.get_indexer(students)]
+    X_post = post.matrix[post.respondents.get_indexer(students)]
+    counts = (X_pre.T @ X_post).toarray()
+    table = pd.DataFrame(counts, index=pre.options, columns=post.options)
+
+    pre_share = np.asarray(X_pre.sum(axis=0)).ravel() / max(len(students), 1) * 100
+    post_share = np.asarray(X_post.sum(axis=0)).ravel() / max(len(students), 1) * 100
+    shares = pd.concat([pd.Series(pre_share, index=pre.options, name="pre"),
+                        pd.Series(post_share, index=post.options, name="post")], axis=1).fillna(0)
+    shares["shift"] = shares["post"] - shares["pre"]
+
+    summary = {"paired_students": len(students)}
+    same = [option for option in pre.options if option in post.options]
+    if same and counts.sum():
+        summary["unchanged_percent"] = float(sum(table.at[o, o] for o in same) / counts.sum() * 100)
+    pre_ranks, post_ranks = _ranks(pre.options), _ranks(post.options)
+    if pre_ranks is not None and post_ranks is not None and counts.sum():
+        step = post_ranks[None, :] - pre_ranks[:, None]
+        summary["mean_shift"] = float((counts * step).sum() / counts.sum())
+        summary["improved_percent"] = float(counts[step > 0].sum() / counts.sum() * 100)
+        summary["declined_percent"] = float(counts[step < 0].sum() / counts.sum() * 100)
+    return table, shares.sort_values("shift", ascending=False), summary
+
+
+@st.cache_data(show_spinner=False)
+def cached_transition(version, pre_q, post_q):
+    """Transition table, option shares and shift summary of one question pair, per data version"""
+    matrices = survey_matrices(version)
+    return transition(matrices["pre", pre_q], matrices["post", post_q])
+
+
+# --------- Dashboard ---------
+def impact_dashboard():
+    st.title("🔄 Pre vs Post Impact")
+
+    version = dataset_version(*SURVEYS.values())
+    try:
+        matrices = survey_matrices(version)
+    except (OSError, KeyError) as e:
+        st.error(f"Cannot pair the surveys: {e}")
+        return
+
+    pre_students = set().union(*(m.respondents for (s, _), m in matrices.items() if s == "pre"))
+    post_students = set().union(*(m.respondents for (s, _), m in matrices.items() if s == "post"))
+    col1, col2, col3 = st.columns(3)
+    col1.metric("📝 Pre-Survey Students", len(pre_students))
+    col2.metric("✅ Post-Survey Students", len(post_students))
+    col3.metric("🔗 Took Both", len(pre_students & post_students))
+
+    # ---------- SUMMARY ----------
+    st.subheader("Question Pairs at a Glance")
+    rows = []
+    for label, (pre_q, post_q) in QUESTION_PAIRS.items():
+        if ("pre", pre_q) in matrices and ("post", post_q) in matrices:
+            _, _, summary = cached_transition(version, pre_q, post_q)
+            rows.append({"question pair": label, "pre Q": pre_q, "post Q": post_q, **summary})
+    if rows:
+        st.dataframe(pd.DataFrame(rows).round(1), use_container_width=True, hide_index=True)
+
+    # ---------- ONE PAIR ----------
+    st.subheader("Answer Transitions")
+    choice = st.selectbox("Question pair", list(QUESTION_PAIRS) + ["Custom pair"])
+    if choice == "Custom pair":
+        col1, col2 = st.columns(2)
+        pre_q = col1.selectbox("Pre-survey question", sorted(q for s, q in matrices if s == "pre"))
+        post_q = col2.selectbox("Post-survey question", sorted(q for s, q in matrices if s == "post"))
+    else:
+        pre_q, post_q = QUESTION_PAIRS[choice]
+    if ("pre", pre_q) not in matrices or ("post", post_q) not in matrices:
+        st.warning("⚠️ One of these questions has no responses.")
+        return
+
+    table, shares, summary = cached_transition(version, pre_q, post_q)
+    if not summary["paired_students"]:
+        st.warning("⚠️ No student answered both questions.")
+        return
+
+    cols = st.columns(4)
+    cols[0].metric("Paired Students", summary["paired_students"])
+    if "unchanged_percent" in summary:
+        cols[1].metric("Same Answer", f"{summary['unchanged_percent']:.1f}%")
+    if "mean_shift" in summary:
+        cols[2].metric("Mean Shift (scale steps)", f"{summary['mean_shift']:+.2f}")
+        cols[3].metric("Improved / Declined", f"{summary['improved_percent']:.0f}% / {summary['declined_percent']:.0f}%")
+
+    rates = table.div(table.sum(axis=1).replace(0, np.nan), axis=0) * 100
+    fig = px.imshow(rates, text_auto=".0f", color_continuous_scale="Purples", aspect="auto",
+                    labels=dict(x=f"Post Q{post_q} answer", y=f"Pre Q{pre_q} answer", color="%"),
+                    title="Where students' answers moved (row %)")
+    st.plotly_chart(fig, use_container_width=True)
+
+    fig = px.bar(shares.reset_index(names="option"), x="option", y=["pre", "post"], barmode="group",
+                 labels={"value": "Students (%)", "option": "Answer", "variable": "Survey"},
+                 title="Share of Paired Students per Answer")
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(shares.round(1), use_container_width=True)
@@ -1,61 +1,88 @@
 import streamlit as st
-import streamlit.components.v1 as components
 import pandas as pd
 import plotly.express as px
-import matplotlib.pyplot as plt
-import seaborn as sns
-import json
+import numpy as np
+
+from datastore import find_column
+from figure_cache import cached_heatmap
+from india_map import cached_state_map, india_geojson
+from geo_index import GeoIndex, geo_filter
+from result_cache import cached_result
+from text_clean import clean_text
+from warehouse import count_by, load_table, quarantined, table_files, table_version
+
+TABLES = ("fact_teacher_registration", "dim_state", "dim_district", "dim_school")
+
+# ---------- LOAD DATA ----------
+def load_data():
+    """Teacher registrations keyed by integer state/district/school ids, plus the dimension labels"""
+    version = table_version(*TABLES)
+    facts = load_table("fact_teacher_registration", version)
+    labels = {dim: load_table(f"dim_{dim}", version)[dim].to_numpy() for dim in ("state", "district", "school")}
+    # District names repeat across states, so the district rankings name the state as well
+    state_keys = load_table("dim_district", version)["state_key"].to_numpy()
+    labels["district_in_state"] = np.array([
+        f"{district}, {labels['state'][state]}" if state >= 0 else district
+        for district, state in zip(labels["district"], state_keys)
+    ], dtype=object)
+    return facts, labels
+
+@st.cache_resource(show_spinner=False)
+def load_geo(version):
+    """State -> district -> school index over the registration rows, built once per snapshot"""
+    facts, labels = load_data()
+    names = pd.DataFrame({
+        dim: pd.Series(np.append(labels[dim], None)[facts[f"{dim}_key"].to_numpy()], dtype=object)
+        for dim in ("state", "district", "school")
+    })
+    return GeoIndex(names, ("state", "district", "school"))
 
 def teacher_registration_dashboard():
 # ---------- PAGE CONFIG ----------
     st.set_page_config(page_title="Teacher Registration Dashboard", layout="wide")
 
-    # ---------- LOAD DATA ----------
-    df = pd.read_csv("Teacher_Registration_Cleaned (1).csv")
-    df.columns = df.columns.str.strip().str.title()
-    df['State'] = df['State'].str.title().str.strip()
-    df['District'] = df['District'].str.title().str.strip()
-    df['School_Name'] = df['School_Name'].str.title().str.strip()
-    df['Teacher_Name'] = df['Teacher_Name'].str.title().str.strip()
-    df['Teacher_Gender'] = df['Teacher_Gender'].str.title().str.strip()
+    try:
+        df, labels = load_data()
+        geo = load_geo(table_version(*TABLES))
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        return
+    for dataset, error in quarantined(*TABLES).items():
+        st.warning(f"{dataset} could not be read and is left out ({error}).")
+    state_keys = df['state_key'].to_numpy()
+    district_keys = df['district_key'].to_numpy()
+    school_keys = df['school_key'].to_numpy()
 
     # ---------- HEADER ----------
     st.markdown("<h1 style='text-align: center; color: white;'>👩‍🏫 Teacher Registration Dashboard</h1>", unsafe_allow_html=True)
 
     # ------------------ TOP FILTER SECTION ------------------
-    st.markdown("### 🔍 Filter Teachers by State & District")
-
-    state_options = ["All States"] + sorted(df["State"].dropna().unique())
-    col1, col2 = st.columns(2)
-
-    with col1:
-        selected_state = st.selectbox("Select State", state_options)
-
-    if selected_state == "All States":
-        district_options = ["All Districts"] + sorted(df["District"].dropna().unique())
-    else:
-        district_options = ["All Districts"] + sorted(
-            df[df["State"] == selected_state]["District"].dropna().unique()
-        )
-
-    with col2:
-        selected_district = st.selectbox("Select District", district_options)
-
-    if selected_state == "All States" and selected_district == "All Districts":
-        filtered_df = df.copy()
-    elif selected_state != "All States" and selected_district == "All Districts":
-        filtered_df = df[df["State"] == selected_state]
-    elif selected_state == "All States" and selected_district != "All Districts":
-        filtered_df = df[df["District"] == selected_district]
-    else:
-        filtered_df = df[(df["State"] == selected_state) & (df["District"] == selected_district)]
+    st.markdown("### 🔍 Filter Teachers by State, District & School")
+
+    path = geo_filter(geo, "teacher_registration")
+
+    @cached_result("Teacher Registration", *table_files(*TABLES))
+    def compute_counts(path):
+        """Teacher and school totals, gender split and per-school counts for one location selection"""
+        mask = geo.mask(path)
+        gender_col = find_column(df, "Teacher Gender")
+        gender_data = clean_text(df[gender_col][mask], "title", missing="nan").value_counts().reset_index()
+        gender_data.columns = ['Gender', 'Count']
+        return {
+            'teachers': int(mask.sum()),
+            'schools': np.unique(school_keys[mask & (school_keys >= 0)]).size,
+            'gender': gender_data,
+            'school': count_by(school_keys[mask], labels["school"]),
+        }
+
+    counts = compute_counts(path)
 
     st.markdown("---")
 
     # ---------- METRICS ----------
-    total_teachers = len(filtered_df)
-    total_schools = filtered_df['School_Name'].nunique()
-    avg_teachers = round(total_teachers / total_schools, 2)
+    total_teachers = counts['teachers']
+    total_schools = counts['schools']
+    avg_teachers = round(total_teachers / total_schools, 2) if total_schools else 0
 
     col1, col2, col3 = st.columns(3)
     col1.metric("👥 Total Teachers", total_teachers)
@@ -66,8 +93,7 @@ def teacher_registration_dashboard():
 
     # ---------- GENDER DISTRIBUTION ----------
     st.subheader("📊 Gender Distribution of Teachers")
-    gender_data = filtered_df['Teacher_Gender'].value_counts().reset_index()
-    gender_data.columns = ['Gender', 'Count']
+    gender_data = counts['gender']
 
     fig_gender = px.pie(
         gender_data,
@@ -93,7 +119,7 @@ def teacher_registration_dashboard():
 
     # ---------- TOP & BOTTOM SCHOOLS ----------
     st.subheader("🏫 Top & Bottom Schools by Teacher Count")
-    school_counts = filtered_df['School_Name'].value_counts().sort_values(ascending=False)
+    school_counts = counts['school']
     top_schools = school_counts.head(5).reset_index()
     bottom_schools = school_counts.tail(5).reset_index()
     top_schools.columns = ['School_Name', 'Count']
@@ -107,7 +133,7 @@ def teacher_registration_dashboard():
 
     # ---------- DISTRICT-WISE REGISTRATIONS ----------
     st.subheader("🏙️ District-wise Teacher Registrations")
-    district_counts = df['District'].value_counts().reset_index()
+    district_counts = count_by(district_keys, labels["district_in_state"]).reset_index()
     district_counts.columns = ['District', 'Count']
     top5 = district_counts.head(5).copy()
     bottom5 = district_counts.tail(5).copy()
@@ -126,7 +152,7 @@ def teacher_registration_dashboard():
 
     # ---------- STATE PARTICIPATION ----------
     st.subheader("🌍 Statewise Teacher Participation Ranking")
-    state_counts = df['State'].value_counts().reset_index()
+    state_counts = count_by(state_keys, labels["state"]).reset_index()
     state_counts.columns = ['State', 'Count']
     total_teachers = state_counts['Count'].sum()
     top_states = state_counts.head(5).copy()
@@ -153,21 +179,15 @@ def teacher_registration_dashboard():
 
     # ---------- TEXT HEATMAP ----------
     st.subheader("📍 Statewise Heatmap (Text Style)")
-    state_teacher_counts = df.groupby("State")["Teacher_Name"].count().reset_index()
-    state_teacher_counts = state_teacher_counts.sort_values("Teacher_Name", ascending=False)
-    fig2, ax = plt.subplots(figsize=(8, 14))
-    sns.heatmap(state_teacher_counts.set_index('State'), cmap='YlOrRd', annot=True, fmt="d", linewidths=0.5)
-    st.pyplot(fig2)
+    state_teacher_counts = state_counts[['State', 'Count']].rename(columns={'Count': 'Teacher_Name'})
+    cached_heatmap(("teacher_state_heatmap", table_version(*TABLES)), state_teacher_counts.set_index('State'),
+                   cmap='YlOrRd', annot=True, fmt="d", linewidths=0.5)
 
     # ---------- GEO HEATMAP ----------
     st.subheader("🗺️ India Geo Heatmap – Teacher Participation")
-    with open("india_states.geojson", "r", encoding="utf-8") as f:
-        india_geo = json.load(f)
-    for feature in india_geo['features']:
-        feature['properties']['ST_NM'] = feature['properties']['ST_NM'].strip().title()
+    india_geo = india_geojson()
 
-    map_df = df.groupby("State")["Teacher_Name"].count().reset_index()
-    map_df.columns = ["State", "TeacherCount"]
+    map_df = state_counts[['State', 'Count']].rename(columns={'Count': 'TeacherCount'})
 
     fig_map = px.choropleth(
         map_df,
@@ -183,7 +203,7 @@ def teacher_registration_dashboard():
 
     # ---------- LOW PARTICIPATION DISTRICTS ----------
     st.subheader("📌 Districts with Low Participation")
-    district_counts = df['District'].value_counts().sort_values()
+    district_counts = count_by(district_keys, labels["district_in_state"]).sort_values()
     low_districts = district_counts[district_counts <= 2]
     if not low_districts.empty:
         st.dataframe(low_districts.rename("Teacher Count"))
@@ -192,10 +212,10 @@ def teacher_registration_dashboard():
 
     # ---------- OUTLIERS ----------
     st.subheader("📉 Outlier & Range Detection")
-    school_dist = df.groupby("School_Name")["Teacher_Name"].count()
+    school_dist = count_by(school_keys[df['teacher_key'].to_numpy() >= 0], labels["school"])
     over_100 = school_dist[school_dist > 100]
     range_3_10 = school_dist[(school_dist >= 3) & (school_dist <= 10)].count()
-    percent_range = round((range_3_10 / total_schools) * 100, 2)
+    percent_range = round((range_3_10 / total_schools) * 100, 2) if total_schools else 0
 
     col6, col7 = st.columns(2)
     col6.info(f"🧯 Schools > 100 Teachers: **{len(over_100)}**")
@@ -225,38 +245,24 @@ def teacher_registration_dashboard():
 
     # ---------- DATA QUALITY ----------
     st.subheader("🧹 Data Quality Report")
-    duplicates = df.duplicated().sum()
-    missing_school = df['School_Name'].isnull().sum()
-    missing_teacher = df['Teacher_Name'].isnull().sum()
-    missing_address = df['Address'].isnull().sum() if 'Address' in df.columns else 0
+    duplicates = int(df['source_duplicate'].sum())
+    missing_school = int((school_keys < 0).sum())
+    missing_teacher = int((df['teacher_key'].to_numpy() < 0).sum())
+    address_col = find_column(df, "Address")
 
     colX, colY, colZ = st.columns(3)
     colX.info(f"🔁 Duplicate Rows: {duplicates}")
     colY.warning(f"🏫 Missing School Name: {missing_school}")
     colZ.warning(f"👤 Missing Teacher Name: {missing_teacher}")
-    st.info(f"🏠 Missing Address: {missing_address}")
+    if address_col is not None:
+        st.info(f"🏠 Missing Address: {df[address_col].isnull().sum()}")
+    else:
+        st.caption("🏠 The registration file has no address column.")
 
     # ---------- MAP INSIGHT SUMMARY ----------
     st.markdown("## 🌍 India Map Insight Summary")
-    html_code = """
-    <style>
-    .fla-map-wrapper {
-        width: 100%;
-        height: 110%;
-        min-height: 1200px;
-        overflow: hidden;
-    }
-    .fla-map-wrapper iframe {
-        width: 100%;
-        height: 1100px;
-        border: none;
-    }
-    </style>
-    <div class="fla-map-wrapper">
-        <iframe src="https://app.fla-shop.com/7f5w8/9c3628c2-d794-4375-b9bf-6dbee11de204" ></iframe>
-    </div>
-    """
-    components.html(html_code, height=1000, scrolling=False)
+    cached_state_map(("teacher_state_map", table_version(*TABLES)), map_df.set_index('State')['TeacherCount'],
+                     "Teachers Registered per State")
 
     # ---------- STATE INSIGHTS ----------
     st.markdown("""
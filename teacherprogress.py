@@ -2,39 +2,79 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import numpy as np
 
+from datastore import cached_frame, dataset_version, filter_rows
+from disk_cache import disk_cached
+from geo_index import geo_filter, load_geo_index
+from result_cache import cached_result
+from text_clean import clean_text
 
+PROGRESS_FILE = "cleaned_teacher_progress.xlsx"
 st.set_page_config(page_title="Teacher Progress Dashboard", layout="wide")
 def teacher_progress_dashboard():
     st.title("📊 Teacher Progress Dashboard")
 
 
-    @st.cache_data(show_spinner=False)
+    @cached_frame(PROGRESS_FILE)
+    @disk_cached(PROGRESS_FILE)
     def load_data():
-        df = pd.read_excel("cleaned_teacher_progress.xlsx")
-        df['Teacher Gender'] = df['Teacher Gender'].astype(str).str.strip().str.replace(r'\s+', ' ', regex=True).str.title()
-        df['School Type/Category'] = df['School Type/Category'].astype(str).str.strip().str.upper()
+        df = pd.read_excel(PROGRESS_FILE)
+        df['State'] = clean_text(df['State'], kind="state")
+        df['District'] = clean_text(df['District'], kind="district")
+        df['Teacher Gender'] = clean_text(df['Teacher Gender'], "title", missing="nan")
+        df['School Type/Category'] = clean_text(df['School Type/Category'], "upper", missing="nan")
+        df["Idea Status"] = np.where(df["No.of Teams Idea Submitted"] > 0, "Submitted", "Not Submitted")
         return df
 
     df = load_data()
 
 
     st.subheader("🔍 Filter Options")
-    colf1, colf2, colf3 = st.columns(3)
-    with colf1:
-        state_filter = st.selectbox("Select State", ['All'] + sorted(df['State'].dropna().unique().tolist()))
-    with colf2:
-        district_filter = st.selectbox("Select District", ['All'] + sorted(df['District'].dropna().unique().tolist()))
-    with colf3:
-        gender_filter = st.selectbox("Select Teacher Gender", ['All'] + sorted(df['Teacher Gender'].dropna().unique().tolist()))
-
-    filtered_df = df.copy()
-    if state_filter != 'All':
-        filtered_df = filtered_df[filtered_df['State'] == state_filter]
-    if district_filter != 'All':
-        filtered_df = filtered_df[filtered_df['District'] == district_filter]
-    if gender_filter != 'All':
-        filtered_df = filtered_df[filtered_df['Teacher Gender'] == gender_filter]
+    geo = load_geo_index("teacher_progress", dataset_version(PROGRESS_FILE), df,
+                         ("State", "District", "School Name"))
+    path = geo_filter(geo, "teacher_progress")
+    gender_filter = st.selectbox("Select Teacher Gender", ['All'] + sorted(df['Teacher Gender'].dropna().unique().tolist()))
+
+    @cached_result("Teacher Progress", PROGRESS_FILE)
+    def compute_counts(path, gender):
+        """Count and sum tables of the teachers in one location/gender selection"""
+        filtered_df = filter_rows(geo.take(df, path), {'Teacher Gender': gender})
+        counts = {}
+        for name, column, label in (('gender', 'Teacher Gender', 'Gender'), ('district', 'District', 'District'),
+                                    ('school_type', 'School Type/Category', 'School Type/Category'),
+                                    ('status', 'Teacher Course Status', 'Course Status')):
+            table = filtered_df[column].value_counts().reset_index()
+            table.columns = [label, 'Teacher Count' if name == 'school_type' else 'Count']
+            counts[name] = table
+        counts['gender_status'] = filtered_df.groupby(['Teacher Gender', 'Teacher Course Status']).size().reset_index(name='Count')
+
+        teams_df = filtered_df.groupby("Teacher Name")["NO.of Teams Created"].sum().reset_index()
+        counts['top_teams'] = teams_df.sort_values(by="NO.of Teams Created", ascending=False).head(10)
+        counts['ideas'] = {
+            "Submitted": filtered_df['No.of Teams Idea Submitted'].sum(),
+            "Not Initiated": filtered_df['No.of Teams Idea Not Initiated'].sum()
+        }
+        engagement_data = filtered_df[[
+            'No.of Students Course Completed',
+            'No.of Students Course Inprogress',
+            'No.of Students Course Not Started'
+        ]].sum().reset_index()
+        engagement_data.columns = ['Course Status', 'Count']
+        counts['engagement'] = engagement_data
+        counts['students'] = filtered_df[['No.of Students Enrolled', 'No.of Students Course Completed']].sum()
+        counts['idea_school'] = filtered_df.groupby("School Type/Category")["No.of Teams Idea Submitted"].sum().reset_index()
+        idea_district = filtered_df.groupby("District")["No.of Teams Idea Submitted"].sum().reset_index()
+        counts['idea_district'] = idea_district.sort_values(by="No.of Teams Idea Submitted", ascending=False).head(10)
+        school_state = filtered_df.groupby("State")["School Name"].nunique().reset_index()
+        counts['school_state'] = school_state.sort_values(by="School Name", ascending=False).rename(columns={"School Name": "Unique Schools"}).head(5)
+        counts['course_completion'] = filtered_df.groupby("Teacher Course Status").agg({
+            "No.of Students Enrolled": "sum",
+            "No.of Students Course Completed": "sum"
+        }).reset_index()
+        return counts
+
+    counts = compute_counts(path, gender_filter)
 
 
     tab1, tab2, tab3, tab4 = st.tabs([
@@ -47,15 +87,13 @@ def teacher_progress_dashboard():
 
     with tab1:
         st.subheader("Gender Distribution")
-        gender_data = filtered_df['Teacher Gender'].value_counts().reset_index()
-        gender_data.columns = ['Gender', 'Count']
+        gender_data = counts['gender']
         fig1 = px.bar(gender_data, x='Gender', y='Count', color='Gender', text='Count',
                         color_discrete_sequence=px.colors.qualitative.Pastel)
         st.plotly_chart(fig1, use_container_width=True)
 
         st.subheader("Teacher Count by District (Top 10 & Bottom 10)")
-        district_counts = filtered_df['District'].value_counts().reset_index()
-        district_counts.columns = ['District', 'Count']
+        district_counts = counts['district']
         top10 = district_counts.head(10).sort_values(by='Count', ascending=True)
         bottom10 = district_counts.tail(10).sort_values(by='Count', ascending=True)
 
@@ -73,8 +111,7 @@ def teacher_progress_dashboard():
             st.plotly_chart(fig_bottom, use_container_width=True)
 
         st.subheader("Teacher Count by School Type (ATL vs NON-ATL vs HS vs HSS)")
-        school_type_counts = filtered_df['School Type/Category'].value_counts().reset_index()
-        school_type_counts.columns = ['School Type/Category', 'Teacher Count']
+        school_type_counts = counts['school_type']
         fig_school = px.bar(school_type_counts, x='School Type/Category', y='Teacher Count',
                             color='School Type/Category', text='Teacher Count',
                             color_discrete_sequence=px.colors.qualitative.Set3)
@@ -82,8 +119,7 @@ def teacher_progress_dashboard():
 
     with tab2:
         st.subheader("Overall Teacher Course Status")
-        status_data = filtered_df['Teacher Course Status'].value_counts().reset_index()
-        status_data.columns = ['Course Status', 'Count']
+        status_data = counts['status']
         fig2 = px.bar(status_data, x='Course Status', y='Count', color='Course Status', text='Count',
                         color_discrete_sequence=px.colors.qualitative.Set3)
         st.plotly_chart(fig2, use_container_width=True)
@@ -126,7 +162,7 @@ def teacher_progress_dashboard():
 
 
         st.subheader("Course Status by Gender")
-        group1 = filtered_df.groupby(['Teacher Gender', 'Teacher Course Status']).size().reset_index(name='Count')
+        group1 = counts['gender_status']
         fig3 = px.bar(group1, x='Teacher Gender', y='Count', color='Teacher Course Status', barmode='group',
                         color_discrete_sequence=px.colors.qualitative.Prism)
         st.plotly_chart(fig3, use_container_width=True)
@@ -134,16 +170,12 @@ def teacher_progress_dashboard():
 
     with tab3:
         st.subheader("Top 10 Teachers by Teams Created")
-        teams_df = filtered_df.groupby("Teacher Name")["NO.of Teams Created"].sum().reset_index()
-        top_teams = teams_df.sort_values(by="NO.of Teams Created", ascending=False).head(10)
+        top_teams = counts['top_teams']
         fig5 = px.pie(top_teams, names='Teacher Name', values='NO.of Teams Created', title='Top 10 Teachers')
         st.plotly_chart(fig5, use_container_width=True)
 
         st.subheader("Ideas Submitted vs Not Initiated")
-        idea_data = {
-            "Submitted": filtered_df['No.of Teams Idea Submitted'].sum(),
-            "Not Initiated": filtered_df['No.of Teams Idea Not Initiated'].sum()
-        }
+        idea_data = counts['ideas']
         fig6 = px.pie(values=idea_data.values(), names=idea_data.keys(), title="Idea Submission Status",
                         color_discrete_sequence=px.colors.qualitative.Set2)
         st.plotly_chart(fig6, use_container_width=True)
@@ -196,19 +228,14 @@ def teacher_progress_dashboard():
 
 
         st.subheader("Course Engagement")
-        engagement_data = filtered_df[[ 
-            'No.of Students Course Completed',
-            'No.of Students Course Inprogress',
-            'No.of Students Course Not Started'
-        ]].sum().reset_index()
-        engagement_data.columns = ['Course Status', 'Count']
+        engagement_data = counts['engagement']
         fig4 = px.bar(engagement_data, x='Course Status', y='Count', color='Course Status', text='Count',
                         color_discrete_sequence=px.colors.sequential.Tealgrn)
         st.plotly_chart(fig4, use_container_width=True)
 
         
         st.subheader("Students Enrolled vs Completed")
-        total_students = filtered_df[['No.of Students Enrolled', 'No.of Students Course Completed']].sum()
+        total_students = counts['students']
         bar_df = pd.DataFrame({
             "Category": total_students.index,
             "Count": total_students.values
@@ -229,32 +256,27 @@ def teacher_progress_dashboard():
         
 
         st.subheader("Ideas Submitted by School Type")
-        idea_school = filtered_df.groupby("School Type/Category")["No.of Teams Idea Submitted"].sum().reset_index()
+        idea_school = counts['idea_school']
         fig7 = px.bar(idea_school, x="School Type/Category", y="No.of Teams Idea Submitted",
                         color="School Type/Category", text_auto=True,
                         color_discrete_sequence=px.colors.qualitative.Safe)
         st.plotly_chart(fig7, use_container_width=True)
 
         st.subheader("Top Districts by Ideas Submitted")
-        idea_district = filtered_df.groupby("District")["No.of Teams Idea Submitted"].sum().reset_index()
-        idea_district = idea_district.sort_values(by="No.of Teams Idea Submitted", ascending=False).head(10)
+        idea_district = counts['idea_district']
         fig8 = px.bar(idea_district, x="No.of Teams Idea Submitted", y="District", orientation="h",
                         color="No.of Teams Idea Submitted", color_continuous_scale="Agsunset")
         st.plotly_chart(fig8, use_container_width=True)
 
         st.subheader("Unique Schools per State")
-        school_state = filtered_df.groupby("State")["School Name"].nunique().reset_index()
-        school_state = school_state.sort_values(by="School Name", ascending=False).rename(columns={"School Name": "Unique Schools"}).head(5)
+        school_state = counts['school_state']
         fig9 = px.line(school_state, x="State", y="Unique Schools", markers=True)
         st.plotly_chart(fig9, use_container_width=True)
 
 
     with tab4:
         st.subheader("Teacher Course Status vs % Students Completed")
-        combined = filtered_df.groupby("Teacher Course Status").agg({
-            "No.of Students Enrolled": "sum",
-            "No.of Students Course Completed": "sum"
-        }).reset_index()
+        combined = counts['course_completion'].copy()
         combined["Percentage of student Completed"] = (combined["No.of Students Course Completed"] / combined["No.of Students Enrolled"]) * 100
         fig10 = px.bar(combined, x="Teacher Course Status", y="Percentage of student Completed", color="Teacher Course Status", text_auto=True,
                         color_discrete_sequence=px.colors.qualitative.Vivid)
@@ -271,8 +293,6 @@ def teacher_progress_dashboard():
 
         
 
-        df["Idea Status"] = df["No.of Teams Idea Submitted"].apply(lambda x: "Submitted" if x > 0 else "Not Submitted")
-
         # Aggregate data
         idea_engagement = df.groupby("Idea Status").agg({
             "No.of Students Enrolled": "sum",
@@ -0,0 +1,109 @@
+import pickle
+
+import fakeredis
+import pandas as pd
+import pytest
+
+import cache_backends
+from cache_backends import KEY_PREFIX, RedisBackend, make_backend
+from result_cache import ResultCache
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+SECRET = "test-secret"
+
+
+def backend(server, **kwargs):
+    return RedisBackend(fakeredis.FakeRedis(server=server), SECRET, **kwargs)
+
+
+def test_value_written_on_one_node_is_a_hit_on_another(server):
+    frame = pd.DataFrame({"State": ["Kerala", "Goa"], "Count": [3, 1]})
+    node_a, node_b = backend(server), backend(server)
+
+    assert node_b.get(("v1", "Quiz 1", ("All",))) == (False, None)
+    node_a.put(("v1", "Quiz 1", ("All",)), {"counts": frame})
+    found, value = node_b.get(("v1", "Quiz 1", ("All",)))
+
+    assert found
+    pd.testing.assert_frame_equal(value["counts"], frame)
+    assert node_b.stats()["hits"] == 1 and node_b.stats()["misses"] == 1
+    assert node_a.stats()["writes"] == 1
+
+
+class Exploit:
+    def __reduce__(self):
+        return (exec, ("raise AssertionError('unpickled an unsigned payload')",))
+
+
+def test_unsigned_or_foreign_payloads_are_not_unpickled(server):
+    node = backend(server)
+    node.put("key", {"counts": [1, 2]})
+    (stored,) = node.client.keys(KEY_PREFIX + "*")
+
+    # Another client overwrites the entry with its own pickle
+    node.client.set(stored, pickle.dumps(Exploit()))
+    assert node.get("key") == (False, None)
+    # Signed with another secret
+    RedisBackend(node.client, "other-secret").put("key", Exploit())
+    assert node.get("key") == (False, None)
+    assert node.stats()["rejected"] == 2
+
+
+def test_secret_is_required():
+    with pytest.raises(ValueError):
+        RedisBackend(fakeredis.FakeRedis(), "")
+
+
+def test_entries_expire_on_the_server(server):
+    node = backend(server, ttl=120)
+    node.put("key", 1)
+    (stored,) = node.client.keys(KEY_PREFIX + "*")
+    assert 0 < node.client.ttl(stored) <= 120
+
+
+def test_clear_keeps_other_applications_keys(server):
+    node = backend(server)
+    for i in range(2500):
+        node.put(("key", i), i)
+    node.client.set("other-app:session", b"keep")
+
+    node.clear()
+
+    assert node.client.keys(KEY_PREFIX + "*") == []
+    assert node.client.get("other-app:session") == b"keep"
+
+
+def test_unreachable_server_is_a_miss_and_backs_off():
+    server = fakeredis.FakeServer()
+    server.connected = False
+    node = RedisBackend(fakeredis.FakeRedis(server=server), SECRET)
+
+    assert node.get("key") == (False, None)
+    node.put("key", 1)
+    stats = node.stats()
+    # One failed round trip, then the backend is skipped while backing off
+    assert stats["errors"] == 1 and stats["connected"] is False
+
+
+def test_nodes_share_dataset_versions(server, monkeypatch):
+    node_a, node_b = backend(server), backend(server)
+    monkeypatch.setattr(cache_backends, "NODE", "node-a:1")
+    node_a.publish_versions({"quiz1.csv": "aaa", "quiz2.csv": "bbb"})
+    monkeypatch.setattr(cache_backends, "NODE", "node-b:2")
+    node_b.publish_versions({"quiz1.csv": "ccc"})
+
+    versions = {(node, path): digest for node, path, digest, _ in node_a.dataset_versions()}
+    assert versions == {("node-a:1", "quiz1.csv"): "aaa", ("node-a:1", "quiz2.csv"): "bbb",
+                        ("node-b:2", "quiz1.csv"): "ccc"}
+
+
+def test_make_backend():
+    assert isinstance(make_backend("memory://"), ResultCache)
+    assert isinstance(make_backend("redis://localhost:6390/2", SECRET), RedisBackend)
+    with pytest.raises(ValueError):
+        make_backend("memcached://localhost")
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from idea_search import IdeaIndex, load_or_build
+
+
+def index(*texts):
+    return IdeaIndex.build(pd.DataFrame({"Idea Title": list(texts)}), "v1")
+
+
+def test_misspellings_match_by_trigram_similarity():
+    ideas = index("Flood warning along the mississippi", "Solar lamps")
+
+    assert ideas.vocabulary[ideas.expand("misisipi")].tolist() == ["mississippi"]
+    assert ideas.search("misisipi")[0].tolist() == [0]
+
+
+def test_repeated_trigrams_are_counted_once():
+    ideas = index("zzzzzzzz")
+
+    assert ideas.vocabulary[ideas.expand("zzzzzzzzzzzz")].tolist() == ["zzzzzzzz"]
+
+
+def test_unreadable_index_files_are_rebuilt(tmp_path):
+    df = pd.DataFrame({"Idea Title": ["Solar lamps", "Rain water"]})
+    path = tmp_path / "ideas.search.npz"
+    load_or_build(df, "v1", path)
+    data = path.read_bytes()
+
+    for broken in (data[: len(data) // 2], b"", b"not a zip file"):
+        path.write_bytes(broken)
+        assert load_or_build(df, "v1", path).vocabulary.tolist() == ["lamps", "rain", "solar", "water"]
+        assert path.read_bytes() == data
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
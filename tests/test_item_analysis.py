@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from item_analysis import distractor_rates, response_matrix
+
+COLS = {"user": "user", "question": "question", "correct": "correct", "option": "option"}
+
+
+def responses(rows):
+    return pd.DataFrame(rows, columns=["user", "question", "option", "correct"])
+
+
+def test_question_nobody_answered_correctly_has_no_key():
+    df = responses([("u1", 1, "A", 1), ("u2", 1, "B", 0),
+                    ("u1", 2, "A", 0), ("u2", 2, "B", 0)])
+    _, _, questions = response_matrix(df, COLS)
+    table = distractor_rates(df, COLS, questions).set_index(["question", "option"])
+
+    assert table.loc[(1, "A"), "is_key"] and not table.loc[(1, "B"), "is_key"]
+    assert not table.loc[2, "is_key"].any()
+
+
+def test_responses_without_a_question_are_left_out():
+    df = responses([("u1", 1, "A", 1), ("u2", 2, "B", 1), ("u3", np.nan, "C", 0)])
+    matrix, users, questions = response_matrix(df, COLS)
+    table = distractor_rates(df, COLS, questions)
+
+    assert list(questions) == [1, 2]
+    assert np.isnan(matrix[list(users).index("u3")]).all()
+    assert matrix[list(users).index("u2"), 1] == 1
+    assert "C" not in table["option"].tolist()
+    assert table["count"].sum() == 2
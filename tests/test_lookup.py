@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+import lookup
+from lookup import read_rows
+from search_index import LookupIndex
+
+
+def test_rows_are_read_by_position_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    df = pd.DataFrame({"School Name": [f"School {i}\nAnnex" if i % 3 == 0 else f"School {i}" for i in range(10)],
+                       "UDISE Code": [str(i) for i in range(10)]})
+    df.to_csv("schools.csv", index=False)
+    monkeypatch.setitem(lookup.SOURCES, "Schools", ("schools.csv", {}, {"school": ["School Name"]}))
+    monkeypatch.setattr(lookup, "CHUNK_ROWS", 4)
+
+    rows = read_rows("Schools", np.array([0, 3, 4, 9]))
+
+    assert rows["UDISE Code"].tolist() == ["0", "3", "4", "9"]
+    assert rows["School Name"].iloc[1] == "School 3\nAnnex"
+
+
+def test_misspelt_names_find_their_entity():
+    index = LookupIndex()
+    index.add("Schools", "School Name", "school", pd.Series(["Govt HS Kochi", "St Marys Pune", "Govt HS Kochi"]))
+    index.finish()
+
+    assert index.search("govt kochii") == [("school", "govt hs kochi")]
+    assert index.profile(("school", "govt hs kochi"))["Schools"].tolist() == [0, 2]
+    assert index.search("zzzz") == []
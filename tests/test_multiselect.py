@@ -0,0 +1,19 @@
+import numpy as np
+
+from multiselect import option_matrix
+
+
+def test_multi_select_answers_are_split_and_merged_per_respondent():
+    matrix = option_matrix(["Curious, Shy", "Helpful", "Shy ,Helpful"], ["s1", "s1", "s2"])
+
+    assert list(matrix.options) == ["Curious", "Helpful", "Shy"]
+    assert list(matrix.respondents) == ["s1", "s2"]
+    np.testing.assert_array_equal(matrix.matrix.toarray(), [[1, 1, 1], [0, 1, 1]])
+
+
+def test_single_choice_answers_keep_their_commas():
+    matrix = option_matrix(["Yes, sometimes", "No", "Yes, sometimes", None], sep=None)
+
+    assert list(matrix.options) == ["No", "Yes, sometimes"]
+    assert matrix.frequencies().set_index("option")["respondents"].to_dict() == {"Yes, sometimes": 2, "No": 1}
+    assert matrix.n_respondents == 3
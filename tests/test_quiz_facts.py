@@ -0,0 +1,38 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import quiz_facts as quiz_facts_module
+from quiz_facts import FACT_DTYPES, quiz_facts
+
+COLS = {"user": "user", "attempt": "attempt", "correct": "correct"}
+
+
+def test_users_without_an_attempt_number_are_left_out():
+    df = pd.DataFrame({"user": ["u1", "u1", "u1", "u2"],
+                       "attempt": [1, 1, 2, np.nan],
+                       "correct": [1, 0, 1, 1]})
+    facts = quiz_facts(df, 1, COLS).set_index("user_id")
+
+    assert facts.index.tolist() == ["u1"]
+    assert facts.loc["u1", ["first_score", "best_score", "attempts"]].tolist() == [1, 1, 2]
+    facts.reset_index(drop=True).assign(user_code=0).astype(FACT_DTYPES)
+
+
+def test_failed_write_leaves_the_stored_table(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    facts = pd.DataFrame({"user_code": [0], "quiz": [1]})
+    users = pd.DataFrame({"user_code": [0], "user_id": ["u1"]})
+    monkeypatch.setattr(quiz_facts_module, "build_fact_table", lambda: (facts, users))
+    quiz_facts_module.write_fact_table("v1")
+    stored = sorted(p.name for p in tmp_path.iterdir())
+
+    monkeypatch.setattr(quiz_facts_module, "build_fact_table", lambda: (facts, users.assign(user_id=[object()])))
+    with pytest.raises(Exception):
+        quiz_facts_module.write_fact_table("v2")
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == stored
+    assert json.loads((tmp_path / quiz_facts_module.META_FILE).read_text())["source_version"] == "v1"
+    assert pd.read_parquet(quiz_facts_module.USERS_FILE)["user_id"].tolist() == ["u1"]
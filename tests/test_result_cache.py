@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import result_cache
+from datastore import FrozenFrame, cached_frame
+from result_cache import ResultCache, cached_result, normalize_filter
+
+
+# --------- normalize_filter ---------
+@pytest.mark.parametrize("a, b", [
+    (["Kerala", "Goa"], ["Goa", "Kerala"]),
+    ({"Kerala", "Goa"}, ("Goa", "Kerala")),
+    ("All States", "All"),
+    ("All Districts", " All "),
+    ("  Tamil   Nadu ", "Tamil Nadu"),
+    (np.int64(3), 3),
+    (np.float32(0.5), 0.5),
+    ({"State": "Goa", "Gender": ["F", "M"]}, {"Gender": ["M", "F"], "State": "Goa"}),
+    ((("Kerala", "Kochi"), "All States"), (("Kerala", "Kochi"), "All")),
+])
+def test_equal_selections_normalize_to_one_key(a, b):
+    assert normalize_filter(a) == normalize_filter(b)
+    assert hash(normalize_filter(a)) == hash(normalize_filter(b))
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Goa", "goa"),
+    (("Kerala", "Kochi"), ("Kochi", "Kerala")),
+    (["Goa"], ["Goa", "Kerala"]),
+    ({"State": "Goa"}, {"District": "Goa"}),
+])
+def test_different_selections_keep_distinct_keys(a, b):
+    assert normalize_filter(a) != normalize_filter(b)
+
+
+def test_frozen_frames_are_keyed_by_the_frame_they_share():
+    frame = FrozenFrame(pd.DataFrame({"a": [1, 2]}))
+    frame.frame_id = 7
+    other = FrozenFrame(frame)
+    other.frame_id = 7
+
+    assert normalize_filter(frame) == normalize_filter(other) == ("frame", 7)
+
+
+# --------- ResultCache ---------
+def test_least_recently_used_entries_are_evicted_beyond_max_bytes():
+    value = np.zeros(100)
+    cache = ResultCache(max_bytes=2 * value.nbytes)
+    cache.put("a", value)
+    cache.put("b", value)
+    cache.get("a")
+    cache.put("c", value)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a")[0] and cache.get("c")[0]
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 2 * value.nbytes
+
+
+def test_values_larger_than_the_cache_are_not_stored():
+    cache = ResultCache(max_bytes=100)
+    cache.put("big", np.zeros(100))
+
+    assert cache.get("big") == (False, None)
+    assert cache.stats()["entries"] == 0
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+    cache = ResultCache(ttl=60)
+    cache.put("key", 1)
+
+    now[0] += 59
+    assert cache.get("key") == (True, 1)
+    now[0] += 2
+    assert cache.get("key") == (False, None)
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
+
+
+def test_replacing_an_entry_keeps_the_size_exact():
+    cache = ResultCache()
+    cache.put("key", np.zeros(10))
+    cache.put("key", np.zeros(20))
+
+    assert cache.stats()["bytes"] == np.zeros(20).nbytes
+
+
+# --------- cached_result ---------
+def test_equal_selections_share_one_computation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("RESULT_CACHE_URL", raising=False)
+    (tmp_path / "data.csv").write_text("State\nGoa\n")
+    result_cache.result_cache().clear()
+    calls = []
+
+    @cached_result("Test", "data.csv")
+    def count(states, gender):
+        calls.append((states, gender))
+        return len(states)
+
+    assert count(["Kerala", "Goa"], "All") == 2
+    assert count(["Goa", "Kerala"], "All States") == 2
+    assert count(["Goa"], "All") == 1
+    assert len(calls) == 2
+
+
+# --------- cached_frame ---------
+def test_frames_reload_when_their_file_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "frame.csv"
+    path.write_text("State\nGoa\n")
+
+    @cached_frame("frame.csv")
+    def load():
+        return pd.read_csv("frame.csv")
+
+    first = load()
+    assert load().frame_id == first.frame_id
+    path.write_text("State\nGoa\nKerala\n")
+    os.utime(path, (1, 1))
+
+    assert load()["State"].tolist() == ["Goa", "Kerala"]
+    assert load().frame_id != first.frame_id
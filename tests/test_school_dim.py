@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from school_dim import SchoolDimension
+
+STATES = pd.DataFrame({"state_key": [0], "state": ["Kerala"]})
+DISTRICTS = pd.DataFrame({"district_key": [0, 1], "district": ["Kochi", "Thrissur"], "state_key": [0, 0]})
+# 0-2 registered with a UDISE code; 3 registered without one; 4-6 named by another dataset only
+MEMBERS = pd.DataFrame({
+    "school_key": np.arange(7),
+    "school": ["Govt HS", "St Marys", "St Marys", "Model School", "Govt  HS", "St Marys", "Model School"],
+    "udise": [101, 102, 103, -1, -1, -1, -1],
+    "district_key": [0, 0, 0, 1, 0, 0, 1],
+    "state_key": [0, 0, 0, 0, 0, 0, 0],
+})
+
+
+def test_schools_named_without_a_code_join_only_to_a_unique_registered_name():
+    registrations = pd.DataFrame({"school_key": [0, 1, 2, 3, -1], "No of teachers registered": [4, 2, 3, 1, 5]})
+    dimension = SchoolDimension(registrations, MEMBERS, DISTRICTS, STATES)
+
+    assert dimension.schools["udise"].tolist() == [101, 102, 103]
+    assert dimension.schools["teachers"].tolist() == [4, 2, 3]
+    assert dimension.unkeyed == 2
+    keys, by_name = dimension.keys([0, 2, 4, 5, 6, -1])
+    assert keys.tolist() == [0, 2, 0, -1, -1, -1]
+    assert by_name == 1
@@ -0,0 +1,25 @@
+import pytest
+
+import segments
+from segments import load_segments, save_segment
+
+GIRLS = {"combine": "AND", "conditions": [{"field": "Gender", "values": ["Female"], "negate": False}]}
+
+
+def test_saved_segments_are_kept_alongside_each_other(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_segment("girls", GIRLS)
+    save_segment("everyone", {"combine": "OR", "conditions": []})
+
+    assert load_segments() == {"girls": GIRLS, "everyone": {"combine": "OR", "conditions": []}}
+    assert [p.name for p in tmp_path.iterdir()] == [segments.SEGMENTS_FILE]
+
+
+def test_failed_save_leaves_the_previous_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_segment("girls", GIRLS)
+    with pytest.raises(TypeError):
+        save_segment("broken", {"combine": "AND", "conditions": [object()]})
+
+    assert load_segments() == {"girls": GIRLS}
+    assert [p.name for p in tmp_path.iterdir()] == [segments.SEGMENTS_FILE]
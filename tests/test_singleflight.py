@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def run_callers(group, func, n):
+    """Start n callers of the same key; returns their threads and a results list of ("ok"|"error", value)"""
+    results = []
+
+    def call():
+        try:
+            results.append(("ok", group.do("key", func, page="Test")))
+        except BaseException as error:
+            results.append(("error", error))
+
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_concurrent_callers_share_one_computation():
+    group = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return {"answer": 42}
+
+    threads, results = run_callers(group, compute, 10)
+    wait_for(lambda: group.stats()["waiting"] == 9)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [("ok", {"answer": 42})] * 10
+    assert all(value is results[0][1] for _, value in results)
+    stats = group.stats()
+    assert (stats["computed"], stats["coalesced"], stats["in_flight"]) == (1, 9, 0)
+    assert group.page_counts() == {"Test": 9}
+
+
+def test_leader_exception_reaches_every_caller():
+    group = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        raise ValueError("bad file")
+
+    threads, results = run_callers(group, compute, 5)
+    wait_for(lambda: group.stats()["waiting"] == 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert [kind for kind, _ in results] == ["error"] * 5
+    assert all(isinstance(error, ValueError) for _, error in results)
+    assert group.stats()["failed"] == 1
+    # The failed flight is not remembered
+    assert group.do("key", lambda: "recovered") == "recovered"
+
+
+@pytest.mark.parametrize("interrupt", [KeyboardInterrupt, SystemExit])
+def test_interrupted_leader_makes_followers_retry(interrupt):
+    group = SingleFlight()
+    release, retried = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(5)
+            raise interrupt()
+        retried.wait(5)
+        return "fresh"
+
+    threads, results = run_callers(group, compute, 4)
+    wait_for(lambda: group.stats()["waiting"] == 3)
+    release.set()
+    # One follower leads the retry, the other two wait on it
+    wait_for(lambda: group.stats()["waiting"] == 2)
+    retried.set()
+    for thread in threads:
+        thread.join()
+
+    errors = [value for kind, value in results if kind == "error"]
+    values = [value for kind, value in results if kind == "ok"]
+    # Only the interrupted leader sees the interrupt; nobody gets a None placeholder
+    assert len(errors) == 1 and isinstance(errors[0], interrupt)
+    assert values == ["fresh"] * 3
+    assert len(calls) == 2
+    assert group.stats()["in_flight"] == 0
@@ -0,0 +1,69 @@
+import os
+
+import pandas as pd
+
+import warehouse
+from warehouse import ensure_warehouse, read_manifest
+
+
+def write_survey(path, users, option="Yes"):
+    pd.DataFrame({"user_id": users, "question_no": "1", "selected_option": option}).to_excel(path, index=False)
+
+
+def parts(manifest, dataset):
+    return manifest["datasets"][dataset]["parts"]
+
+
+def test_only_datasets_whose_file_changed_are_rebuilt(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_survey(warehouse.SURVEYS["pre"], ["1", "2"])
+    write_survey(warehouse.SURVEYS["post"], ["2"])
+    surveys = ["pre survey", "post survey"]
+    before = ensure_warehouse(surveys)
+
+    write_survey(warehouse.SURVEYS["post"], ["3", "2"], option="No")
+    os.utime(warehouse.SURVEYS["post"], (1, 1))
+    after = ensure_warehouse(surveys)
+
+    assert parts(after, "pre survey") == parts(before, "pre survey")
+    assert parts(after, "post survey") != parts(before, "post survey")
+    assert after == read_manifest()
+    # Existing students keep their keys; the new one is appended
+    students = pd.read_parquet(os.path.join(warehouse.WAREHOUSE_DIR, after["dims"]["dim_student"]["file"]))
+    assert students["user_id"].tolist() == ["1", "2", "3"]
+
+
+def test_replaced_files_are_removed_once_no_manifest_can_refer_to_them(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pre = warehouse.SURVEYS["pre"]
+    write_survey(pre, ["1"])
+    first = ensure_warehouse(["pre survey"])
+    for mtime in (1, 2):
+        write_survey(pre, ["1"], option=str(mtime))
+        os.utime(pre, (mtime, mtime))
+        ensure_warehouse(["pre survey"])
+
+    files = set(os.listdir(warehouse.WAREHOUSE_DIR)) - {"manifest.json"}
+    manifest = read_manifest()
+    assert files == warehouse.manifest_files(manifest) | set(manifest["retired"])
+    assert not files & warehouse.manifest_files(first)
+
+
+def test_missing_sources_contribute_no_tables(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manifest = ensure_warehouse(["pre survey"])
+
+    assert manifest["datasets"]["pre survey"]["parts"] == {}
+    assert manifest["dims"] == {}
+
+
+def test_unreadable_datasets_are_left_out_until_their_file_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_survey(warehouse.SURVEYS["pre"], ["1"])
+    pd.DataFrame({"user_id": ["2"]}).to_excel(warehouse.SURVEYS["post"], index=False)
+    manifest = ensure_warehouse(["pre survey", "post survey"])
+
+    assert "question_no" in warehouse.quarantined("fact_survey_response")["post survey"]
+    assert list(parts(manifest, "pre survey")) == ["fact_survey_response"]
+    assert manifest["dims"]["dim_student"]["rows"] == 1
+    assert ensure_warehouse(["post survey"]) == manifest
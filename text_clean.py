@@ -0,0 +1,64 @@
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+
+CANONICAL_FILE = "canonical_names.csv"
+
+CASES = {
+    None: lambda values: values,
+    "title": lambda values: values.str.title(),
+    "lower": lambda values: values.str.lower(),
+    "upper": lambda values: values.str.upper(),
+    "capitalize": lambda values: values.str.capitalize(),
+}
+
+
+def per_unique(series, func, missing=None):
+    """Apply a vectorized func to the distinct values of series only and map the results back to every row.
+
+    Missing values are cleaned as the given missing value (e.g. "nan", like astype(str)),
+    or stay missing when it is None.
+    """
+    codes, uniques = pd.factorize(series)
+    if missing is not None:
+        results = np.asarray(func(pd.Series([*uniques, missing], dtype=object)))
+    else:
+        results = np.asarray(func(pd.Series(uniques, dtype=object)))
+        results = np.append(results, np.nan if results.dtype.kind in "iufc" else None)
+    # code -1 picks the last entry; keeping the result dtype avoids re-inferring a string type per row
+    return pd.Series(results[codes], index=series.index, name=series.name, dtype=results.dtype)
+
+
+@functools.lru_cache(maxsize=None)
+def canonical_names(path=CANONICAL_FILE):
+    """kind -> {lower-case variant: canonical name} from the mapping table of known misspellings"""
+    if not os.path.exists(path):
+        return {}
+    table = pd.read_csv(path, dtype=str).dropna()
+    mapping = {}
+    for kind, variant, canonical in table[["kind", "variant", "canonical"]].itertuples(index=False):
+        mapping.setdefault(kind, {})[" ".join(variant.lower().split())] = canonical
+    return mapping
+
+
+def canonicalize(values, kind):
+    """Replace known misspellings of a state or district with the canonical name"""
+    mapping = canonical_names().get(kind)
+    if not mapping:
+        return values
+    canonical = values.str.lower().map(mapping)
+    return canonical.where(canonical.notna(), values)
+
+
+def clean_text(series, case=None, kind=None, missing=None):
+    """Strip, collapse inner whitespace and re-case a text column, optionally fixing known misspellings of kind.
+
+    Only the distinct values are cleaned, so the cost grows with cardinality, not row count.
+    """
+    def clean(values):
+        values = CASES[case](values.astype(str).str.split().str.join(" "))
+        return canonicalize(values, kind) if kind else values
+
+    return per_unique(series, clean, missing)
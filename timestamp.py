@@ -1,18 +1,28 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import matplotlib.pyplot as plt
 
+from datastore import cached_frame, filter_rows
+from disk_cache import disk_cached
+from result_cache import cached_result
+
+TIMESTAMP_FILE = "processed_timestamp2.xls"
 
 st.set_page_config(page_title="Teacher Course time stamp", layout="wide")
 st.title("📊 Time stamp Dashboard")
 def timestampdashboard():
-    @st.cache_data(show_spinner=False)
+    @cached_frame(TIMESTAMP_FILE)
+    @disk_cached(TIMESTAMP_FILE)
     def load_data():
-        df = pd.read_csv("processed_timestamp2.xls", parse_dates=[
+        df = pd.read_csv(TIMESTAMP_FILE, parse_dates=[
             "created_at", "next_created_at", "prev_time"])
         df["watch_duration"] = pd.to_timedelta(df["watch_duration"])
         df["time_diff"] = pd.to_timedelta(df["time_diff"])
+
+        # Time features
+        df["hour"] = df["created_at"].dt.hour
+        df["day_of_week"] = df["created_at"].dt.day_name()
+        df["created_date"] = df["created_at"].dt.date
         return df
 
     df = load_data()
@@ -27,11 +37,37 @@ def timestampdashboard():
     with col2:
         selected_topic = st.selectbox("📘 Select Topic", ['All'] + sorted(df['mentor_course_topic_id'].unique().tolist()))
 
-    filtered_df = df.copy()
-    if selected_user != 'All':
-        filtered_df = filtered_df[filtered_df['user_id'] == selected_user]
-    if selected_topic != 'All':
-        filtered_df = filtered_df[filtered_df['mentor_course_topic_id'] == selected_topic]
+    @cached_result("Teacher Course Timestamp", TIMESTAMP_FILE)
+    def compute_views(user, topic):
+        """Every aggregate the tabs show for one user/topic selection"""
+        filtered_df = filter_rows(df, {'user_id': user, 'mentor_course_topic_id': topic})
+
+        topic_counts = filtered_df['mentor_course_topic_id'].value_counts().reset_index()
+        topic_counts.columns = ['Topic', 'Completions']
+        users_per_topic = filtered_df.groupby('mentor_course_topic_id')['user_id'].nunique().reset_index()
+        users_per_topic.columns = ['Topic', 'Unique Users']
+        session_lengths = filtered_df.groupby('session_id')['mentor_course_topic_id'].count().reset_index()
+        session_lengths.columns = ['Session ID', 'Topics Watched']
+        topics_per_user = filtered_df.groupby('user_id')['mentor_course_topic_id'].nunique().reset_index()
+        topics_per_user.columns = ['User', 'Topics Completed']
+        short_views = filtered_df[filtered_df['watch_duration'] < pd.Timedelta(minutes=3)]
+        short_view_count = short_views.groupby('mentor_course_topic_id')['user_id'].nunique().reset_index()
+        short_view_count.columns = ['Topic', 'Users (<3min)']
+
+        return {
+            'users': filtered_df['user_id'].nunique(),
+            'topics': filtered_df['mentor_course_topic_id'].nunique(),
+            'hourly': filtered_df['hour'].value_counts().sort_index(),
+            'dow_counts': filtered_df['day_of_week'].value_counts().sort_index(),
+            'daily': filtered_df['created_date'].value_counts().sort_index(),
+            'topic_counts': topic_counts,
+            'users_per_topic': users_per_topic,
+            'session_lengths': session_lengths.sort_values('Topics Watched', ascending=False),
+            'topics_per_user': topics_per_user,
+            'short_view_count': short_view_count,
+        }
+
+    views = compute_views(selected_user, selected_topic)
 
     # ----------------------------
     # TABS
@@ -42,20 +78,15 @@ def timestampdashboard():
     # TAB 1: User Behavior
     # ----------------------------
     with behavior_tab:
-        st.metric("Total Users", filtered_df['user_id'].nunique())
-
-        # Time features
-        filtered_df['hour'] = filtered_df['created_at'].dt.hour
-        filtered_df['day_of_week'] = filtered_df['created_at'].dt.day_name()
-        filtered_df['created_date'] = filtered_df['created_at'].dt.date
+        st.metric("Total Users", views['users'])
 
         # Summary Data
-        hourly = filtered_df['hour'].value_counts().sort_index()
-        dow_counts = filtered_df['day_of_week'].value_counts().sort_index()
+        hourly = views['hourly']
+        dow_counts = views['dow_counts']
 
         st.subheader("🧾 Summary")
-        st.markdown(f"- Total Users: {filtered_df['user_id'].nunique()}")
-        st.markdown(f"- Total Topics Viewed: {filtered_df['mentor_course_topic_id'].nunique()}")
+        st.markdown(f"- Total Users: {views['users']}")
+        st.markdown(f"- Total Topics Viewed: {views['topics']}")
         if not hourly.empty:
             st.markdown(f"- Most Active Hour: {hourly.idxmax():02d}:00 with {hourly.max()} views")
         if not dow_counts.empty:
@@ -89,7 +120,7 @@ def timestampdashboard():
         st.plotly_chart(fig2, use_container_width=True)
 
         # 📅 Most Active Dates
-        daily = filtered_df['created_date'].value_counts().sort_index()
+        daily = views['daily']
         fig3 = px.bar(
             x=daily.index,
             y=daily.values,
@@ -99,24 +130,16 @@ def timestampdashboard():
         st.plotly_chart(fig3, use_container_width=True)
 
         # 📘 Topic Completion Counts
-        topic_counts = filtered_df['mentor_course_topic_id'].value_counts().reset_index()
-        topic_counts.columns = ['Topic', 'Completions']
-        fig4 = px.bar(topic_counts, x='Topic', y='Completions', title='Topic Completion Counts')
+        fig4 = px.bar(views['topic_counts'], x='Topic', y='Completions', title='Topic Completion Counts')
         st.plotly_chart(fig4, use_container_width=True)
 
         # 🥧 Course-wise Engagement Share
-        users_per_topic = filtered_df.groupby('mentor_course_topic_id')['user_id'].nunique().reset_index()
-        users_per_topic.columns = ['Topic', 'Unique Users']
-        pie_chart = px.pie(users_per_topic, names='Topic', values='Unique Users', title='Course-wise Engagement Share')
+        pie_chart = px.pie(views['users_per_topic'], names='Topic', values='Unique Users', title='Course-wise Engagement Share')
         st.plotly_chart(pie_chart, use_container_width=True)
 
             # ⏱ Number of Topics Watched Per Session (Horizontal Bar Chart)
-        session_lengths = filtered_df.groupby('session_id')['mentor_course_topic_id'].count().reset_index()
-        session_lengths.columns = ['Session ID', 'Topics Watched']
-        session_lengths = session_lengths.sort_values('Topics Watched', ascending=False)
-
         fig5 = px.bar(
-            session_lengths,
+            views['session_lengths'],
             x='Topics Watched',
             y='Session ID',
             orientation='h',
@@ -139,16 +162,13 @@ def timestampdashboard():
     # ----------------------------
     with dropoff_tab:
         all_topics = df['mentor_course_topic_id'].nunique()
-        user_topic_counts = filtered_df.groupby('user_id')['mentor_course_topic_id'].nunique().reset_index()
-        user_topic_counts.columns = ['User', 'Completed Topics']
-        user_topic_counts['Drop-off'] = user_topic_counts['Completed Topics'] < all_topics
+        topics_per_user = views['topics_per_user']
+        dropped = topics_per_user[topics_per_user['Topics Completed'] < all_topics]
 
-        fig6 = px.histogram(user_topic_counts[user_topic_counts['Drop-off']], x='Completed Topics', nbins=20,
-                            title='Users  Completeled All Topics')
+        fig6 = px.histogram(dropped.rename(columns={'Topics Completed': 'Completed Topics'}), x='Completed Topics',
+                            nbins=20, title='Users  Completeled All Topics')
         st.plotly_chart(fig6, use_container_width=True)
 
-        topics_per_user = filtered_df.groupby('user_id')['mentor_course_topic_id'].nunique().reset_index()
-        topics_per_user.columns = ['User', 'Topics Completed']
         fig7 = px.histogram(topics_per_user, x='Topics Completed', nbins=20, title='Topics Wise Drop-off Detection')
         st.plotly_chart(fig7, use_container_width=True)
 
@@ -156,10 +176,7 @@ def timestampdashboard():
     # TAB 3: Time-Based Analysis
     # ----------------------------
     with time_tab:
-        short_views = filtered_df[filtered_df['watch_duration'] < pd.Timedelta(minutes=3)]
-        short_view_count = short_views.groupby('mentor_course_topic_id')['user_id'].nunique().reset_index()
-        short_view_count.columns = ['Topic', 'Users (<3min)']
-        fig8 = px.line(short_view_count, x='Topic', y='Users (<3min)', markers=True,
+        fig8 = px.line(views['short_view_count'], x='Topic', y='Users (<3min)', markers=True,
                     title='Users Who Watched Topic < 3 Minutes')
         fig8.update_traces(line=dict(color='orange', width=3), marker=dict(size=8))
         fig8.update_layout(xaxis_title='Topic ID', yaxis_title='User Count (<3min)')
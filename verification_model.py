@@ -0,0 +1,198 @@
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from datastore import dataset_version, find_column
+from idea_search import IDEAS_FILE
+from ideas_cube import ACTION_COL
+
+MODEL_FILE = "verification_model.json"
+SCORES_FILE = "Submitted_Ideas.scores.csv"
+
+TARGET_CANDIDATES = ("Verified Status", "Verification Status", "Evaluation Status", "Verified")
+POSITIVE_LABELS = {"verified", "yes", "true", "1", "accepted", "selected"}
+
+# feature name -> candidate columns; the feature is 1 when the column is filled in
+FLAG_FEATURES = {
+    "has_prototype": ("Prototype Link", "Prototype Image", "Prototype"),
+    "has_video": ("Video Link", "Youtube Link", "Video"),
+    "has_feedback": ("Feedback", "Mentor Feedback"),
+    "workbook_complete": ("Workbook Status", "Workbook Complete", "Workbook"),
+}
+# feature name -> candidate text columns; the feature is log(1 + word count)
+TEXT_FEATURES = {
+    "problem_words": ("Describe the problem your team is trying to solve",),
+    "solution_words": ("What is your solution?",),
+}
+MAX_THEMES = 10
+L2_PENALTY = 1.0
+
+
+# --------- Features ---------
+def _filled(series):
+    return series.notna().to_numpy() & (series.astype(str).str.strip().str.len() > 0).to_numpy()
+
+
+def feature_frame(df, themes):
+    """Numeric model inputs for every idea, derived column-wise from the ideas file"""
+    features = {}
+    for name, candidates in FLAG_FEATURES.items():
+        column = find_column(df, *candidates)
+        if column is not None:
+            features[name] = _filled(df[column])
+    status = find_column(df, "Idea Submission Status")
+    if status is not None:
+        features["submitted"] = (df[status].astype(str).str.strip().str.upper() == "SUBMITTED").to_numpy()
+    for name, candidates in TEXT_FEATURES.items():
+        column = find_column(df, *candidates)
+        if column is not None:
+            features[name] = np.log1p(df[column].fillna("").astype(str).str.count(r"\S+").to_numpy(dtype=float))
+    if ACTION_COL in df.columns:
+        actions = df[ACTION_COL]
+        features["actions_taken"] = np.where(actions.notna(), actions.astype(str).str.count(",") + 1, 0)
+    if "Theme" in df.columns:
+        theme = df["Theme"].to_numpy()
+        for name in themes:
+            features[f"theme: {name}"] = theme == name
+    return pd.DataFrame(features, index=df.index).astype(np.float32)
+
+
+def target(df):
+    """1 for verified ideas, 0 for other labelled ideas, NaN where the status is missing"""
+    column = find_column(df, *TARGET_CANDIDATES)
+    if column is None:
+        return None
+    labels = df[column].astype(str).str.strip().str.lower()
+    return pd.Series(np.where(labels.isin(POSITIVE_LABELS), 1.0, 0.0), index=df.index).where(df[column].notna())
+
+
+# --------- Training ---------
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+
+def fit_logistic(X, y, l2=L2_PENALTY, iterations=50):
+    """L2-regularised logistic regression by Newton's method; returns (coef, intercept)"""
+    Xb = np.column_stack([X, np.ones(len(X))])
+    w = np.zeros(Xb.shape[1])
+    penalty = np.full(Xb.shape[1], l2)
+    penalty[-1] = 0.0  # the intercept is not shrunk
+    for _ in range(iterations):
+        p = _sigmoid(Xb @ w)
+        grad = Xb.T @ (p - y) + penalty * w
+        hessian = (Xb.T * (p * (1 - p))) @ Xb + np.diag(penalty) + 1e-9 * np.eye(len(w))
+        step = np.linalg.solve(hessian, grad)
+        w -= step
+        if np.abs(step).max() < 1e-6:
+            break
+    return w[:-1], w[-1]
+
+
+def auc(y, p):
+    """Area under the ROC curve from the rank sum of the positive scores"""
+    positives = y == 1
+    n_pos, n_neg = positives.sum(), (~positives).sum()
+    if n_pos == 0 or n_neg == 0:
+        return float("nan")
+    ranks = pd.Series(p).rank().to_numpy()
+    return float((ranks[positives].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg))
+
+
+def train(df, holdout=0.2, seed=0):
+    """Fit the model on the labelled ideas and evaluate it on a random holdout"""
+    y = target(df)
+    if y is None or y.notna().sum() == 0:
+        raise ValueError(f"No verification status column found (looked for {', '.join(TARGET_CANDIDATES)})")
+    labelled = df[y.notna().to_numpy()]
+    y = y.dropna().to_numpy()
+
+    themes = labelled["Theme"].value_counts().index[:MAX_THEMES].tolist() if "Theme" in labelled.columns else []
+    X = feature_frame(labelled, themes)
+    mean = X.mean().to_numpy()
+    std = X.std(ddof=0).replace(0, 1).to_numpy()
+    Z = (X.to_numpy() - mean) / std
+
+    test = np.random.default_rng(seed).random(len(Z)) < holdout
+    coef, intercept = fit_logistic(Z[~test], y[~test])
+    p_test = _sigmoid(Z[test] @ coef + intercept)
+    metrics = {
+        "holdout_auc": auc(y[test], p_test),
+        "holdout_accuracy": float(((p_test >= 0.5) == y[test]).mean()) if test.any() else float("nan"),
+    }
+
+    coef, intercept = fit_logistic(Z, y)
+    return {
+        "features": X.columns.tolist(),
+        "themes": themes,
+        "mean": mean.tolist(),
+        "std": std.tolist(),
+        "coef": coef.tolist(),
+        "intercept": float(intercept),
+        "labelled_ideas": int(len(y)),
+        "verified_rate": float(y.mean()),
+        "metrics": metrics,
+    }
+
+
+# --------- Model File ---------
+def save_model(model, path=MODEL_FILE):
+    with open(path, "w") as f:
+        json.dump(model, f, indent=4)
+
+
+def load_model(path=MODEL_FILE):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def importances(model):
+    """Share of the standardised coefficient magnitude per feature, with its direction"""
+    coef = np.asarray(model["coef"])
+    total = np.abs(coef).sum() or 1.0
+    return pd.DataFrame({
+        "feature": model["features"],
+        "importance": np.abs(coef) / total,
+        "effect": np.where(coef >= 0, "raises likelihood", "lowers likelihood"),
+    }).sort_values("importance", ascending=False, ignore_index=True)
+
+
+# --------- Scoring ---------
+def score(model, df):
+    """Predicted verification likelihood for every idea, as one matrix product"""
+    X = feature_frame(df, model["themes"]).reindex(columns=model["features"], fill_value=0).to_numpy()
+    Z = (X - np.asarray(model["mean"], dtype=np.float32)) / np.asarray(model["std"], dtype=np.float32)
+    return _sigmoid(Z @ np.asarray(model["coef"], dtype=np.float32) + model["intercept"])
+
+
+def read_ideas(path=IDEAS_FILE):
+    return pd.read_csv(path, encoding="ISO-8859-1", low_memory=False, dtype={"UDISE CODE": str, "Pin code": str})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train or apply the idea verification model")
+    parser.add_argument("command", choices=["train", "score"])
+    parser.add_argument("--ideas", default=IDEAS_FILE, help="ideas CSV file")
+    args = parser.parse_args()
+
+    ideas = read_ideas(args.ideas)
+    if args.command == "train":
+        model = train(ideas)
+        model["source_version"] = dataset_version(args.ideas)
+        save_model(model)
+        print(f"Trained on {model['labelled_ideas']} labelled ideas; holdout AUC "
+              f"{model['metrics']['holdout_auc']:.3f}. Saved {MODEL_FILE}")
+    else:
+        model = load_model()
+        if model is None:
+            raise SystemExit(f"No model in {MODEL_FILE}; run the train command first")
+        start = time.perf_counter()
+        likelihood = score(model, ideas)
+        elapsed = time.perf_counter() - start
+        ideas.assign(verification_likelihood=likelihood).to_csv(SCORES_FILE, index=False)
+        print(f"Scored {len(ideas)} ideas in {elapsed:.3f}s. Saved {SCORES_FILE}")
@@ -0,0 +1,422 @@
+import json
+import os
+import re
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from datastore import cached_frame, dataset_version, find_column
+from item_analysis import QUIZZES
+from lookup import SOURCES, read_source
+from pincode import PINCODE_FILE, enrich, load_directory
+from search_index import normalize
+from text_clean import clean_text, per_unique
+
+WAREHOUSE_DIR = "warehouse"
+MANIFEST_FILE = os.path.join(WAREHOUSE_DIR, "manifest.json")
+SURVEYS = {"pre": "cleaned_pre_survey.xlsx", "post": "cleaned_post_survey.xlsx"}
+# Bumped whenever the table layout changes, so stored warehouses are rebuilt
+SCHEMA_VERSION = 3
+
+# role -> candidate column names, matched with find_column
+ROLE_COLUMNS = {
+    "state": ("State",),
+    "district": ("District", "City"),
+    "school": ("School Name",),
+    "udise": ("UDISE Code", "UDISE"),
+    "teacher": ("Teacher Name",),
+    "team": ("Team Name",),
+    "user": ("User ID", "user_id"),
+    "student": ("Student Name", "Name"),
+}
+
+# fact table -> (source dataset, dimension keys carried by each row)
+GEO_FACTS = {
+    "fact_school_registration": ("School Registration", ["school", "district", "state"]),
+    "fact_teacher_registration": ("Teacher Registration", ["teacher", "school", "district", "state"]),
+    "fact_teacher_progress": ("Teacher Progress", ["teacher", "school", "district", "state"]),
+    "fact_student_progress": ("Student Progress", ["student", "team", "teacher", "school", "district", "state"]),
+    "fact_idea": ("Submitted Ideas", ["team", "school", "district", "state"]),
+}
+
+# dimension -> (label column, parent dimensions stored on each member)
+DIMENSIONS = {
+    "state": ("state", []),
+    "district": ("district", ["state"]),
+    "school": ("school", ["district", "state"]),
+    "teacher": ("teacher", ["school"]),
+    "team": ("team", ["school"]),
+    "student": ("student", ["school"]),
+}
+
+
+# dataset -> source file. School Registration comes first: it names the members it shares with other datasets
+DATASETS = {
+    **{dataset: path for dataset, (path, _, _) in sorted(SOURCES.items(), key=lambda item: item[0] != "School Registration")},
+    **{f"{survey} survey": path for survey, path in SURVEYS.items()},
+}
+NAMING_DATASET = "School Registration"
+QUIZ_DATASETS = {f"Quiz {quiz_no}": quiz for quiz_no, quiz in enumerate(QUIZZES, start=1)}
+
+# fact table -> datasets contributing rows to it
+FACT_DATASETS = {
+    **{fact: [dataset] for fact, (dataset, _) in GEO_FACTS.items()},
+    "fact_quiz_response": list(QUIZ_DATASETS),
+    "fact_survey_response": [f"{survey} survey" for survey in SURVEYS],
+}
+
+
+def dataset_inputs(dataset):
+    """Files a dataset's rows are built from; source datasets are repaired from the pincode directory"""
+    return (DATASETS[dataset], PINCODE_FILE) if dataset in SOURCES else (DATASETS[dataset],)
+
+
+def table_datasets(name):
+    """Datasets to bring up to date before reading a table.
+
+    A dimension holds the members of whatever has been built so far, so pages
+    load their facts before the dimensions those facts point into.
+    """
+    return FACT_DATASETS.get(name, [NAMING_DATASET])
+
+
+def table_files(*names):
+    """Files behind the named tables.
+
+    Dimensions only ever gain members, so a fact table stays valid against any
+    later dimension; the labels of existing members only change with the
+    naming dataset. A page reading some facts and their dimensions therefore
+    depends on the facts' files and the naming dataset's, not on every source.
+    """
+    datasets = {dataset for name in names for dataset in FACT_DATASETS.get(name, [NAMING_DATASET])}
+    return tuple(path for dataset in DATASETS if dataset in datasets for path in dataset_inputs(dataset))
+
+
+def table_version(*names):
+    """Cache key for reading the named tables; see table_files"""
+    return f"v{SCHEMA_VERSION}-" + dataset_version(*table_files(*names))
+
+
+def source_version():
+    """Version of every source file, i.e. of the warehouse as a whole"""
+    return f"v{SCHEMA_VERSION}-" + dataset_version(*(path for dataset in DATASETS for path in dataset_inputs(dataset)))
+
+
+# --------- Natural Keys ---------
+def _nk(values):
+    return values.map(lambda value: normalize(value) or None)
+
+
+def _join(prefix, *parts):
+    """Element-wise "prefix|a|b" natural keys; None when any part is missing"""
+    out = pd.Series(prefix, index=range(len(parts[0])), dtype=object)
+    missing = np.zeros(len(out), dtype=bool)
+    for part in parts:
+        part = pd.Series(np.asarray(part, dtype=object))
+        missing |= part.isna().to_numpy()
+        out = out + "|" + part.fillna("")
+    return out.where(~missing, None).to_numpy()
+
+
+def row_keys(df):
+    """Natural keys and display labels of every dimension a dataset row refers to"""
+    cols = {role: find_column(df, *candidates) for role, candidates in ROLE_COLUMNS.items()}
+    n = len(df)
+    none = np.full(n, None, dtype=object)
+
+    def label(role):
+        if not cols[role]:
+            return none
+        kind = role if role in ("state", "district") else None
+        return clean_text(df[cols[role]], "title", kind=kind).replace("", None).to_numpy()
+
+    labels = {role: label(role) for role in ("state", "district", "school", "teacher", "team", "student")}
+
+    def nk(role):
+        # Names are keyed by their cleaned label so known misspellings share one member
+        if not cols[role]:
+            return none
+        source = pd.Series(labels[role]) if role in labels and role != "student" else df[cols[role]]
+        return per_unique(source, _nk).to_numpy()
+
+    rows = pd.DataFrame({f"{role}_label": values for role, values in labels.items()})
+    rows["state"] = nk("state")
+    rows["district"] = _join("d", rows["state"], nk("district"))
+
+    # Schools are identified by UDISE code, else by name within their district
+    udise = pd.Series(nk("udise"), dtype=object)
+    has_udise = udise.str.fullmatch(r"\d+", na=False).to_numpy()
+    rows["school"] = np.where(has_udise, ("u|" + udise.fillna("")).to_numpy(),
+                              _join("n", rows["district"], nk("school")))
+    rows["teacher"] = _join("t", rows["school"], nk("teacher"))
+    rows["team"] = _join("m", rows["school"], nk("team"))
+    rows["student"] = nk("user")
+    rows["udise"] = pd.to_numeric(udise.where(has_udise), errors="coerce").fillna(-1).astype(np.int64).to_numpy()
+    return rows
+
+
+# --------- Build ---------
+def _dimension_rows(dim, members, dims, start):
+    label, parents = DIMENSIONS[dim]
+    table = pd.DataFrame({f"{dim}_key": np.arange(start, start + len(members), dtype=np.int32),
+                          label: members[f"{label}_label"].to_numpy(), "nk": members[dim].to_numpy()})
+    if dim == "school":
+        table["udise"] = members["udise"].to_numpy()
+    if dim == "student":
+        table["user_id"] = members["student"].to_numpy()
+    for parent in parents:
+        table[f"{parent}_key"] = pd.Index(dims[f"dim_{parent}"]["nk"]).get_indexer(members[parent].to_numpy()).astype(np.int32)
+    return table
+
+
+def extend_dimensions(dims, rows, naming=False):
+    """Dimensions with the members rows mention appended; keys of existing members never change.
+
+    The first dataset to mention a member names it, except that the naming
+    dataset renames the members it shares with the others.
+    """
+    dims = dict(dims)
+    for dim, (label, _) in DIMENSIONS.items():
+        members = rows.dropna(subset=[dim]).drop_duplicates(dim)
+        table = dims.get(f"dim_{dim}")
+        if table is None:
+            dims[f"dim_{dim}"] = _dimension_rows(dim, members, dims, 0)
+            continue
+        known = pd.Index(table["nk"]).get_indexer(members[dim].to_numpy())
+        if naming and (known >= 0).any():
+            table = table.copy()
+            table.loc[known[known >= 0], label] = members[f"{label}_label"].to_numpy()[known >= 0]
+        added = _dimension_rows(dim, members[known < 0], dims, len(table))
+        dims[f"dim_{dim}"] = pd.concat([table, added], ignore_index=True) if len(added) else table
+    return dims
+
+
+def measures(df, used):
+    """Remaining source columns as numbers where every value parses, else as categories"""
+    out = {}
+    for column in df.columns:
+        if column in used:
+            continue
+        values = df[column]
+        numbers = pd.to_numeric(values, errors="coerce")
+        if numbers.notna().sum() == values.notna().sum() and values.notna().any():
+            out[column] = pd.to_numeric(numbers, downcast="integer" if (numbers.dropna() % 1 == 0).all() else "float")
+        else:
+            out[column] = values.str.strip().astype("category")
+    return pd.DataFrame(out, index=df.index)
+
+
+def correct_flags(values, source):
+    """0/1 correctness from "True"/"False" (or 1/0) text; raises when nothing in the column parses"""
+    flags = values.str.strip().str.lower().map({"true": 1, "false": 0, "1": 1, "0": 0, "1.0": 1, "0.0": 0})
+    if len(flags) and flags.isna().all():
+        raise ValueError(f"{source}: correctness column {values.name!r} has no True/False or 1/0 values")
+    return flags.astype("Int8")
+
+
+def fact_keys(rows, dims, keys):
+    return pd.DataFrame({f"{dim}_key": pd.Index(dims[f"dim_{dim}"]["nk"]).get_indexer(rows[dim].to_numpy()).astype(np.int32)
+                         for dim in keys})
+
+
+def read_dataset(dataset):
+    if dataset in SOURCES:
+        path, options, _ = SOURCES[dataset]
+        # Missing or contradicting states and districts are repaired from the pincode first
+        df, _ = enrich(read_source(path, options), load_directory())
+        return df
+    return pd.read_excel(DATASETS[dataset], dtype=str)
+
+
+def fact_parts(dataset, df, rows, dims):
+    """The rows one dataset contributes to each fact table"""
+    parts = {}
+    for fact, (source, keys) in GEO_FACTS.items():
+        if source != dataset:
+            continue
+        used = {find_column(df, *ROLE_COLUMNS[role]) for role in ROLE_COLUMNS} - {None}
+        parts[fact] = pd.concat([fact_keys(rows, dims, keys), measures(df, used).reset_index(drop=True)], axis=1)
+        # Exact repeats of a source row, which the integer keys alone cannot tell apart
+        parts[fact]["source_duplicate"] = df.duplicated().to_numpy()
+
+    if dataset in QUIZ_DATASETS:
+        cols = QUIZZES[QUIZ_DATASETS[dataset]]
+        parts["fact_quiz_response"] = pd.DataFrame({
+            "quiz": np.int8(list(QUIZ_DATASETS).index(dataset) + 1),
+            "student_key": fact_keys(rows, dims, ["student"])["student_key"],
+            "question": pd.to_numeric(df[cols["question"]], errors="coerce").astype("Int16"),
+            "attempt": pd.to_numeric(df[cols["attempt"]], errors="coerce").astype("Int16"),
+            "is_correct": correct_flags(df[cols["correct"]], cols["file"]),
+            "option": df[cols["option"]].astype("category"),
+        })
+
+    if dataset in FACT_DATASETS["fact_survey_response"]:
+        parts["fact_survey_response"] = pd.DataFrame({
+            "survey": pd.Categorical([dataset.split()[0]] * len(df), categories=list(SURVEYS)),
+            "student_key": fact_keys(rows, dims, ["student"])["student_key"],
+            "question_no": pd.to_numeric(df["question_no"], errors="coerce").astype("Int16"),
+            "option": df["selected_option"].astype("category"),
+        })
+    return parts
+
+
+# --------- Store ---------
+# Sessions of one server needing the same rebuild wait for each other instead of both writing it
+BUILD_LOCK = threading.Lock()
+# Unreferenced files younger than this may belong to another process's rebuild that is still running
+ORPHAN_SECONDS = 10 * 60
+
+
+def _empty_manifest():
+    return {"schema": SCHEMA_VERSION, "dims": {}, "datasets": {}, "retired": []}
+
+
+def read_manifest():
+    """The tables of the current warehouse; empty when none was written with this layout"""
+    try:
+        with open(MANIFEST_FILE, "r") as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return _empty_manifest()
+    return manifest if manifest.get("schema") == SCHEMA_VERSION else _empty_manifest()
+
+
+def manifest_files(manifest):
+    files = {entry["file"] for entry in manifest["dims"].values()}
+    for entry in manifest["datasets"].values():
+        files |= {part["file"] for part in entry.get("parts", {}).values()}
+    return files
+
+
+def _write_table(table, name):
+    """Write a table under a name no manifest has used yet; readers only find it once a manifest points at it"""
+    file = f"{name}.{uuid.uuid4().hex[:12]}.parquet"
+    table.to_parquet(os.path.join(WAREHOUSE_DIR, file), index=False)
+    return {"file": file, "rows": len(table)}
+
+
+def _read_table(entry):
+    return pd.read_parquet(os.path.join(WAREHOUSE_DIR, entry["file"]))
+
+
+def _stale(manifest, datasets):
+    return [dataset for dataset in datasets
+            if manifest["datasets"].get(dataset, {}).get("inputs") != dataset_version(*dataset_inputs(dataset))]
+
+
+def update_warehouse(manifest, datasets):
+    """New manifest with the tables of the given datasets rebuilt from their files and the others kept"""
+    os.makedirs(WAREHOUSE_DIR, exist_ok=True)
+    dims = {name: _read_table(entry) for name, entry in manifest["dims"].items()}
+    updated = {"schema": SCHEMA_VERSION, "dims": {}, "datasets": dict(manifest["datasets"])}
+    for dataset in DATASETS:
+        if dataset not in datasets:
+            continue
+        entry = {"inputs": dataset_version(*dataset_inputs(dataset)), "parts": {}}
+        if os.path.exists(DATASETS[dataset]):
+            # A dataset that cannot be read is left out, with the reason, until its file changes again
+            try:
+                df = read_dataset(dataset)
+                rows = row_keys(df)
+                extended = extend_dimensions(dims, rows, naming=dataset == NAMING_DATASET)
+                slug = re.sub(r"\W+", "_", dataset)
+                entry["parts"] = {name: _write_table(part, f"{name}.{slug}")
+                                  for name, part in fact_parts(dataset, df, rows, extended).items()}
+                dims = extended
+            except Exception as e:
+                entry = {**entry, "parts": {}, "error": f"{type(e).__name__}: {e}"}
+        updated["datasets"][dataset] = entry
+    updated["dims"] = {name: _write_table(table, name) for name, table in dims.items()}
+    updated["retired"] = sorted(manifest_files(manifest) - manifest_files(updated))
+    _swap_manifest(updated, manifest)
+    return updated
+
+
+def _swap_manifest(updated, previous):
+    """Point readers at the new tables in one rename, then delete what no reader can still be using"""
+    tmp = f"{MANIFEST_FILE}.{uuid.uuid4().hex[:12]}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(updated, f, indent=4)
+    os.replace(tmp, MANIFEST_FILE)
+
+    # Files the previous manifest retired were already unreferenced while it was current
+    keep = manifest_files(updated) | set(updated["retired"]) | {os.path.basename(MANIFEST_FILE)}
+    cutoff = time.time() - ORPHAN_SECONDS
+    for name in os.listdir(WAREHOUSE_DIR):
+        path = os.path.join(WAREHOUSE_DIR, name)
+        if name in keep or not os.path.isfile(path):
+            continue
+        try:
+            if name in previous.get("retired", []) or os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def ensure_warehouse(datasets):
+    """Current manifest, after rebuilding the tables of those datasets whose files changed since it was written"""
+    manifest = read_manifest()
+    if not _stale(manifest, datasets):
+        return manifest
+    with BUILD_LOCK:
+        # Another session may have rebuilt them while this one waited
+        manifest = read_manifest()
+        stale = _stale(manifest, datasets)
+        if stale:
+            manifest = update_warehouse(manifest, stale)
+    return manifest
+
+
+def quarantined(*names):
+    """dataset -> error, for the datasets behind the named tables (every dataset when none are named) left out"""
+    datasets = {dataset for name in names for dataset in table_datasets(name)} if names else set(DATASETS)
+    return {dataset: entry["error"] for dataset, entry in read_manifest()["datasets"].items()
+            if dataset in datasets and "error" in entry}
+
+
+@cached_frame
+def load_table(name, version):
+    """One dimension or fact table, rebuilding its datasets first when their files changed.
+
+    version is the caller's table_version; it keys the cached copy only.
+    """
+    datasets = table_datasets(name)
+    manifest = ensure_warehouse(datasets)
+    if name in manifest["dims"]:
+        return _read_table(manifest["dims"][name])
+    parts = [entry["parts"][name] for dataset, entry in manifest["datasets"].items()
+             if dataset in datasets and name in entry.get("parts", {})]
+    if not parts:
+        errors = "".join(f"; {dataset}: {error}" for dataset, error in quarantined(name).items())
+        raise KeyError(f"The warehouse has no {name} table: no data from {', '.join(datasets)}{errors}")
+    tables = [_read_table(part) for part in parts]
+    table = pd.concat(tables, ignore_index=True)
+    # Parts with different categories concatenate to object columns
+    for column in tables[0].select_dtypes("category").columns:
+        table[column] = table[column].astype("category")
+    return table
+
+
+# --------- Aggregation ---------
+def count_by(keys, labels):
+    """Rows per surrogate key as a labelled Series, largest first, keys without rows left out"""
+    keys = np.asarray(keys)
+    counts = np.bincount(keys[keys >= 0], minlength=len(labels))
+    present = np.flatnonzero(counts)
+    order = present[np.argsort(-counts[present], kind="stable")]
+    return pd.Series(counts[order], index=pd.Index(np.asarray(labels)[order]), name="count")
+
+
+if __name__ == "__main__":
+    manifest = ensure_warehouse(list(DATASETS))
+    for name, entry in manifest["dims"].items():
+        print(f"{name:28s} {entry['rows']:>10,} rows")
+    for dataset, entry in manifest["datasets"].items():
+        for name, part in entry["parts"].items():
+            print(f"{name:28s} {part['rows']:>10,} rows from {dataset}")
+        if "error" in entry:
+            print(f"{'(left out)':28s} {dataset}: {entry['error']}")
+    print(f"Warehouse in {WAREHOUSE_DIR}/ is up to date (source version {source_version()})")